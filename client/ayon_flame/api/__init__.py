@@ -14,18 +14,29 @@ from .lib import (
     FlameAppFramework,
     get_current_project,
     get_current_sequence,
+    get_selected_sequences,
     create_segment_data_marker,
     get_segment_data_marker,
     get_clip_data_marker,
     set_segment_data_marker,
     set_clip_data_marker,
+    buffered_segment_data_markers,
     set_publish_attribute,
     get_publish_attribute,
+    SequenceIndex,
+    SegmentMarkerItem,
     get_sequence_segments,
     maintained_segment_selection,
+    SegmentSelectionGuard,
     reset_segment_selection,
     get_segment_attributes,
+    get_segment_identity,
+    SegmentAttributesStore,
+    SegmentRecord,
+    TrackRecordSet,
     get_clips_in_reels,
+    iter_reel_clips,
+    ReelClip,
     get_reformatted_filename,
     get_frame_from_filename,
     get_padding_from_filename,
@@ -50,6 +61,9 @@ from .pipeline import (
     remove_instance,
     list_instances,
     imprint,
+    buffered_imprint,
+    imprint_instances,
+    get_imprinted_data,
     maintained_selection
 )
 from .menu import (
@@ -60,6 +74,7 @@ from .menu import (
 )
 from .plugin import (
     PublishableClip,
+    PublishableClipBatch,
     ClipLoader,
     OpenClipSolver,
     FlameCreator,
@@ -106,18 +121,29 @@ __all__ = [
     "FlameAppFramework",
     "get_current_project",
     "get_current_sequence",
+    "get_selected_sequences",
     "create_segment_data_marker",
     "get_segment_data_marker",
     "get_clip_data_marker",
     "set_segment_data_marker",
     "set_clip_data_marker",
+    "buffered_segment_data_markers",
     "set_publish_attribute",
     "get_publish_attribute",
+    "SequenceIndex",
+    "SegmentMarkerItem",
     "get_sequence_segments",
     "maintained_segment_selection",
+    "SegmentSelectionGuard",
     "reset_segment_selection",
     "get_segment_attributes",
+    "get_segment_identity",
+    "SegmentAttributesStore",
+    "SegmentRecord",
+    "TrackRecordSet",
     "get_clips_in_reels",
+    "iter_reel_clips",
+    "ReelClip",
     "get_reformatted_filename",
     "get_frame_from_filename",
     "get_padding_from_filename",
@@ -139,6 +165,9 @@ __all__ = [
     "remove_instance",
     "list_instances",
     "imprint",
+    "buffered_imprint",
+    "imprint_instances",
+    "get_imprinted_data",
     "maintained_selection",
 
     # utils
@@ -155,6 +184,7 @@ __all__ = [
     # plugin
     "Creator",
     "PublishableClip",
+    "PublishableClipBatch",
     "ClipLoader",
     "OpenClipSolver",
     "FlameCreator",
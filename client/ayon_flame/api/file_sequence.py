@@ -0,0 +1,156 @@
+"""
+File sequences of media directories, independent of the host.
+"""
+import os
+import re
+from dataclasses import dataclass, field
+
+# `name`, separator and frame number directly before extension
+SEQUENCE_FILE_PATTERN = re.compile(
+    r"^(?P<name>.*)(?P<separator>[._])(?P<frame>\d+)\.(?P<ext>[^.]+)$")
+
+
+@dataclass
+class FileSequence:
+    """Frames of one file sequence found in a directory."""
+    head: str
+    tail: str
+    padding: int
+    frames: list = field(default_factory=list)
+    _runs: list = field(default=None, init=False, repr=False)
+
+    @property
+    def runs(self):
+        """Contiguous frame ranges of sequence.
+
+        Returns:
+            list[tuple[int, int]]: first and last frame of each run
+        """
+        if self._runs is None:
+            runs = []
+            for frame in sorted(self.frames):
+                if runs and frame == runs[-1][1] + 1:
+                    runs[-1][1] = frame
+                elif not runs or frame != runs[-1][1]:
+                    runs.append([frame, frame])
+            self._runs = [tuple(run) for run in runs]
+        return self._runs
+
+
+class DirectorySequenceIndex(object):
+    """File sequences of a directory grouped by name, padding and extension.
+
+    Directory is scanned once, sequences are then looked up by file name
+    without its frame number and extension.
+
+    Args:
+        dir_path (str): directory path
+    """
+    def __init__(self, dir_path):
+        # {(name, ext): {(separator, padding): FileSequence}}
+        self._sequences = {}
+
+        # {(name, separator, ext): [frame]}
+        frames_by_head = {}
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                found = SEQUENCE_FILE_PATTERN.match(entry.name)
+                if not found:
+                    continue
+                name, separator, frame, ext = found.group(
+                    "name", "separator", "frame", "ext")
+                frames_by_head.setdefault(
+                    (name, separator, ext), []).append(frame)
+
+        for (name, separator, ext), frames in frames_by_head.items():
+            paddings = {
+                self.get_padding(frame) for frame in frames
+            }
+            for frame in frames:
+                self._add_frame(
+                    name, separator, self.resolve_padding(frame, paddings),
+                    frame, ext
+                )
+
+    @staticmethod
+    def get_padding(frame):
+        """Padding of frame number, unpadded numbers are having 0.
+
+        Args:
+            frame (str): frame number
+
+        Returns:
+            int: padding
+        """
+        if len(frame) > 1 and frame.startswith("0"):
+            return len(frame)
+        return 0
+
+    @classmethod
+    def resolve_padding(cls, frame, paddings):
+        """Padding of sequence the frame number belongs to.
+
+        Unpadded number with the same digit count as padding of other
+        frames belongs to the padded sequence, e.g. `1000` is joining
+        `0990` in sequence of padding 4 the same way as `clique` does.
+
+        Args:
+            frame (str): frame number
+            paddings (Iterable[int]): paddings of frames of the same
+                file name
+
+        Returns:
+            int: padding
+        """
+        padding = cls.get_padding(frame)
+        if not padding and len(frame) in paddings:
+            return len(frame)
+        return padding
+
+    def _add_frame(self, name, separator, padding, frame, ext):
+        # unpadded numbers of any other length belong to one sequence
+        name_sequences = self._sequences.setdefault((name, ext), {})
+        sequence = name_sequences.get((separator, padding))
+        if sequence is None:
+            sequence = name_sequences[(separator, padding)] = FileSequence(
+                head=name + separator,
+                tail="." + ext,
+                padding=padding,
+            )
+        sequence.frames.append(int(frame))
+        sequence._runs = None
+
+    def get_sequence(self, name, ext, basename=None):
+        """Get sequence with at least two frames.
+
+        Args:
+            name (str): file name without frame number and extension
+            ext (str): file extension
+            basename (str)[optional]: file name used to choose sequence
+                if there are more with the same name
+
+        Returns:
+            FileSequence: file sequence or None if not found
+        """
+        sequences = [
+            sequence
+            for sequence in self._sequences.get((name, ext), {}).values()
+            if len(sequence.frames) > 1
+        ]
+        if not sequences:
+            return None
+
+        found = SEQUENCE_FILE_PATTERN.match(basename) if basename else None
+        if found:
+            padding = self.resolve_padding(
+                found.group("frame"),
+                {sequence.padding for sequence in sequences}
+            )
+            for sequence in sequences:
+                if (
+                    basename.startswith(sequence.head)
+                    and sequence.padding == padding
+                ):
+                    return sequence
+
+        return sequences[0]
@@ -0,0 +1,186 @@
+"""
+Project sidecar store of creator instances data imprinted on segments.
+"""
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from ayon_core.lib import Logger
+
+log = Logger.get_logger(__name__)
+
+# maximum number of bound parameters of one sqlite query
+QUERY_CHUNK_SIZE = 500
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_project_store_path(workdir, project_name):
+    """Location of the store next to project `.workfile` side-car file."""
+    return os.path.join(workdir, f"{project_name}.instances.sqlite")
+
+
+def get_instance_store(store_path, create=True):
+    """Get opened instance store of the path.
+
+    Args:
+        store_path (str): path of SQLite file
+        create (bool): create the store file if it does not exist
+
+    Returns:
+        InstanceStore: store object or None if not existing
+    """
+    with _stores_lock:
+        store = _stores.get(store_path)
+        if store is not None:
+            return store
+
+        if not create and not os.path.exists(store_path):
+            return None
+
+        store = InstanceStore(store_path)
+        _stores[store_path] = store
+        return store
+
+
+class InstanceStore(object):
+    """SQLite store of instances data keyed by clip index.
+
+    Clip index is the unique id imprinted in AYON marker of segment
+    or reel clip, the marker keeps only the clip index while the data
+    of all sub-products are stored here.
+
+    Args:
+        store_path (str): path of SQLite file
+        logger (logging.Logger)[optional]: logger
+    """
+    SCHEMA_VERSION = 1
+
+    def __init__(self, store_path, logger=None):
+        self.log = logger or log
+        self.store_path = store_path
+        self._lock = threading.Lock()
+        # changes are committed by the outermost batch
+        self._batch_depth = 0
+
+        store_dir = os.path.dirname(store_path)
+        if store_dir:
+            os.makedirs(store_dir, exist_ok=True)
+
+        self._connection = sqlite3.connect(
+            store_path, timeout=10, check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS instances ("
+                " clip_index TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " updated REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "PRAGMA user_version = {}".format(self.SCHEMA_VERSION))
+
+    def get(self, clip_index):
+        """Get stored data of the clip index.
+
+        Args:
+            clip_index (str): clip index
+
+        Returns:
+            dict: stored data or None if missing
+        """
+        return self.get_many([clip_index]).get(clip_index)
+
+    def get_many(self, clip_indexes):
+        """Get stored data of multiple clip indexes.
+
+        Args:
+            clip_indexes (Iterable[str]): clip indexes
+
+        Returns:
+            dict[str, dict]: stored data by clip index, missing clip
+                indexes are not included
+        """
+        clip_indexes = list(dict.fromkeys(clip_indexes))
+        output = {}
+        with self._lock:
+            for start in range(0, len(clip_indexes), QUERY_CHUNK_SIZE):
+                chunk = clip_indexes[start:start + QUERY_CHUNK_SIZE]
+                rows = self._connection.execute(
+                    "SELECT clip_index, data FROM instances"
+                    " WHERE clip_index IN ({})".format(
+                        ", ".join("?" for _ in chunk)),
+                    chunk
+                ).fetchall()
+                for clip_index, data in rows:
+                    try:
+                        output[clip_index] = json.loads(data)
+                    except ValueError as error:
+                        self.log.warning(
+                            "Invalid stored data of `{}`: {}".format(
+                                clip_index, error))
+        return output
+
+    def _execute_change(self, query, parameters):
+        with self._lock:
+            try:
+                self._connection.execute(query, parameters)
+            except sqlite3.Error:
+                if not self._batch_depth:
+                    self._connection.rollback()
+                raise
+            if not self._batch_depth:
+                self._connection.commit()
+
+    def put(self, clip_index, data):
+        """Store data of the clip index.
+
+        Args:
+            clip_index (str): clip index
+            data (dict): json serializable data
+        """
+        self._execute_change(
+            "INSERT OR REPLACE INTO instances"
+            " (clip_index, data, updated) VALUES (?, ?, ?)",
+            (clip_index, json.dumps(data), time.time())
+        )
+
+    def delete(self, clip_index):
+        """Remove stored data of the clip index.
+
+        Args:
+            clip_index (str): clip index
+        """
+        self._execute_change(
+            "DELETE FROM instances WHERE clip_index = ?", (clip_index,))
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Commit changes done inside of the context in one transaction.
+
+        Nested contexts are committed by the outermost one.
+
+        Example:
+            with instance_store.batch():
+                for clip_index, data in instances_data.items():
+                    instance_store.put(clip_index, data)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -1,18 +1,24 @@
+import base64
 import contextlib
-import itertools
 import json
 import os
 import pickle
 import re
+import sqlite3
+import subprocess
 import sys
 import tempfile
+import threading
+import zlib
+from array import array
+from collections.abc import Mapping, MutableMapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy, deepcopy
 from dataclasses import dataclass, field
 from pprint import pformat
 from xml.etree import ElementTree as ET
 
-import clique
-from ayon_core.lib import Logger, run_subprocess
+from ayon_core.lib import Logger
 
 from .constants import (
     COLOR_MAP,
@@ -21,10 +27,32 @@ from .constants import (
     MARKER_NAME,
     MARKER_PUBLISH_DEFAULT,
 )
+from . import media_header
+from .file_sequence import (
+    SEQUENCE_FILE_PATTERN,
+    DirectorySequenceIndex,
+)
+from .media_info_index import MediaInfoIndex, get_default_index_path
 
 log = Logger.get_logger(__name__)
 
 FRAME_PATTERN = re.compile(r"[\._](\d+)[\.]")
+# value of unset `SegmentRecord` attributes
+_MISSING = object()
+SEGMENT_SHOT_TOKENS = (
+    "<colour space>", "<width>", "<height>", "<depth>", "<segment>",
+    "<track>", "<track name>"
+)
+# separates shot tokens resolved with one shot name template
+SHOT_TOKENS_DELIMITER = "#@#"
+MEDIA_INFO_READ_CHUNK_SIZE = 1024 * 64
+# versioned compact AYON marker payload, see `encode_marker_data`
+MARKER_PAYLOAD_PREFIX = "AYON"
+MARKER_PAYLOAD_VERSION = 1
+# marker data keys compressed in payload body, decoded on first access
+MARKER_PAYLOAD_BODY_KEYS = frozenset(("flame_sub_products",))
+# smaller marker data are written as plain json
+MARKER_PAYLOAD_MIN_BODY_SIZE = 256
 
 
 class CTX:
@@ -35,6 +63,19 @@ class CTX:
     context = None
 
 
+class _MarkerWriteBuffer:
+    # singleton holding pending AYON marker changes of segments
+    depth = 0
+    # pending entries by buffer key of segment, entry holds the segment,
+    # its marker data read on first lookup and list of (data, replace)
+    entries = {}
+    # {id(segment object): (segment object, buffer key)}, objects are
+    # kept referenced so their ids are not reused while buffering
+    segment_keys = {}
+    # index resolving track keys of segment identities
+    sequence_index = None
+
+
 @dataclass
 class ValidationAggregator:
     failed_segments: list = field(default_factory=list)
@@ -178,6 +219,24 @@ def get_current_project():
     return flame.project.current_project
 
 
+def get_performance_settings():
+    """Get performance settings of current project.
+
+    Returns:
+        dict: `performance` settings of flame addon
+    """
+    from ayon_core.pipeline.context_tools import get_current_project_settings
+
+    try:
+        project_settings = get_current_project_settings()
+    except Exception as error:
+        log.warning(
+            "Could not get project settings: {}".format(error))
+        return {}
+
+    return project_settings.get("flame", {}).get("performance", {})
+
+
 def get_current_sequence(selection):
     import flame
 
@@ -205,6 +264,33 @@ def get_current_sequence(selection):
     return process_timeline
 
 
+def get_selected_sequences(selection):
+    """Get sequences of selection.
+
+    Sequences selected in media panel are returned in order of selection,
+    otherwise the sequence of selected segments is returned.
+
+    Args:
+        selection (list): flame objects selected in menu context
+
+    Returns:
+        list[flame.PySequence]: selected sequences
+    """
+    import flame
+
+    sequences = [
+        item for item in selection or []
+        if isinstance(item, flame.PySequence)
+    ]
+    if sequences:
+        return sequences
+
+    sequence = get_current_sequence(selection)
+    if sequence is None:
+        return []
+    return [sequence]
+
+
 def rescan_hooks():
     import flame
     try:
@@ -248,6 +334,8 @@ def get_metadata(project_name, _log=None) -> str:
 def get_segment_data_marker(segment, with_marker=None):
     """Get AYON track item tag created by creator or loader plugin.
 
+    Pending changes of `buffered_segment_data_markers` are included.
+
     Attributes:
         segment (flame.PySegment): flame api object
         with_marker (bool)[optional]: if true it will return also marker object
@@ -258,22 +346,240 @@ def get_segment_data_marker(segment, with_marker=None):
     Returns(with_marker=True):
         flame.PyMarker, dict
     """
-    for marker in segment.markers:
-        comment = marker.comment.get_value() or "{}"
-        color = marker.colour.get_value()
-        name = marker.name.get_value()
+    marker_data = _get_segment_data_marker(segment, with_marker)
+    if not with_marker:
+        return _get_marker_data_dict(marker_data)
+    if marker_data is None:
+        return None
+    marker, data = marker_data
+    return marker, _get_marker_data_dict(data)
+
+
+def _get_marker_data_dict(data):
+    if isinstance(data, MarkerData):
+        return data.to_dict()
+    return data
+
 
+def _get_segment_data_marker(segment, with_marker=None):
+    # marker data are returned as `MarkerData` with encoded body
+    entry = None
+    if _MarkerWriteBuffer.entries:
+        buffer_key = _get_marker_buffer_key(segment)
+        entry = _MarkerWriteBuffer.entries.get(buffer_key)
+    if entry is None:
+        return _read_segment_data_marker(segment, with_marker)
+
+    if with_marker:
+        # marker object is required, pending changes are written first
+        _flush_segment_data_marker(
+            _MarkerWriteBuffer.entries.pop(buffer_key))
+        return _read_segment_data_marker(segment, with_marker)
+
+    if entry["data"] is _MISSING:
+        entry["data"] = _read_segment_data_marker(segment)
+
+    tag_data = deepcopy(entry["data"])
+    for data, replace in entry["changes"]:
+        if tag_data is None or replace:
+            tag_data = {}
+        tag_data.update(deepcopy(data))
+    return tag_data
+
+
+def _get_marker_buffer_key(segment):
+    """Key of pending marker changes shared by all objects of a segment.
+
+    Flame returns a new python object of the same segment with every
+    access, so segment is keyed by its identity with the track key
+    resolved by sequence index of the buffer. Segment object which
+    cannot be resolved is keyed only by itself.
+
+    Args:
+        segment (flame.PySegment): flame api object
+
+    Returns:
+        tuple: buffer key
+    """
+    cached = _MarkerWriteBuffer.segment_keys.get(id(segment))
+    if cached is not None:
+        return cached[1]
+
+    track_key = None
+    sequence_index = _MarkerWriteBuffer.sequence_index
+    if sequence_index is not None:
+        track_key = sequence_index.get_segment_track_key(segment)
+
+    if track_key is None:
+        buffer_key = ("object", id(segment))
+    else:
+        buffer_key = (
+            "segment", get_segment_identity(segment, track_key))
+    _MarkerWriteBuffer.segment_keys[id(segment)] = (segment, buffer_key)
+    return buffer_key
+
+
+def _read_segment_data_marker(segment, with_marker=None):
+    for marker in segment.markers:
         if (
-            name == MARKER_NAME
-            and color == COLOR_MAP[MARKER_COLOR]
+            marker.name.get_value() == MARKER_NAME
+            and marker.colour.get_value() == COLOR_MAP[MARKER_COLOR]
         ):
+            # comment is read only from AYON marker
+            data = _decode_marker_data(marker.comment.get_value())
             if not with_marker:
-                return json.loads(comment)
+                return data
             else:
-                return marker, json.loads(comment)
+                return marker, data
     return None
 
 
+class MarkerData(MutableMapping):
+    """AYON marker data decoded from compact marker payload.
+
+    Header values are decoded right away, payload body holding
+    `MARKER_PAYLOAD_BODY_KEYS` is decompressed on first access to them.
+
+    Args:
+        header (dict): decoded header data
+        body (str)[optional]: encoded payload body
+    """
+    def __init__(self, header, body=None):
+        self._data = header
+        self._body = body or None
+
+    def _decode_body(self):
+        if self._body is None:
+            return
+        body = self._body
+        self._body = None
+        self._data.update(
+            json.loads(zlib.decompress(base64.b64decode(body))))
+
+    def __getitem__(self, key):
+        if key in MARKER_PAYLOAD_BODY_KEYS:
+            self._decode_body()
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if key in MARKER_PAYLOAD_BODY_KEYS:
+            self._decode_body()
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        if key in MARKER_PAYLOAD_BODY_KEYS:
+            self._decode_body()
+        del self._data[key]
+
+    def __iter__(self):
+        self._decode_body()
+        return iter(self._data)
+
+    def __len__(self):
+        self._decode_body()
+        return len(self._data)
+
+    def __repr__(self):
+        # body is not decoded only to be printed
+        if self._body is None:
+            return "MarkerData({!r})".format(self._data)
+        return "MarkerData({!r}, body={!r})".format(self._data, self._body)
+
+    def copy(self):
+        return MarkerData(dict(self._data), self._body)
+
+    def to_dict(self):
+        """Fully decoded marker data.
+
+        Returns:
+            dict: marker data
+        """
+        self._decode_body()
+        return dict(self._data)
+
+
+def encode_marker_data(data):
+    """Encode AYON marker data to compact versioned marker payload.
+
+    Payload is `AYON:<version>:<body>:<header>`, header is json of values
+    read by most lookups (e.g. `clip_index` or `active`), body is base64
+    encoded zlib compressed json of `MARKER_PAYLOAD_BODY_KEYS` values.
+    Data with body smaller than `MARKER_PAYLOAD_MIN_BODY_SIZE` are
+    written as plain json.
+
+    Args:
+        data (Mapping): json serializable data
+
+    Returns:
+        str: marker payload
+    """
+    header = {}
+    body = {}
+    encoded_body = ""
+    if isinstance(data, MarkerData) and data._body is not None:
+        # body was not accessed, it is kept encoded
+        encoded_body = data._body
+        header.update(data._data)
+        data = {}
+
+    for key, value in data.items():
+        if key in MARKER_PAYLOAD_BODY_KEYS:
+            body[key] = value
+        else:
+            header[key] = value
+
+    if body:
+        body_json = json.dumps(body, separators=(",", ":"))
+        if len(body_json) < MARKER_PAYLOAD_MIN_BODY_SIZE:
+            # compressed payload of small data is larger than json
+            header.update(body)
+            return json.dumps(header, separators=(",", ":"))
+
+        encoded_body = base64.b64encode(
+            zlib.compress(body_json.encode("utf-8"))).decode("ascii")
+    elif not encoded_body:
+        return json.dumps(header, separators=(",", ":"))
+
+    return "{}:{}:{}:{}".format(
+        MARKER_PAYLOAD_PREFIX,
+        MARKER_PAYLOAD_VERSION,
+        encoded_body,
+        json.dumps(header, separators=(",", ":")),
+    )
+
+
+def decode_marker_data(comment):
+    """Decode AYON marker data from marker payload or legacy json.
+
+    Args:
+        comment (str): comment of AYON marker
+
+    Returns:
+        dict: marker data
+
+    Raises:
+        ValueError: payload of unsupported version
+    """
+    return _get_marker_data_dict(_decode_marker_data(comment))
+
+
+def _decode_marker_data(comment):
+    # body of marker payload is decoded on first access
+    if not comment:
+        return {}
+
+    if not comment.startswith(MARKER_PAYLOAD_PREFIX + ":"):
+        # legacy json marker data
+        return json.loads(comment)
+
+    _, version, body, header = comment.split(":", 3)
+    if int(version) > MARKER_PAYLOAD_VERSION:
+        raise ValueError(
+            "Unsupported AYON marker payload version: {}".format(version))
+
+    return MarkerData(json.loads(header), body)
+
+
 def get_clip_data_marker(clip, with_marker=None):
     """Get data marker from inside of reel clip.
 
@@ -297,36 +603,109 @@ def get_clip_data_marker(clip, with_marker=None):
     )
 
 
-def set_segment_data_marker(segment, data=None):
+def set_segment_data_marker(segment, data=None, replace=False):
     """Set AYON track item tag to input segment.
 
+    Inside of `buffered_segment_data_markers` the change is written
+    with other changes of the segment when the context exits.
+
     Attributes:
         segment (flame.PySegment): flame api object
+        data (dict): json serializable data
+        replace (bool)[optional]: replace existing tag data instead
+            of updating it
     """
     data = data or dict()
 
-    marker_data = get_segment_data_marker(segment, True)
+    if _MarkerWriteBuffer.depth:
+        entry = _MarkerWriteBuffer.entries.setdefault(
+            _get_marker_buffer_key(segment),
+            {"segment": segment, "data": _MISSING, "changes": []}
+        )
+        entry["changes"].append((deepcopy(data), replace))
+        return
+
+    _write_segment_data_marker(segment, data, replace)
+
+
+def _write_segment_data_marker(segment, data, replace=False):
+    marker_data = _read_segment_data_marker(segment, True)
 
     if marker_data:
         # get available AYON tag if any
         marker, tag_data = marker_data
+        if replace:
+            tag_data = {}
         # update tag data with new data
         tag_data.update(data)
         # update marker with tag data
-        marker.comment = json.dumps(tag_data)
+        marker.comment = encode_marker_data(tag_data)
     else:
         # update tag data with new data
         marker = create_segment_data_marker(segment)
         # add tag data to marker's comment
-        marker.comment = json.dumps(data)
+        marker.comment = encode_marker_data(data)
+
+
+def _flush_segment_data_marker(entry):
+    tag_data = {}
+    for data, replace in entry["changes"]:
+        if replace:
+            tag_data = {}
+        tag_data.update(data)
+    # merged changes replace the tag data only if any change did
+    replace = any(replace for _, replace in entry["changes"])
+    _write_segment_data_marker(entry["segment"], tag_data, replace)
+
 
+@contextlib.contextmanager
+def buffered_segment_data_markers(sequence_index=None):
+    """Buffer changes of AYON markers and write them on exit.
+
+    Changes done with `set_segment_data_marker` are kept in memory,
+    the marker of each changed segment is then read and written only
+    once. Nested contexts are written by the outermost one.
+
+    Sequence index is used to match different python objects of the
+    same segment. Without it changes are kept per segment object.
+
+    Args:
+        sequence_index (SequenceIndex)[optional]: index of sequence
+            of buffered segments
+
+    Example:
+        with buffered_segment_data_markers(sequence_index):
+            for segment in segments:
+                set_segment_data_marker(segment, {"active": True})
+    """
+    if (
+        sequence_index is not None
+        and _MarkerWriteBuffer.sequence_index is None
+    ):
+        _MarkerWriteBuffer.sequence_index = sequence_index
+        _MarkerWriteBuffer.segment_keys = {}
+    _MarkerWriteBuffer.depth += 1
+    try:
+        yield
+    finally:
+        _MarkerWriteBuffer.depth -= 1
+        if not _MarkerWriteBuffer.depth:
+            entries = _MarkerWriteBuffer.entries
+            _MarkerWriteBuffer.entries = {}
+            _MarkerWriteBuffer.segment_keys = {}
+            _MarkerWriteBuffer.sequence_index = None
+            for entry in entries.values():
+                _flush_segment_data_marker(entry)
 
-def set_clip_data_marker(clip, data=None):
+
+def set_clip_data_marker(clip, data=None, replace=False):
     """Set AYON track item tag to input clip.
 
     Attributes:
         clip (flame.PyClip): flame api object
         data (dict): json serializable data
+        replace (bool)[optional]: replace existing tag data instead
+            of updating it
     """
     data = data or dict()
     segment = get_clip_segment(clip)
@@ -339,7 +718,7 @@ def set_clip_data_marker(clip, data=None):
             f"data points toward {segment_data}."
         )
 
-    set_segment_data_marker(segment, data=data)
+    set_segment_data_marker(segment, data=data, replace=replace)
 
 
 def set_publish_attribute(segment, value):
@@ -424,35 +803,313 @@ def create_clip_data_marker(clip):
     return marker
 
 
-def get_sequence_segments(sequence, selected=False):
-    segments = []
-    # loop versions in sequence
-    for ver in sequence.versions:
-        # loop track in versions
-        for track in ver.tracks:
-            # ignore all empty tracks and hidden too
-            if len(track.segments) == 0 and track.hidden:
-                continue
-            # loop all segment in remaining tracks
-            for segment in track.segments:
-                if segment.name.get_value() == "":
+@dataclass
+class SequenceTrack:
+    """Track of sequence with attributes read during indexing."""
+    track: object
+    name: str
+    hidden: bool
+    # all track segments, gaps included
+    segments: list = field(default_factory=list)
+    # (version index, track index) unique within the sequence
+    key: tuple = ()
+
+
+@dataclass
+class SegmentMarkerItem:
+    """Segment with its AYON marker and lazily decoded marker data."""
+    segment: object
+    marker: object
+    data: Mapping
+
+
+class SequenceIndex(object):
+    """Index of sequence tracks and segments.
+
+    Versions, tracks and segments of sequence are traversed only once.
+    Segment names and visibility are read on first segments query,
+    selection and clip indexes of segments on first use.
+
+    Args:
+        sequence (flame.PySequence): python api object
+    """
+    def __init__(self, sequence):
+        self.sequence = sequence
+        self.tracks = []
+        self._segments = None
+        self._segments_by_track = {}
+        self._segments_by_name = {}
+        self._selected_segments = None
+        self._segments_by_clip_index = None
+        # {id(segment): track key} of segment objects held by the index
+        self._track_keys = {}
+        # {segment identity without track key: [track keys]}
+        self._track_keys_by_identity = None
+
+        for version_index, version in enumerate(sequence.versions):
+            for track_index, track in enumerate(version.tracks):
+                sequence_track = SequenceTrack(
+                    track=track,
+                    name=track.name.get_value(),
+                    hidden=track.hidden.get_value(),
+                    segments=list(track.segments),
+                    key=(version_index, track_index),
+                )
+                self.tracks.append(sequence_track)
+                for segment in sequence_track.segments:
+                    self._track_keys[id(segment)] = sequence_track.key
+
+    @property
+    def segments(self):
+        """Segments which are having name and are not hidden.
+
+        Returns:
+            list[flame.PySegment]: segments
+        """
+        if self._segments is None:
+            self._index_segments()
+        return self._segments
+
+    def _index_segments(self):
+        self._segments = []
+        for sequence_track in self.tracks:
+            visible_segments = self._segments_by_track.setdefault(
+                sequence_track.name, [])
+
+            for segment in sequence_track.segments:
+                segment_name = segment.name.get_value()
+                if segment_name == "":
                     continue
                 if segment.hidden.get_value() is True:
                     continue
-                if selected and not segment.selected.get_value():
-                    continue  # not part of selection
+                self._segments.append(segment)
+                visible_segments.append(segment)
+                self._segments_by_name.setdefault(
+                    segment_name, []).append(segment)
 
-                # add it to original selection
-                segments.append(segment)
-    return segments
+    @property
+    def track_names(self):
+        """Names of all tracks in sequence.
+
+        Returns:
+            list[str]: track names
+        """
+        return [sequence_track.name for sequence_track in self.tracks]
+
+    @property
+    def all_segments(self):
+        """All segments of sequence including gaps and hidden segments."""
+        for sequence_track in self.tracks:
+            yield from sequence_track.segments
+
+    def get_segments(self, selected=False):
+        """Get segments which are having name and are not hidden.
+
+        Args:
+            selected (bool)[optional]: only selected segments
+
+        Returns:
+            list[flame.PySegment]: segments
+        """
+        if not selected:
+            return list(self.segments)
+        if self._selected_segments is None:
+            self.refresh_selection()
+        return list(self._selected_segments)
+
+    def refresh_selection(self):
+        """Read selection state of segments again."""
+        self._selected_segments = [
+            segment for segment in self.segments
+            if segment.selected.get_value()
+        ]
+
+    def set_selection(self, segments):
+        """Select only the segments.
+
+        Args:
+            segments (list[flame.PySegment]): segments to be selected
+        """
+        for segment in self.all_segments:
+            segment.selected = False
+        for segment in segments:
+            segment.selected = True
+        self._selected_segments = list(segments)
+
+    def get_segment_track_key(self, segment):
+        """Get key of track of segment.
+
+        Segment objects which are not held by the index are matched
+        by their identity, the key is returned only if the match is
+        unique.
+
+        Args:
+            segment (flame.PySegment): python api object
+
+        Returns:
+            tuple: (version index, track index) or None if the segment
+                is not matched
+        """
+        track_key = self._track_keys.get(id(segment))
+        if track_key is not None:
+            return track_key
+
+        if self._track_keys_by_identity is None:
+            self._track_keys_by_identity = {}
+            for sequence_track in self.tracks:
+                for track_segment in sequence_track.segments:
+                    if track_segment.type == "Gap":
+                        continue
+                    self._track_keys_by_identity.setdefault(
+                        get_segment_identity(track_segment), []
+                    ).append(sequence_track.key)
+
+        track_keys = self._track_keys_by_identity.get(
+            get_segment_identity(segment), [])
+        if len(track_keys) == 1:
+            return track_keys[0]
+        return None
+
+    def get_track_segments(self, track_name):
+        """Get segments of tracks with the name.
+
+        Args:
+            track_name (str): track name
+
+        Returns:
+            list[flame.PySegment]: segments
+        """
+        if self._segments is None:
+            self._index_segments()
+        return list(self._segments_by_track.get(track_name, []))
+
+    def get_segments_by_name(self, segment_name):
+        """Get segments with the name.
+
+        Args:
+            segment_name (str): segment name
+
+        Returns:
+            list[flame.PySegment]: segments
+        """
+        if self._segments is None:
+            self._index_segments()
+        return list(self._segments_by_name.get(segment_name, []))
+
+    @property
+    def segments_by_clip_index(self):
+        """Segments with AYON marker mapped by their clip index.
+
+        Markers of all segments are read and decoded only once.
+
+        Returns:
+            dict[str, SegmentMarkerItem]: segment items by clip index
+        """
+        if self._segments_by_clip_index is None:
+            self._segments_by_clip_index = {}
+            for segment in self.segments:
+                marker, marker_data = (
+                    _get_segment_data_marker(segment, with_marker=True)
+                    or (None, {})
+                )
+                if marker_data.get("clip_index"):
+                    self._segments_by_clip_index.setdefault(
+                        marker_data["clip_index"],
+                        SegmentMarkerItem(segment, marker, marker_data)
+                    )
+        return self._segments_by_clip_index
+
+    def get_segment_item_by_clip_index(self, clip_index):
+        """Get segment item with AYON marker of the clip index.
+
+        Args:
+            clip_index (str): clip index
+
+        Returns:
+            SegmentMarkerItem: segment item or None if not found
+        """
+        return self.segments_by_clip_index.get(clip_index)
+
+    def get_segment_by_clip_index(self, clip_index):
+        """Get segment with AYON marker of the clip index.
+
+        Args:
+            clip_index (str): clip index
+
+        Returns:
+            flame.PySegment: segment or None if not found
+        """
+        segment_item = self.get_segment_item_by_clip_index(clip_index)
+        if segment_item is None:
+            return None
+        return segment_item.segment
+
+
+def get_sequence_segments(sequence, selected=False, sequence_index=None):
+    sequence_index = sequence_index or SequenceIndex(sequence)
+    return sequence_index.get_segments(selected)
+
+
+class SegmentSelectionGuard(object):
+    """Selection of sequence segments restored once for a longer scope.
+
+    Selection state of all segments, gaps included, is read on
+    initialization. Restore writes selection only to segments whose
+    state has changed since.
+
+    Args:
+        sequence_index (SequenceIndex): index of the sequence
+    """
+    def __init__(self, sequence_index):
+        self.sequence_index = sequence_index
+        self._snapshot = [
+            (segment, segment.selected.get_value())
+            for segment in sequence_index.all_segments
+        ]
+        self.active = True
+        self._set_index_selection()
+
+    def _set_index_selection(self):
+        selected_ids = {
+            id(segment) for segment, selected in self._snapshot if selected
+        }
+        self.sequence_index._selected_segments = [
+            segment for segment in self.sequence_index.segments
+            if id(segment) in selected_ids
+        ]
+
+    def restore(self):
+        """Restore snapshot selection of segments.
+
+        Returns:
+            int: number of segments whose selection was changed
+        """
+        changed = 0
+        for segment, selected in self._snapshot:
+            if segment.selected.get_value() != selected:
+                segment.selected = selected
+                changed += 1
+
+        self._set_index_selection()
+        self.active = False
+        return changed
 
 
 @contextlib.contextmanager
-def maintained_segment_selection(sequence):
+def maintained_segment_selection(
+    sequence, sequence_index=None, selection_guard=None
+):
     """Maintain selection during context
 
+    Selection is not restored on exit while the selection guard is
+    active, it is restored by the guard itself. On error the guard
+    restores the selection right away as its scope is not finished.
+
     Attributes:
         sequence (flame.PySequence): python api object
+        sequence_index (SequenceIndex)[optional]: index of the sequence
+        selection_guard (SegmentSelectionGuard)[optional]: guard of
+            selection in wider scope, e.g. whole publish collection
 
     Yield:
         list of flame.PySegment
@@ -463,53 +1120,327 @@ def maintained_segment_selection(sequence):
         ...         segment.selected = False
         >>> assert(segment.selected)
     """
-    selected_segments = get_sequence_segments(sequence, True)
+    if selection_guard is not None and selection_guard.active:
+        try:
+            yield selection_guard.sequence_index.get_segments(True)
+        except BaseException:
+            selection_guard.restore()
+            raise
+        return
+
+    if sequence_index is None:
+        sequence_index = SequenceIndex(sequence)
+    else:
+        sequence_index.refresh_selection()
+
+    selected_segments = sequence_index.get_segments(True)
     try:
         # do the operation on selected segments
         yield selected_segments
     finally:
-        # reset all selected clips
-        reset_segment_selection(sequence)
         # select only original selection of segments
-        for segment in selected_segments:
-            segment.selected = True
+        sequence_index.set_selection(selected_segments)
 
 
-def reset_segment_selection(sequence):
+def reset_segment_selection(sequence, sequence_index=None):
     """Deselect all selected nodes
     """
-    for ver in sequence.versions:
-        for track in ver.tracks:
-            if len(track.segments) == 0 and track.hidden:
-                continue
-            for segment in track.segments:
-                segment.selected = False
+    sequence_index = sequence_index or SequenceIndex(sequence)
+    sequence_index.set_selection([])
+
+
+class SegmentRecord(MutableMapping):
+    """Compact record of segment attributes.
+
+    Record behaves as the dictionary formerly returned by
+    `get_segment_attributes`, only keys which are set are present.
+    Strings of `segment_timecodes` are formatted on first access.
+
+    Args:
+        **data: initial attributes
+    """
+    FIELDS = (
+        "shot_name", "segment_comment", "tape_name", "source_name",
+        "PySegment", "segment_name", "fpath", "segment_head",
+        "segment_tail", "colour_space", "width", "height", "depth",
+        "segment", "track", "track_name", "record_duration", "record_in",
+        "record_out", "source_in", "source_out", "source_duration",
+        "source_frame_rate", "source_height", "source_width",
+        "source_ratio", "start_frame", "head", "tail",
+        # reel clip attributes
+        "PyClip", "fps", "name", "ratio", "sample_rate", "bit_depth",
+    )
+    __slots__ = FIELDS + (
+        "_timecode_attributes", "_segment_timecodes", "_extra_data")
+    _FIELDS_SET = frozenset(FIELDS)
+
+    def __init__(self, **data):
+        for key in self.__slots__:
+            object.__setattr__(self, key, _MISSING)
+        self._timecode_attributes = ()
+        self._extra_data = None
+        self.update(data)
+
+    def set_timecode_attributes(self, timecode_attributes):
+        """Set segment time attributes formatted to `segment_timecodes`.
+
+        Args:
+            timecode_attributes (list[tuple[str, Any]]): attribute names
+                with flame time objects
+        """
+        self._timecode_attributes = tuple(timecode_attributes)
+        self._segment_timecodes = _MISSING
+
+    def _get_segment_timecodes(self):
+        if (
+            self._segment_timecodes is _MISSING
+            and self._timecode_attributes
+        ):
+            self._segment_timecodes = {
+                attr_name: str(attr).replace("+", ":")
+                for attr_name, attr in self._timecode_attributes
+            }
+        return self._segment_timecodes
+
+    def __getitem__(self, key):
+        if key in self._FIELDS_SET:
+            value = getattr(self, key)
+        elif key == "segment_timecodes":
+            value = self._get_segment_timecodes()
+        elif self._extra_data is not None:
+            value = self._extra_data.get(key, _MISSING)
+        else:
+            value = _MISSING
+
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._FIELDS_SET:
+            setattr(self, key, value)
+        elif key == "segment_timecodes":
+            self._timecode_attributes = ()
+            self._segment_timecodes = value
+        else:
+            if self._extra_data is None:
+                self._extra_data = {}
+            self._extra_data[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+
+        if key in self._FIELDS_SET:
+            setattr(self, key, _MISSING)
+        elif key == "segment_timecodes":
+            self._timecode_attributes = ()
+            self._segment_timecodes = _MISSING
+        else:
+            del self._extra_data[key]
+
+    def __contains__(self, key):
+        if key in self._FIELDS_SET:
+            return getattr(self, key) is not _MISSING
+        if key == "segment_timecodes":
+            return (
+                bool(self._timecode_attributes)
+                or self._segment_timecodes is not _MISSING
+            )
+        return self._extra_data is not None and key in self._extra_data
+
+    def __iter__(self):
+        for key in self.FIELDS:
+            if getattr(self, key) is not _MISSING:
+                yield key
+        if "segment_timecodes" in self:
+            yield "segment_timecodes"
+        if self._extra_data:
+            yield from list(self._extra_data)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.to_dict())
+
+    def __reduce__(self):
+        # sentinel of missing values is not copied
+        return self.__class__, (), None, None, iter(self.to_dict().items())
+
+    def copy(self):
+        """Shallow copy of record.
+
+        Returns:
+            SegmentRecord: copied record
+        """
+        record = self.__class__()
+        for key in self.FIELDS:
+            setattr(record, key, getattr(self, key))
+        record._timecode_attributes = self._timecode_attributes
+        record._segment_timecodes = self._segment_timecodes
+        if record._segment_timecodes is not _MISSING:
+            record._segment_timecodes = dict(self._segment_timecodes)
+        if self._extra_data is not None:
+            record._extra_data = dict(self._extra_data)
+        return record
+
+    def to_dict(self):
+        """Convert record to dictionary.
+
+        Returns:
+            dict: segment attributes
+        """
+        output = dict(self.items())
+        if "segment_timecodes" in output:
+            output["segment_timecodes"] = dict(output["segment_timecodes"])
+        return output
+
+
+class TrackRecordSet(Sequence):
+    """Segment records of one track.
+
+    Record frame ranges are also kept in integer columns so frame
+    ranges of track are processed without accessing the records.
+
+    Args:
+        records (Iterable[SegmentRecord])[optional]: segment records
+    """
+    COLUMNS = ("record_in", "record_out")
+
+    def __init__(self, records=()):
+        self._records = []
+        self._columns = {name: array("q") for name in self.COLUMNS}
+        for record in records:
+            self.append(record)
+
+    def append(self, record):
+        """Add segment record.
+
+        Args:
+            record (SegmentRecord): segment record
+        """
+        self._records.append(record)
+        for name, column in self._columns.items():
+            column.append(record[name])
+
+    def column(self, name):
+        """Get column of record values.
+
+        Args:
+            name (str): name of column from `COLUMNS`
+
+        Returns:
+            array.array: column values
+        """
+        return self._columns[name]
 
+    def __getitem__(self, index):
+        return self._records[index]
 
-def _get_shot_tokens_values(clip, tokens):
+    def __len__(self):
+        return len(self._records)
+
+    def __repr__(self):
+        return "{}({} records)".format(
+            self.__class__.__name__, len(self._records))
+
+
+def get_segment_identity(segment, track_key=None):
+    """Get identity of segment stable during the session.
+
+    Flame is returning new python object for the same segment with every
+    access, so the segment is identified by its track, record range
+    and media. Track names are not unique so the track key should be
+    provided, ex. from `SequenceIndex.get_segment_track_key`.
+
+    Args:
+        segment (flame.PySegment): python api object
+        track_key (tuple)[optional]: version and track index of segment
+
+    Returns:
+        tuple: segment identity
+    """
+    return (
+        track_key,
+        segment.parent.name.get_value(),
+        segment.record_in.relative_frame,
+        segment.record_out.relative_frame,
+        segment.file_path,
+    )
+
+
+def _get_shot_token_key(token):
+    return str(re.sub("[<>]", "", token)).replace(" ", "_")
+
+
+def _get_shot_tokens_values(
+    clip, tokens, shot_tokens_cache=None, segment_identity=None
+):
+    """Get values of shot tokens resolved by Flame.
+
+    All tokens are resolved with one composite shot name template
+    and resolved values are cached per segment if cache is provided.
+
+    Args:
+        clip (flame.PySegment): python api object
+        tokens (list[str]): shot name tokens
+        shot_tokens_cache (dict)[optional]: cache of resolved tokens
+            shared between calls, ex. for duration of publishing
+        segment_identity (tuple)[optional]: cache key of the segment,
+            `get_segment_identity` without track key is used if not set
+
+    Returns:
+        dict: resolved token values by token names
+    """
     output = {}
 
     if not clip.shot_name:
         return output
 
+    tokens = tuple(tokens)
+    cache_key = None
+    if shot_tokens_cache is not None:
+        if segment_identity is None:
+            segment_identity = get_segment_identity(clip)
+        cache_key = (segment_identity, tokens)
+        cached_output = shot_tokens_cache.get(cache_key)
+        if cached_output is not None:
+            return dict(cached_output)
+
     old_value = clip.shot_name.get_value()
 
-    for token in tokens:
-        clip.shot_name.set_value(token)
-        _key = str(re.sub("[<>]", "", token)).replace(" ", "_")
+    try:
+        clip.shot_name.set_value(SHOT_TOKENS_DELIMITER.join(tokens))
+        values = clip.shot_name.get_value().split(SHOT_TOKENS_DELIMITER)
+
+        # delimiter is part of some resolved value
+        if len(values) != len(tokens):
+            values = []
+            for token in tokens:
+                clip.shot_name.set_value(token)
+                values.append(clip.shot_name.get_value())
+    finally:
+        clip.shot_name.set_value(old_value)
 
+    for token, value in zip(tokens, values):
         try:
-            output[_key] = int(clip.shot_name.get_value())
+            output[_get_shot_token_key(token)] = int(value)
         except ValueError:
-            output[_key] = clip.shot_name.get_value()
+            output[_get_shot_token_key(token)] = value
 
-    clip.shot_name.set_value(old_value)
+    if cache_key is not None:
+        shot_tokens_cache[cache_key] = dict(output)
 
     return output
 
 
 def get_segment_attributes(
-    segment, validation_aggregator: ValidationAggregator = None):
+    segment,
+    validation_aggregator: ValidationAggregator = None,
+    shot_tokens_cache: dict = None,
+    segment_identity: tuple = None,
+):
     """Get attributes of a segment.
 
     Args:
@@ -517,9 +1448,13 @@ def get_segment_attributes(
         validation_aggregator (ValidationAggregator, optional):
                 Output object to store attributes for passing into
                 publishing validation. Defaults to None.
+        shot_tokens_cache (dict, optional): Cache of resolved shot
+                tokens shared between calls. Defaults to None.
+        segment_identity (tuple, optional): Identity of the segment
+                used as key of `shot_tokens_cache`. Defaults to None.
 
     Returns:
-        dict: Dictionary of attributes.
+        SegmentRecord: Record of attributes.
     """
     if segment.type == "Gap":
         return None
@@ -530,15 +1465,15 @@ def get_segment_attributes(
     segment_name = segment.name.get_value()
 
     # Add timeline segment to tree
-    clip_data = {
-        "shot_name": segment.shot_name.get_value(),
-        "segment_comment": segment.comment.get_value(),
-        "tape_name": segment.tape_name,
-        "source_name": segment.source_name,
-        "PySegment": segment,
-        "segment_name": "",
-        "fpath": "",
-    }
+    clip_data = SegmentRecord(
+        shot_name=segment.shot_name.get_value(),
+        segment_comment=segment.comment.get_value(),
+        tape_name=segment.tape_name,
+        source_name=segment.source_name,
+        PySegment=segment,
+        segment_name="",
+        fpath="",
+    )
     # make sure even segments without proper name are handled as missing
     # this way they will be detected by Publisher Validator
     if not segment_name:
@@ -567,10 +1502,8 @@ def get_segment_attributes(
             )
 
     # add all available shot tokens
-    shot_tokens = _get_shot_tokens_values(segment, [
-        "<colour space>", "<width>", "<height>", "<depth>", "<segment>",
-        "<track>", "<track name>"
-    ])
+    shot_tokens = _get_shot_tokens_values(
+        segment, SEGMENT_SHOT_TOKENS, shot_tokens_cache, segment_identity)
     clip_data.update(shot_tokens)
 
     # populate shot source metadata
@@ -579,12 +1512,12 @@ def get_segment_attributes(
         "source_in", "source_out", "source_frame_rate", "source_height",
         "source_width", "source_ratio", "start_frame", "head", "tail",
     ]
-    segment_attrs_data = {}
+    timecode_attributes = []
     for attr_name in segment_attrs:
         if not hasattr(segment, attr_name):
             continue
         attr = getattr(segment, attr_name)
-        segment_attrs_data[attr_name] = str(attr).replace("+", ":")
+        timecode_attributes.append((attr_name, attr))
 
         if attr_name in ["record_in", "record_out"]:
             clip_data[attr_name] = attr.relative_frame
@@ -592,47 +1525,264 @@ def get_segment_attributes(
             if hasattr(attr, "frame"):
                 clip_data[attr_name] = attr.frame
 
-    clip_data["segment_timecodes"] = segment_attrs_data
+    # timecode strings are formatted only if used
+    clip_data.set_timecode_attributes(timecode_attributes)
     return clip_data
 
 
-def get_clips_in_reels(project, selected=False):
-    output_clips = []
-    project_desktop = project.current_workspace.desktop
+class SegmentAttributesStore(object):
+    """Snapshot store of segment attributes.
 
-    for reel_group in project_desktop.reel_groups:
-        for reel in reel_group.reels:
-            for clip in reel.clips:
-                if selected and not clip.selected.get_value():
-                    continue  # not part of selection
+    Attributes of each segment are read from Flame only once and shared
+    by all consumers, ex. for duration of publishing. Segments modified
+    during lifetime of the store have to be invalidated.
 
-                clip_data = {
-                    "PyClip": clip,
-                    "fps": float(str(clip.frame_rate)[:-4])
-                }
+    Args:
+        sequence_index (SequenceIndex)[optional]: index resolving track
+            keys of segments, see `set_sequence_index`
+    """
+    def __init__(self, sequence_index=None):
+        self.shot_tokens_cache = {}
+        self.sequence_index = sequence_index
+        # {segment identity: (segment attributes, failed validation)}
+        self._snapshots = {}
+
+    def set_sequence_index(self, sequence_index):
+        """Set index resolving version and track of segments.
+
+        Args:
+            sequence_index (SequenceIndex): index of current sequence
+        """
+        self.sequence_index = sequence_index
+
+    def get_segment_identity(self, segment, track_key=None):
+        """Get identity of segment including its version and track.
+
+        Args:
+            segment (flame.PySegment): python api object
+            track_key (tuple)[optional]: version and track index,
+                resolved by sequence index if not set
+
+        Returns:
+            tuple: segment identity
+        """
+        if track_key is None and self.sequence_index is not None:
+            track_key = self.sequence_index.get_segment_track_key(segment)
+        return get_segment_identity(segment, track_key)
+
+    def get_segment_attributes(
+        self,
+        segment,
+        validation_aggregator: ValidationAggregator = None,
+        track_key: tuple = None,
+    ):
+        """Get attributes of a segment from snapshot.
+
+        Args:
+            segment (flame.PySegment): python api object
+            validation_aggregator (ValidationAggregator, optional):
+                Output object to store attributes for passing into
+                publishing validation. Defaults to None.
+            track_key (tuple, optional): Version and track index of
+                segment, resolved by sequence index if not set.
+                Defaults to None.
+
+        Returns:
+            SegmentRecord: copy of segment attributes
+        """
+        if segment.type == "Gap":
+            return None
+
+        identity = self.get_segment_identity(segment, track_key)
+        snapshot = self._snapshots.get(identity)
+        if snapshot is None:
+            segment_aggregator = ValidationAggregator()
+            clip_data = get_segment_attributes(
+                segment,
+                segment_aggregator,
+                self.shot_tokens_cache,
+                segment_identity=identity,
+            )
+            snapshot = (clip_data, segment_aggregator.has_errors())
+            self._snapshots[identity] = snapshot
+
+        clip_data, failed = snapshot
+        if (
+            failed
+            and validation_aggregator is not None
+            and segment not in validation_aggregator.failed_segments
+        ):
+            validation_aggregator.failed_segments.append(segment)
+
+        # consumers are updating returned data
+        return clip_data.copy()
+
+    def invalidate(self, segment, track_key=None):
+        """Remove snapshot of modified segment.
+
+        Args:
+            segment (flame.PySegment): python api object
+            track_key (tuple)[optional]: version and track index of
+                segment, resolved by sequence index if not set
+        """
+        identity = self.get_segment_identity(segment, track_key)
+        self._snapshots.pop(identity, None)
+        for cache_key in [
+            cache_key for cache_key in self.shot_tokens_cache
+            if cache_key[0] == identity
+        ]:
+            del self.shot_tokens_cache[cache_key]
+
+    def clear(self):
+        """Remove all snapshots."""
+        self._snapshots.clear()
+        self.shot_tokens_cache.clear()
 
-                attrs = [
-                    "name", "width", "height",
-                    "ratio", "sample_rate", "bit_depth"
-                ]
 
-                for attr in attrs:
-                    val = getattr(clip, attr)
+class ReelClip(object):
+    """Reel clip with lazily resolved segment, marker and attributes.
 
-                    # make sure PyAttribute is converted to value
-                    func = getattr(val, "get_value", None)
-                    if func:
-                        val = func()
+    Args:
+        clip (flame.PyClip): flame api object
+        reel_group_name (str): name of parent reel group
+        reel_name (str): name of parent reel
+    """
+    __slots__ = (
+        "clip", "reel_group_name", "reel_name",
+        "_segment", "_marker_data", "_clip_data",
+    )
+
+    def __init__(self, clip, reel_group_name, reel_name):
+        self.clip = clip
+        self.reel_group_name = reel_group_name
+        self.reel_name = reel_name
+        self._segment = None
+        self._marker_data = _MISSING
+        self._clip_data = None
+
+    def __repr__(self):
+        return "<ReelClip {}/{}/{}>".format(
+            self.reel_group_name, self.reel_name, self.clip.name.get_value())
+
+    @property
+    def selected(self):
+        return self.clip.selected.get_value()
+
+    @property
+    def segment(self):
+        """flame.PySegment: segment of the clip."""
+        if self._segment is None:
+            self._segment = get_clip_segment(self.clip)
+        return self._segment
+
+    @property
+    def marker_data(self):
+        """Mapping: AYON marker data of clip or None if not imprinted."""
+        if self._marker_data is _MISSING:
+            try:
+                self._marker_data = _get_segment_data_marker(self.segment)
+            except ValueError as error:
+                # clip without single segment can not hold AYON marker
+                log.debug(str(error))
+                self._marker_data = None
+        return self._marker_data
+
+    def get_clip_data(self):
+        """Get attributes of the clip and its segment.
+
+        Returns:
+            SegmentRecord: clip data with `PyClip`
+        """
+        if self._clip_data is not None:
+            return self._clip_data
+
+        clip = self.clip
+        clip_data = get_segment_attributes(self.segment)
+        clip_data["PyClip"] = clip
+        clip_data["fps"] = float(str(clip.frame_rate)[:-4])
+
+        attrs = [
+            "name", "width", "height",
+            "ratio", "sample_rate", "bit_depth"
+        ]
+
+        for attr in attrs:
+            # segment attributes are having priority
+            if attr in clip_data:
+                continue
+
+            val = getattr(clip, attr)
+
+            # make sure PyAttribute is converted to value
+            func = getattr(val, "get_value", None)
+            if func:
+                val = func()
+
+            clip_data[attr] = val
+
+        self._clip_data = clip_data
+        return clip_data
+
+
+def iter_reel_clips(
+    project,
+    selected=False,
+    with_marker=False,
+    reel_group_names=None,
+    reel_names=None,
+):
+    """Walk reel clips of project desktop.
+
+    Clips are yielded as `ReelClip` handles, attributes are resolved
+    only for handles whose `get_clip_data` is called.
+
+    Args:
+        project (flame.PyProject): flame api object
+        selected (bool)[optional]: yield only selected clips
+        with_marker (bool)[optional]: yield only clips with AYON marker
+        reel_group_names (Iterable[str])[optional]: names of reel groups
+            to walk, all if not set
+        reel_names (Iterable[str])[optional]: names of reels to walk,
+            all if not set
+
+    Yields:
+        ReelClip: reel clip handle
+    """
+    if reel_group_names is not None:
+        reel_group_names = set(reel_group_names)
+    if reel_names is not None:
+        reel_names = set(reel_names)
 
-                    clip_data[attr] = val
+    project_desktop = project.current_workspace.desktop
+    for reel_group in project_desktop.reel_groups:
+        reel_group_name = reel_group.name.get_value()
+        if (
+            reel_group_names is not None
+            and reel_group_name not in reel_group_names
+        ):
+            continue
+
+        for reel in reel_group.reels:
+            reel_name = reel.name.get_value()
+            if reel_names is not None and reel_name not in reel_names:
+                continue
 
-                clip_segment = get_clip_segment(clip)
-                clip_segment_data = get_segment_attributes(clip_segment)
-                clip_data.update(clip_segment_data)
+            for clip in reel.clips:
+                reel_clip = ReelClip(clip, reel_group_name, reel_name)
+                if selected and not reel_clip.selected:
+                    continue  # not part of selection
+
+                if with_marker and not reel_clip.marker_data:
+                    continue
 
-                output_clips.append(clip_data)
+                yield reel_clip
 
-    return output_clips
+
+def get_clips_in_reels(project, selected=False):
+    return [
+        reel_clip.get_clip_data()
+        for reel_clip in iter_reel_clips(project, selected=selected)
+    ]
 
 
 def get_reformatted_filename(filename, padded=True):
@@ -769,6 +1919,69 @@ def get_clip_segment(flame_clip):
     return segments[0]
 
 
+class MediaInfoClips(object):
+    """Clips of `dl_get_media_info` output indexed by span paths.
+
+    Clips are looked up by base name of their span path, which is
+    the file pattern of media (ex. `file.[1001-1100].exr`).
+    """
+    def __init__(self):
+        self.names = []
+        self._entries = []
+        self._clips_by_span_name = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, xml_clip):
+        """Add clip element to index.
+
+        Args:
+            xml_clip (ET.Element): xml clip element
+        """
+        clip_name = xml_clip.findtext("name") or ""
+        span_paths = [
+            span_path.text
+            for span_path in xml_clip.iterfind(".//track//feed//span/path")
+            if span_path.text
+        ]
+        self.names.append(clip_name)
+        self._entries.append((clip_name, span_paths, xml_clip))
+        for span_path in span_paths:
+            span_name = os.path.basename(span_path)
+            self._clips_by_span_name.setdefault(span_name, []).append(
+                (clip_name, xml_clip))
+
+    def find(self, feed_basename, path_pattern):
+        """Find clip matching to the media.
+
+        Args:
+            feed_basename (str): media file basename
+            path_pattern (str): media file pattern (file.[1-2].exr)
+
+        Returns:
+            ET.Element: xml clip element or None if not found
+        """
+        if not path_pattern:
+            return None
+
+        # last matching clip is used as with the former linear search
+        for clip_name, xml_clip in reversed(
+            self._clips_by_span_name.get(path_pattern, [])
+        ):
+            if clip_name in feed_basename:
+                return xml_clip
+
+        # pattern can be only a part of span path
+        for clip_name, span_paths, xml_clip in reversed(self._entries):
+            if clip_name not in feed_basename:
+                continue
+            if any(path_pattern in span_path for span_path in span_paths):
+                return xml_clip
+
+        return None
+
+
 class MediaInfoFile(object):
     """Class to get media info file clip data
 
@@ -788,7 +2001,29 @@ class MediaInfoFile(object):
 
     log = log
 
+    # session cache of parsed `dl_get_media_info` output shared by all
+    # instances: {(feed_dir, feed_ext): (feed_dir mtime, MediaInfoClips)}
+    _media_info_cache = {}
+    _media_info_cache_lock = threading.Lock()
+    # one lock per feed directory so concurrent requests wait for
+    # a running probe instead of spawning another one
+    _media_info_probe_locks = {}
+    # session cache of scanned directories:
+    # {feed_dir: (feed_dir mtime, DirectorySequenceIndex)}
+    _sequence_index_cache = {}
+
+    # persistent index resolved from project settings on first use
+    _persistent_index = None
+    _persistent_index_resolved = False
+
+    # media headers are read natively if enabled in project settings
+    _media_header_probe_enabled = None
+    # (feed_dir, feed_ext) of media whose headers are missing some
+    # of media info attributes, e.g. images without timecode
+    _incomplete_header_feeds = set()
+
     _clip_data = None
+    _clip_data_source = None
     _start_frame = None
     _fps = None
     _drop_mode = None
@@ -814,48 +2049,321 @@ class MediaInfoFile(object):
         # test if `dl_get_media_info` path exists
         self._validate_media_script_path()
 
+        # reuse media info stored by previous sessions
+        index_data = self._get_index_data(path)
+        if index_data:
+            self._set_index_data(index_data)
+            return
+
         # derivate other feed variables
         feed_basename = os.path.basename(path)
         feed_dir = os.path.dirname(path)
         feed_ext = os.path.splitext(feed_basename)[1][1:].lower()
 
-        with maintained_temp_file_path(".clip") as tmp_path:
-            self._generate_media_info_file(tmp_path, feed_ext, feed_dir)
+        # get collection containing feed_basename from path
+        self.file_pattern = self._get_collection(
+            feed_basename, feed_dir, feed_ext)
+
+        if (
+            not self.file_pattern
+            and os.path.exists(os.path.join(feed_dir, feed_basename))
+        ):
+            self.file_pattern = feed_basename
+
+        # read media info from file header if format is supported,
+        # clip data are then generated only if they are used
+        self._clip_data_source = (feed_basename, feed_dir, feed_ext)
+        if self._set_media_header_data(feed_dir):
+            return
+
+        # get all clips found in feed directory (probed once per session)
+        media_info_clips = self._get_media_info_clips(feed_dir, feed_ext)
+
+        # get clip data and make them single if there is multiple
+        # clips data
+        xml_data = self._make_single_clip_media_info(
+            media_info_clips, feed_basename, self.file_pattern)
+        self.log.debug("xml_data: {}".format(xml_data))
+        self.log.debug("type: {}".format(type(xml_data)))
+
+        # get all time related data and assign them
+        self._get_time_info_from_origin(xml_data)
+        self.log.debug("start_frame: {}".format(self.start_frame))
+        self.log.debug("fps: {}".format(self.fps))
+        self.log.debug("drop frame: {}".format(self.drop_mode))
+        # get all resolution related data and assign them
+        self._get_resolution_info_from_origin(xml_data)
+
+        try:
+            self.log.debug("width: {}".format(self.width))
+            self.log.debug("height: {}".format(self.height))
+            self.log.debug("pixel aspect: {}".format(self.pixel_aspect))
+
+        except AttributeError:
+            self.log.debug("audio: true")
+
+        self.clip_data = xml_data
+
+        self._store_index_data(path)
+
+    @classmethod
+    def _get_persistent_index(cls):
+        """Get persistent media info index if enabled in settings.
+
+        Returns:
+            MediaInfoIndex: index object or None if disabled
+        """
+        if cls._persistent_index_resolved:
+            return cls._persistent_index
+
+        cls._persistent_index_resolved = True
+        index_settings = get_performance_settings().get(
+            "media_info_index", {})
+        if not index_settings.get("enabled"):
+            return None
+
+        index_path = (
+            index_settings.get("index_path") or get_default_index_path())
+        try:
+            cls._persistent_index = MediaInfoIndex(
+                index_path,
+                cls.MEDIA_SCRIPT_PATH,
+                max_entries=index_settings.get("max_entries", 50000),
+                logger=cls.log,
+            )
+        except (sqlite3.Error, OSError) as error:
+            cls.log.warning(
+                "Media info index `{}` is not available: {}".format(
+                    index_path, error))
+
+        return cls._persistent_index
+
+    @classmethod
+    def _is_media_header_probe_enabled(cls):
+        """Check if media headers are read natively as set in settings."""
+        if cls._media_header_probe_enabled is None:
+            cls._media_header_probe_enabled = bool(
+                get_performance_settings()
+                .get("media_header_probe", {})
+                .get("enabled")
+            )
+        return cls._media_header_probe_enabled
+
+    @classmethod
+    def _read_media_header(cls, path):
+        """Read media header with all media info attributes.
+
+        Headers of other files of the feed are not read once a header
+        is missing any attribute.
+
+        Args:
+            path (str): media file path
+
+        Returns:
+            dict: media header data or None if any attribute is missing
+        """
+        if not media_header.is_supported(path):
+            return None
+
+        feed_dir, feed_basename = os.path.split(path)
+        feed_key = (
+            feed_dir, os.path.splitext(feed_basename)[1][1:].lower())
+        if feed_key in cls._incomplete_header_feeds:
+            return None
+
+        header_data = media_header.read_media_header(path)
+        if not header_data or None in header_data.values():
+            cls._incomplete_header_feeds.add(feed_key)
+            return None
+        return header_data
+
+    def _set_media_header_data(self, feed_dir):
+        """Set attributes from header of the first file of media.
+
+        Args:
+            feed_dir (str): media directory
+
+        Returns:
+            bool: True if all attributes were found in header
+        """
+        if not self._is_media_header_probe_enabled():
+            return False
+
+        # timecode of sequence is the timecode of its first frame
+        first_file = re.sub(
+            r"\[(\d+)-\d+\]", r"\1", self.file_pattern or "", count=1)
+        header_data = self._read_media_header(
+            os.path.join(feed_dir, first_file))
+        if not header_data:
+            return False
+
+        self.log.debug("Using media header info: {}".format(header_data))
+        for key, value in header_data.items():
+            setattr(self, key, value)
+        return True
+
+    def _get_index_data(self, path):
+        index = self._get_persistent_index()
+        if not index:
+            return None
+
+        try:
+            return index.get(path)
+        except (sqlite3.Error, OSError) as error:
+            self.log.warning(
+                "Not able to read media info index: {}".format(error))
+            return None
+
+    def _set_index_data(self, index_data):
+        """Set attributes from persistent index data
+
+        Args:
+            index_data (dict): media info data from index
+        """
+        self.log.debug("Using indexed media info: {}".format(index_data))
+        self.file_pattern = index_data["file_pattern"]
+        for key in ("start_frame", "fps", "drop_mode"):
+            if index_data[key] is not None:
+                setattr(self, key, index_data[key])
+
+        # audio media are not having resolution attributes
+        for key in ("width", "height", "pixel_aspect"):
+            if index_data[key] is not None:
+                setattr(self, key, index_data[key])
+
+        self.clip_data = ET.fromstring(index_data["clip_xml"])
+
+    def _store_index_data(self, path):
+        index = self._get_persistent_index()
+        if not index:
+            return
+
+        index_data = {
+            "start_frame": self.start_frame,
+            "fps": self.fps,
+            "drop_mode": self.drop_mode,
+            "width": getattr(self, "width", None),
+            "height": getattr(self, "height", None),
+            "pixel_aspect": getattr(self, "pixel_aspect", None),
+            "file_pattern": self.file_pattern,
+            "clip_xml": ET.tostring(self.clip_data, encoding="unicode"),
+        }
+        try:
+            index.put(path, index_data)
+        except (sqlite3.Error, OSError) as error:
+            self.log.warning(
+                "Not able to write media info index: {}".format(error))
+
+    @classmethod
+    def prefetch(cls, paths, max_workers=8, timeout=None, logger=None):
+        """Probe feed directories of input paths concurrently.
 
-            # get collection containing feed_basename from path
-            self.file_pattern = self._get_collection(
-                feed_basename, feed_dir, feed_ext)
+        Every distinct feed directory and extension is probed only once
+        and stored into session cache, so following `MediaInfoFile`
+        objects are created without spawning `dl_get_media_info`.
 
+        Args:
+            paths (Iterable[str]): media file paths
+            max_workers (int)[optional]: number of concurrent probes
+            timeout (float)[optional]: seconds after a probe is killed,
+                timed out directories are probed again on demand
+            logger (logging.Logger)[optional]: logger
+
+        Returns:
+            int: number of successfully probed feed directories
+        """
+        _log = logger or cls.log
+        cls._validate_media_script_path()
+
+        header_probe_enabled = cls._is_media_header_probe_enabled()
+        feeds = set()
+        for path in paths:
+            if not path:
+                continue
+            feed_dir, feed_basename = os.path.split(path.replace("\\", "/"))
+            feed_ext = os.path.splitext(feed_basename)[1][1:].lower()
             if (
-                not self.file_pattern
-                and os.path.exists(os.path.join(feed_dir, feed_basename))
+                not feed_ext
+                or (feed_dir, feed_ext) in feeds
+                or not os.path.isdir(feed_dir)
             ):
-                self.file_pattern = feed_basename
-
-            # get clip data and make them single if there is multiple
-            # clips data
-            xml_data = self._make_single_clip_media_info(
-                tmp_path, feed_basename, self.file_pattern)
-            self.log.debug("xml_data: {}".format(xml_data))
-            self.log.debug("type: {}".format(type(xml_data)))
-
-            # get all time related data and assign them
-            self._get_time_info_from_origin(xml_data)
-            self.log.debug("start_frame: {}".format(self.start_frame))
-            self.log.debug("fps: {}".format(self.fps))
-            self.log.debug("drop frame: {}".format(self.drop_mode))
-            # get all resolution related data and assign them
-            self._get_resolution_info_from_origin(xml_data)
+                continue
+            # media info of the feed will be read from file headers
+            if header_probe_enabled and cls._read_media_header(path):
+                continue
+            feeds.add((feed_dir, feed_ext))
+
+        if not feeds:
+            return 0
+
+        _log.info(
+            "Prefetching media info of {} feed directories".format(
+                len(feeds)))
+
+        probed = 0
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(feeds)))
+        ) as executor:
+            futures = {
+                executor.submit(
+                    cls._get_media_info_clips, feed_dir, feed_ext, timeout
+                ): (feed_dir, feed_ext)
+                for feed_dir, feed_ext in feeds
+            }
+            for future, (feed_dir, feed_ext) in futures.items():
+                try:
+                    future.result()
+                    probed += 1
+                except subprocess.TimeoutExpired:
+                    _log.warning(
+                        "Media info probe timed out: {} ({})".format(
+                            feed_dir, feed_ext))
+                except Exception as error:
+                    _log.warning(
+                        "Media info probe failed: {} ({}): {}".format(
+                            feed_dir, feed_ext, error))
+
+        return probed
+
+    @classmethod
+    def _get_media_info_clips(cls, feed_dir, feed_ext, timeout=None):
+        """Get parsed clips of feed directory from session cache.
+
+        Media info of a directory is generated only once and reused
+        until the directory modification time changes.
 
-            try:
-                self.log.debug("width: {}".format(self.width))
-                self.log.debug("height: {}".format(self.height))
-                self.log.debug("pixel aspect: {}".format(self.pixel_aspect))
+        Args:
+            feed_dir (str): look up directory
+            feed_ext (str): file extension to be filtered
+            timeout (float)[optional]: probe timeout in seconds
+
+        Returns:
+            MediaInfoClips: indexed xml clips found in directory
+        """
+        cache_key = (os.path.normpath(feed_dir), feed_ext)
+        with cls._media_info_cache_lock:
+            probe_lock = cls._media_info_probe_locks.setdefault(
+                cache_key, threading.Lock())
 
-            except AttributeError:
-                self.log.debug("audio: true")
+        with probe_lock:
+            dir_mtime = os.stat(feed_dir).st_mtime_ns
 
-            self.clip_data = xml_data
+            cached = cls._media_info_cache.get(cache_key)
+            if cached and cached[0] == dir_mtime:
+                cls.log.debug(
+                    "Using cached media info: {}".format(cache_key))
+                return cached[1]
+
+            with maintained_temp_file_path(".clip") as tmp_path:
+                cls._generate_media_info_file(
+                    tmp_path, feed_ext, feed_dir, timeout)
+                media_info_clips = cls._read_media_info_file(tmp_path)
+
+            with cls._media_info_cache_lock:
+                cls._media_info_cache[cache_key] = (
+                    dir_mtime, media_info_clips)
+
+        return media_info_clips
 
     def _get_typed_value(self, xml_obj):
         """ Get typed value from xml object
@@ -899,55 +2407,74 @@ class MediaInfoFile(object):
                 f"Ext - {feed_ext}"
             )
 
-        # get all related files
-        files = [
-            f for f in os.listdir(feed_dir)
-            if partialname == self._separate_file_head(f, feed_ext)
-        ]
-
-        # ignore reminders as we dont need them
-        collections = clique.assemble(files)[0]
+        sequence_index = self._get_directory_sequence_index(feed_dir)
+        sequence = sequence_index.get_sequence(
+            partialname, feed_ext, feed_basename)
 
-        # in case no collection found return None
+        # in case no sequence found return None
         # it is probably just single file
-        if not collections:
-            return
+        if sequence is None:
+            return None
 
-        # we expect only one collection
-        collection = collections[0]
+        self.log.debug("__ sequence: {}".format(sequence))
 
-        self.log.debug("__ collection: {}".format(collection))
+        runs = sequence.runs
+        if len(runs) == 1:
+            return self._format_collection(
+                sequence.head, sequence.tail, runs[0], sequence.padding)
 
-        if collection.is_contiguous():
-            return self._format_collection(collection)
-
-        # add `[` in front to make sure it want capture
-        # shot name with the same number
+        # use continuous part of sequence containing the frame
         number_from_path = self._separate_number(feed_basename, feed_ext)
-        search_number_pattern = "[" + number_from_path
-        # convert to multiple collections
-        _continues_colls = collection.separate()
-        for _coll in _continues_colls:
-            coll_to_text = self._format_collection(
-                _coll, len(number_from_path))
-            self.log.debug("__ coll_to_text: {}".format(coll_to_text))
-            if search_number_pattern in coll_to_text:
-                return coll_to_text
+        if not number_from_path:
+            return None
+
+        frame = int(number_from_path)
+        for run in runs:
+            if run[0] <= frame <= run[1]:
+                return self._format_collection(
+                    sequence.head, sequence.tail, run, len(number_from_path))
         return None
 
+    @classmethod
+    def _get_directory_sequence_index(cls, feed_dir):
+        """Get sequence index of directory from session cache.
+
+        Directory is scanned again only if its modification time changes.
+
+        Args:
+            feed_dir (str): directory path
+
+        Returns:
+            DirectorySequenceIndex: sequence index of directory
+        """
+        cache_key = os.path.normpath(feed_dir)
+        dir_mtime = os.stat(feed_dir).st_mtime_ns
+
+        cached = cls._sequence_index_cache.get(cache_key)
+        if cached and cached[0] == dir_mtime:
+            return cached[1]
+
+        sequence_index = DirectorySequenceIndex(feed_dir)
+        with cls._media_info_cache_lock:
+            cls._sequence_index_cache[cache_key] = (
+                dir_mtime, sequence_index)
+        return sequence_index
+
     @staticmethod
-    def _format_collection(collection, padding=None):
-        padding = padding or collection.padding
-        # if no holes then return collection
-        head = collection.format("{head}")
-        tail = collection.format("{tail}")
-        range_template = "[{{:0{0}d}}-{{:0{0}d}}]".format(
-            padding)
-        ranges = range_template.format(
-            min(collection.indexes),
-            max(collection.indexes)
-        )
-        # if no holes then return collection
+    def _format_collection(head, tail, frame_range, padding=0):
+        """Format sequence file pattern.
+
+        Args:
+            head (str): file name part before frame number
+            tail (str): file name part after frame number
+            frame_range (tuple[int, int]): first and last frame
+            padding (int)[optional]: frame number padding
+
+        Returns:
+            str: file pattern. ex. file.[1001-1100].exr
+        """
+        range_template = "[{{:0{0}d}}-{{:0{0}d}}]".format(padding)
+        ranges = range_template.format(*frame_range)
         return "{}{}{}".format(head, ranges, tail)
 
     def _separate_file_head(self, basename, extension):
@@ -961,12 +2488,9 @@ class MediaInfoFile(object):
             str: file head
         """
         # in case sequence file
-        found = re.findall(
-            r"(.*)[._][\d]*(?=.{})".format(extension),
-            basename,
-        )
-        if found:
-            return found.pop()
+        found = SEQUENCE_FILE_PATTERN.match(basename)
+        if found and found.group("ext") == extension:
+            return found.group("name")
 
         # in case single file
         name, ext = os.path.splitext(basename)
@@ -985,20 +2509,25 @@ class MediaInfoFile(object):
             str: number with padding
         """
         # in case sequence file
-        found = re.findall(
-            r"[._]([\d]*)(?=.{})".format(extension),
-            basename,
-        )
-        if found:
-            return found.pop()
+        found = SEQUENCE_FILE_PATTERN.match(basename)
+        if found and found.group("ext") == extension:
+            return found.group("frame")
 
     @property
     def clip_data(self):
         """Clip's xml clip data
 
+        Clip data of media read from its header are generated
+        with `dl_get_media_info` on first use.
+
         Returns:
             xml.etree.ElementTree: xml data
         """
+        if self._clip_data is None and self._clip_data_source:
+            feed_basename, feed_dir, feed_ext = self._clip_data_source
+            media_info_clips = self._get_media_info_clips(feed_dir, feed_ext)
+            self._clip_data = self._make_single_clip_media_info(
+                media_info_clips, feed_basename, self.file_pattern)
         return self._clip_data
 
     @clip_data.setter
@@ -1057,25 +2586,30 @@ class MediaInfoFile(object):
     def file_pattern(self, fpattern):
         self._file_pattern = fpattern
 
-    def _validate_media_script_path(self):
-        if not os.path.isfile(self.MEDIA_SCRIPT_PATH):
+    @classmethod
+    def _validate_media_script_path(cls):
+        if not os.path.isfile(cls.MEDIA_SCRIPT_PATH):
             raise IOError("Media Script does not exist: `{}`".format(
-                self.MEDIA_SCRIPT_PATH))
+                cls.MEDIA_SCRIPT_PATH))
 
-    def _generate_media_info_file(self, fpath, feed_ext, feed_dir):
+    @classmethod
+    def _generate_media_info_file(
+            cls, fpath, feed_ext, feed_dir, timeout=None):
         """ Generate media info xml .clip file
 
         Args:
             fpath (str): .clip file path
             feed_ext (str): file extension to be filtered
             feed_dir (str): look up directory
+            timeout (float)[optional]: seconds after the process is killed
 
         Raises:
             TypeError: Type error if it fails
+            subprocess.TimeoutExpired: if process exceeded timeout
         """
         # Create cmd arguments for gettig xml file info file
         cmd_args = [
-            self.MEDIA_SCRIPT_PATH,
+            cls.MEDIA_SCRIPT_PATH,
             "-e", feed_ext,
             "-o", fpath,
             feed_dir
@@ -1083,16 +2617,81 @@ class MediaInfoFile(object):
 
         try:
             # execute creation of clip xml template data
-            run_subprocess(cmd_args)
-        except TypeError as error:
+            process = subprocess.run(
+                cmd_args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+                timeout=timeout or None,
+                check=True,
+            )
+        except subprocess.CalledProcessError as error:
             raise TypeError(
-                "Error creating `{}` due: {}".format(fpath, error))
+                "Error creating `{}` due: {}\n{}".format(
+                    fpath, error, error.stderr))
+
+        if process.stdout:
+            cls.log.debug(process.stdout)
+
+    @staticmethod
+    def _read_media_info_file(fpath):
+        """ Read all clip objects from .clip file
 
-    def _make_single_clip_media_info(self, fpath, feed_basename, path_pattern):
-        """ Separate only relative clip object form .clip file
+        File is parsed incrementally and each top level clip is
+        released from the parser tree once it is indexed.
 
         Args:
             fpath (str): clip file path
+
+        Returns:
+            MediaInfoClips: indexed xml clip elements
+        """
+        media_info_clips = MediaInfoClips()
+        # .clip file is having multiple top level clips so
+        # they are wrapped into a synthetic root
+        parser = ET.XMLPullParser(events=("start", "end"))
+        root = None
+        depth = 0
+
+        with open(fpath) as f:
+            first_line = f.readline()
+            parser.feed("<root>")
+            if not first_line.lstrip().startswith("<?xml"):
+                parser.feed(first_line)
+
+            while True:
+                chunk = f.read(MEDIA_INFO_READ_CHUNK_SIZE)
+                if chunk:
+                    parser.feed(chunk)
+                else:
+                    parser.feed("</root>")
+
+                for event, element in parser.read_events():
+                    if event == "start":
+                        if root is None:
+                            root = element
+                        depth += 1
+                        continue
+
+                    depth -= 1
+                    if depth == 1 and element.tag == "clip":
+                        media_info_clips.add(element)
+                        root.remove(element)
+                    elif depth == 1:
+                        root.remove(element)
+
+                if not chunk:
+                    break
+
+        parser.close()
+        return media_info_clips
+
+    def _make_single_clip_media_info(
+            self, media_info_clips, feed_basename, path_pattern):
+        """ Separate only relative clip object from .clip file clips
+
+        Args:
+            media_info_clips (MediaInfoClips): all clips of .clip file
             feed_basename (str): search basename
             path_pattern (str): search file pattern (file.[1-2].exr)
 
@@ -1100,48 +2699,20 @@ class MediaInfoFile(object):
             ET.ParseError: if nothing found
 
         Returns:
-            ET.Element: xml element data of matching clip
+            ET.Element: copy of xml element data of matching clip
         """
-        with open(fpath) as f:
-            lines = f.readlines()
-            _added_root = itertools.chain(
-                "<root>", deepcopy(lines)[1:], "</root>")
-            new_root = ET.fromstringlist(_added_root)
-
         # find the clip which is matching to my input name
-        xml_clips = new_root.findall("clip")
-        matching_clip = None
-        for xml_clip in xml_clips:
-            clip_name = xml_clip.find("name").text
-            self.log.debug("__ clip_name: `{}`".format(clip_name))
-            if clip_name not in feed_basename:
-                continue
-
-            # test path pattern
-            for out_track in xml_clip.iter("track"):
-                for out_feed in out_track.iter("feed"):
-                    for span in out_feed.iter("span"):
-                        # start frame
-                        span_path = span.find("path")
-                        self.log.debug(
-                            "__ span_path.text: {}, path_pattern: {}".format(
-                                span_path.text, path_pattern
-                            )
-                        )
-                        if path_pattern in span_path.text:
-                            matching_clip = xml_clip
+        matching_clip = media_info_clips.find(feed_basename, path_pattern)
 
         if matching_clip is None:
             # return warning there is missing clip
             raise ET.ParseError(
                 "Missing clip in `{}`. Available clips {}".format(
-                    feed_basename, [
-                        xml_clip.find("name").text
-                        for xml_clip in xml_clips
-                    ]
+                    feed_basename, media_info_clips.names
                 ))
 
-        return matching_clip
+        # cached clips are shared, consumers are modifying clip data
+        return deepcopy(matching_clip)
 
     def _get_time_info_from_origin(self, xml_data):
         """Set time info to class attributes
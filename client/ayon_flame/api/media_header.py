@@ -0,0 +1,591 @@
+"""
+Native media header reader used as fast path of `MediaInfoFile`.
+
+Only headers are read so just the first kilobytes of image files and
+atom or partition headers of movie files are touched.
+"""
+import logging
+import os
+import struct
+
+log = logging.getLogger(__name__)
+
+EXR_MAGIC = b"\x76\x2f\x31\x01"
+DPX_MAGICS = {b"SDPX": ">", b"XPDS": "<"}
+TIFF_BYTE_ORDERS = {b"II": "<", b"MM": ">"}
+MXF_PARTITION_PREFIX = bytes.fromhex("060e2b34020501010d010201010201")
+
+HEADER_CHUNK_SIZE = 1024 * 16
+# headers exceeding the limits are not read natively
+EXR_HEADER_MAX_SIZE = 1024 * 1024
+MOVIE_HEADER_MAX_SIZE = 1024 * 1024 * 64
+
+# undefined values of DPX headers
+UNDEFINED_UINT32 = 0xFFFFFFFF
+# drop frame flag of DPX timecode frames byte
+DPX_DROP_FRAME = 0x40
+
+# TIFF tags
+TIFF_IMAGE_WIDTH = 256
+TIFF_IMAGE_LENGTH = 257
+TIFF_X_RESOLUTION = 282
+TIFF_Y_RESOLUTION = 283
+TIFF_TIME_CODES = 51043
+TIFF_FRAME_RATE = 51044
+TIFF_TYPE_FORMATS = {
+    1: "B", 2: "c", 3: "H", 4: "I", 5: "II",
+    7: "B", 9: "i", 10: "ii", 11: "f", 12: "d",
+}
+
+# QuickTime timecode sample description flags
+TMCD_DROP_FRAME = 0x1
+TMCD_COUNTER = 0x8
+
+# MXF local set types and tags
+MXF_TIMECODE_COMPONENT = b"\x01\x14"
+MXF_SAMPLE_RATE = 0x3001
+MXF_STORED_HEIGHT = 0x3202
+MXF_STORED_WIDTH = 0x3203
+MXF_FRAME_LAYOUT = 0x320C
+MXF_ASPECT_RATIO = 0x320E
+MXF_START_TIMECODE = 0x1501
+MXF_ROUNDED_TIMECODE_BASE = 0x1502
+MXF_DROP_FRAME = 0x1503
+MXF_SEPARATE_FIELDS = 1
+
+
+def _empty_header_data():
+    return {
+        "width": None,
+        "height": None,
+        "pixel_aspect": None,
+        "fps": None,
+        "start_frame": None,
+        "drop_mode": None,
+    }
+
+
+def timecode_to_frames(hours, minutes, seconds, frames, fps, drop_frame):
+    """Convert timecode to number of frames.
+
+    Args:
+        hours (int): hours
+        minutes (int): minutes
+        seconds (int): seconds
+        frames (int): frames
+        fps (float): frame rate
+        drop_frame (bool): drop frame timecode
+
+    Returns:
+        int: number of frames
+    """
+    timecode_base = int(round(fps))
+    total_frames = (
+        (hours * 3600 + minutes * 60 + seconds) * timecode_base + frames)
+
+    if drop_frame:
+        # 2 frames are dropped every minute except every tenth
+        # minute for 29.97 fps, twice as much for 59.94 fps
+        drop_count = 2 * max(1, timecode_base // 30)
+        total_minutes = hours * 60 + minutes
+        total_frames -= drop_count * (total_minutes - total_minutes // 10)
+
+    return total_frames
+
+
+def _bcd(value):
+    return (value >> 4) * 10 + (value & 0xF)
+
+
+def _smpte_to_frames(packed, fps):
+    """Convert SMPTE 12M packed timecode to number of frames.
+
+    Args:
+        packed (int): timecode with frames in lowest byte
+        fps (float): frame rate
+
+    Returns:
+        tuple[int, bool]: number of frames and drop frame flag
+    """
+    frames = (packed & 0xF) + ((packed >> 4) & 0x3) * 10
+    drop_frame = bool((packed >> 6) & 0x1)
+    seconds = ((packed >> 8) & 0xF) + ((packed >> 12) & 0x7) * 10
+    minutes = ((packed >> 16) & 0xF) + ((packed >> 20) & 0x7) * 10
+    hours = ((packed >> 24) & 0xF) + ((packed >> 28) & 0x3) * 10
+    return (
+        timecode_to_frames(hours, minutes, seconds, frames, fps, drop_frame),
+        drop_frame
+    )
+
+
+def _get_fps(numerator, denominator=1):
+    if not numerator or not denominator:
+        return None
+    fps = float(numerator) / float(denominator)
+    if fps <= 0 or fps != fps:
+        return None
+    return round(fps, 3)
+
+
+def _read_exr_header(f):
+    data = f.read(HEADER_CHUNK_SIZE)
+    if data[:4] != EXR_MAGIC:
+        return None
+
+    def ensure(size):
+        nonlocal data
+        while len(data) < size:
+            if len(data) >= EXR_HEADER_MAX_SIZE:
+                raise ValueError("OpenEXR header is too large")
+            chunk = f.read(HEADER_CHUNK_SIZE)
+            if not chunk:
+                raise ValueError("OpenEXR header is truncated")
+            data += chunk
+
+    def find_null(start):
+        while True:
+            null_position = data.find(b"\0", start)
+            if null_position >= 0:
+                return null_position
+            ensure(len(data) + 1)
+
+    attributes = {}
+    position = 8
+    while True:
+        ensure(position + 1)
+        if data[position] == 0:
+            break
+        name_end = find_null(position)
+        type_end = find_null(name_end + 1)
+        ensure(type_end + 5)
+        name = data[position:name_end].decode("ascii", "replace")
+        (size,) = struct.unpack_from("<i", data, type_end + 1)
+        value_start = type_end + 5
+        ensure(value_start + size)
+        attributes[name] = data[value_start:value_start + size]
+        position = value_start + size
+
+    header_data = _empty_header_data()
+    window = attributes.get("displayWindow") or attributes.get("dataWindow")
+    if window:
+        x_min, y_min, x_max, y_max = struct.unpack("<4i", window[:16])
+        header_data["width"] = x_max - x_min + 1
+        header_data["height"] = y_max - y_min + 1
+
+    header_data["pixel_aspect"] = 1.0
+    if "pixelAspectRatio" in attributes:
+        (header_data["pixel_aspect"],) = struct.unpack(
+            "<f", attributes["pixelAspectRatio"][:4])
+
+    if "framesPerSecond" in attributes:
+        header_data["fps"] = _get_fps(
+            *struct.unpack("<iI", attributes["framesPerSecond"][:8]))
+
+    if "timeCode" in attributes and header_data["fps"]:
+        (packed,) = struct.unpack("<I", attributes["timeCode"][:4])
+        start_frame, drop_frame = _smpte_to_frames(
+            packed, header_data["fps"])
+        header_data["start_frame"] = start_frame
+        header_data["drop_mode"] = "DF" if drop_frame else "NDF"
+
+    return header_data
+
+
+def _read_dpx_header(f):
+    data = f.read(2048)
+    byte_order = DPX_MAGICS.get(data[:4])
+    if byte_order is None or len(data) < 1948:
+        return None
+
+    header_data = _empty_header_data()
+    header_data["width"], header_data["height"] = struct.unpack_from(
+        byte_order + "II", data, 772)
+
+    header_data["pixel_aspect"] = 1.0
+    aspect_h, aspect_v = struct.unpack_from(byte_order + "II", data, 1628)
+    if (
+        aspect_h and aspect_v
+        and UNDEFINED_UINT32 not in (aspect_h, aspect_v)
+    ):
+        header_data["pixel_aspect"] = float(aspect_h) / float(aspect_v)
+
+    # television frame rate is preferred over film frame rate
+    (tv_fps,) = struct.unpack_from(byte_order + "f", data, 1940)
+    (film_fps,) = struct.unpack_from(byte_order + "f", data, 1724)
+    header_data["fps"] = _get_fps(tv_fps) or _get_fps(film_fps)
+
+    (timecode,) = struct.unpack_from(byte_order + "I", data, 1920)
+    if timecode != UNDEFINED_UINT32 and header_data["fps"]:
+        # SMPTE 12M flags are stored in high bits of BCD digits
+        drop_frame = bool(timecode & DPX_DROP_FRAME)
+        header_data["start_frame"] = timecode_to_frames(
+            _bcd((timecode >> 24) & 0x3F),
+            _bcd((timecode >> 16) & 0x7F),
+            _bcd((timecode >> 8) & 0x7F),
+            _bcd(timecode & 0x3F),
+            header_data["fps"],
+            drop_frame
+        )
+        header_data["drop_mode"] = "DF" if drop_frame else "NDF"
+
+    return header_data
+
+
+def _read_tiff_header(f):
+    """Timecode is read from DNG `TimeCodes` and `FrameRate` tags."""
+    data = f.read(8)
+    byte_order = TIFF_BYTE_ORDERS.get(data[:2])
+    if byte_order is None:
+        return None
+
+    magic, ifd_offset = struct.unpack(byte_order + "HI", data[2:8])
+    # BigTIFF is not supported
+    if magic != 42:
+        return None
+
+    f.seek(ifd_offset)
+    (entries_count,) = struct.unpack(byte_order + "H", f.read(2))
+    entries = f.read(entries_count * 12)
+
+    values = {}
+    for index in range(entries_count):
+        tag, value_type, count = struct.unpack_from(
+            byte_order + "HHI", entries, index * 12)
+        type_format = TIFF_TYPE_FORMATS.get(value_type)
+        if type_format is None or tag not in (
+            TIFF_IMAGE_WIDTH, TIFF_IMAGE_LENGTH, TIFF_X_RESOLUTION,
+            TIFF_Y_RESOLUTION, TIFF_TIME_CODES, TIFF_FRAME_RATE,
+        ):
+            continue
+
+        value_format = byte_order + type_format * count
+        value_size = struct.calcsize(value_format)
+        if value_size <= 4:
+            raw_value = entries[index * 12 + 8:index * 12 + 8 + value_size]
+        else:
+            (value_offset,) = struct.unpack_from(
+                byte_order + "I", entries, index * 12 + 8)
+            f.seek(value_offset)
+            raw_value = f.read(value_size)
+        values[tag] = struct.unpack(value_format, raw_value)
+
+    header_data = _empty_header_data()
+    if TIFF_IMAGE_WIDTH in values and TIFF_IMAGE_LENGTH in values:
+        header_data["width"] = values[TIFF_IMAGE_WIDTH][0]
+        header_data["height"] = values[TIFF_IMAGE_LENGTH][0]
+
+    header_data["pixel_aspect"] = 1.0
+    x_resolution = values.get(TIFF_X_RESOLUTION)
+    y_resolution = values.get(TIFF_Y_RESOLUTION)
+    if x_resolution and y_resolution and all(x_resolution + y_resolution):
+        header_data["pixel_aspect"] = (
+            (y_resolution[0] / y_resolution[1])
+            / (x_resolution[0] / x_resolution[1])
+        )
+
+    if TIFF_FRAME_RATE in values:
+        header_data["fps"] = _get_fps(*values[TIFF_FRAME_RATE][:2])
+
+    time_codes = values.get(TIFF_TIME_CODES)
+    if time_codes and len(time_codes) >= 4 and header_data["fps"]:
+        (packed,) = struct.unpack("<I", bytes(time_codes[:4]))
+        start_frame, drop_frame = _smpte_to_frames(
+            packed, header_data["fps"])
+        header_data["start_frame"] = start_frame
+        header_data["drop_mode"] = "DF" if drop_frame else "NDF"
+
+    return header_data
+
+
+def _iter_atoms(data, start=0, end=None):
+    """Iterate QuickTime atoms in data.
+
+    Yields:
+        tuple[bytes, int, int]: atom type, payload start and end
+    """
+    end = len(data) if end is None else end
+    position = start
+    while position + 8 <= end:
+        size, atom_type = struct.unpack_from(">I4s", data, position)
+        header_size = 8
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", data, position + 8)
+            header_size = 16
+        elif size == 0:
+            size = end - position
+        if size < header_size:
+            return
+        yield atom_type, position + header_size, min(position + size, end)
+        position += size
+
+
+def _find_atom(data, path, start=0, end=None):
+    for atom_type, payload_start, payload_end in _iter_atoms(
+        data, start, end
+    ):
+        if atom_type != path[0]:
+            continue
+        if len(path) == 1:
+            return payload_start, payload_end
+        return _find_atom(data, path[1:], payload_start, payload_end)
+    return None
+
+
+def _read_movie_atom(f):
+    """Read payload of `moov` atom without reading media data."""
+    file_size = os.fstat(f.fileno()).st_size
+    position = 0
+    while position + 8 <= file_size:
+        f.seek(position)
+        atom_header = f.read(16)
+        size, atom_type = struct.unpack_from(">I4s", atom_header)
+        header_size = 8
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", atom_header, 8)
+            header_size = 16
+        elif size == 0:
+            size = file_size - position
+        if size < header_size:
+            return None
+
+        if atom_type == b"moov":
+            if size > MOVIE_HEADER_MAX_SIZE:
+                return None
+            f.seek(position + header_size)
+            return f.read(size - header_size)
+
+        position += size
+    return None
+
+
+def _read_quicktime_header(f):
+    """Timecode is read from first sample of `tmcd` track."""
+    data = f.read(8)
+    if data[4:8] not in (b"ftyp", b"moov", b"mdat", b"wide", b"free"):
+        return None
+
+    movie = _read_movie_atom(f)
+    if movie is None:
+        return None
+
+    header_data = _empty_header_data()
+    timecode_offset = None
+    timecode_flags = 0
+    for atom_type, trak_start, trak_end in _iter_atoms(movie):
+        if atom_type != b"trak":
+            continue
+        media = _find_atom(movie, (b"mdia",), trak_start, trak_end)
+        if media is None:
+            continue
+        handler = _find_atom(movie, (b"hdlr",), *media)
+        sample_table = _find_atom(
+            movie, (b"minf", b"stbl"), *media)
+        if handler is None or sample_table is None:
+            continue
+        handler_type = movie[handler[0] + 8:handler[0] + 12]
+        description = _find_atom(movie, (b"stsd",), *sample_table)
+        if description is None:
+            continue
+        # first sample description entry
+        entry = description[0] + 8
+
+        if handler_type == b"vide" and header_data["width"] is None:
+            header_data["width"], header_data["height"] = (
+                struct.unpack_from(">HH", movie, entry + 32))
+            header_data["pixel_aspect"] = 1.0
+            (entry_size,) = struct.unpack_from(">I", movie, entry)
+            pixel_aspect = _find_atom(
+                movie, (b"pasp",), entry + 86, entry + entry_size)
+            if pixel_aspect:
+                h_spacing, v_spacing = struct.unpack_from(
+                    ">II", movie, pixel_aspect[0])
+                if h_spacing and v_spacing:
+                    header_data["pixel_aspect"] = (
+                        float(h_spacing) / float(v_spacing))
+
+        elif handler_type == b"tmcd" and timecode_offset is None:
+            (
+                timecode_flags, timescale, frame_duration
+            ) = struct.unpack_from(">III", movie, entry + 20)
+            header_data["fps"] = _get_fps(timescale, frame_duration)
+            chunk_offsets = _find_atom(movie, (b"stco",), *sample_table)
+            offset_format = ">I"
+            if chunk_offsets is None:
+                chunk_offsets = _find_atom(movie, (b"co64",), *sample_table)
+                offset_format = ">Q"
+            if chunk_offsets is None:
+                continue
+            (entries_count,) = struct.unpack_from(
+                ">I", movie, chunk_offsets[0] + 4)
+            if entries_count:
+                (timecode_offset,) = struct.unpack_from(
+                    offset_format, movie, chunk_offsets[0] + 8)
+
+    if timecode_offset is not None and not timecode_flags & TMCD_COUNTER:
+        f.seek(timecode_offset)
+        (header_data["start_frame"],) = struct.unpack(">I", f.read(4))
+        header_data["drop_mode"] = (
+            "DF" if timecode_flags & TMCD_DROP_FRAME else "NDF")
+
+    return header_data
+
+
+def _read_ber_length(data, position):
+    length = data[position]
+    if length < 0x80:
+        return length, position + 1
+    size = length & 0x7F
+    return (
+        int.from_bytes(data[position + 1:position + 1 + size], "big"),
+        position + 1 + size
+    )
+
+
+def _iter_mxf_local_sets(data):
+    """Iterate local sets of MXF header metadata.
+
+    Yields:
+        tuple[bytes, dict[int, bytes]]: set key and its items by tag
+    """
+    position = 0
+    while position + 17 <= len(data):
+        key = data[position:position + 16]
+        length, value_start = _read_ber_length(data, position + 16)
+        value_end = value_start + length
+        # local sets with 2-byte tags and 2-byte lengths
+        if key[:4] == b"\x06\x0e\x2b\x34" and key[5] == 0x53:
+            items = {}
+            item_position = value_start
+            while item_position + 4 <= value_end:
+                tag, item_length = struct.unpack_from(
+                    ">HH", data, item_position)
+                item_position += 4
+                items[tag] = data[item_position:item_position + item_length]
+                item_position += item_length
+            yield key, items
+        position = value_end
+
+
+def _read_mxf_header(f):
+    """Picture descriptor and timecode component of header metadata."""
+    data = f.read(HEADER_CHUNK_SIZE * 4)
+    partition_start = data.find(MXF_PARTITION_PREFIX)
+    if partition_start < 0:
+        return None
+
+    length, value_start = _read_ber_length(data, partition_start + 16)
+    (header_byte_count,) = struct.unpack_from(">Q", data, value_start + 32)
+    if header_byte_count > MOVIE_HEADER_MAX_SIZE:
+        return None
+
+    header_start = value_start + length
+    f.seek(header_start)
+    header_metadata = f.read(header_byte_count)
+
+    header_data = _empty_header_data()
+    timecodes = []
+    for key, items in _iter_mxf_local_sets(header_metadata):
+        if key[13:15] == MXF_TIMECODE_COMPONENT:
+            if MXF_START_TIMECODE not in items:
+                continue
+            (start_timecode,) = struct.unpack(
+                ">q", items[MXF_START_TIMECODE])
+            drop_frame = items.get(MXF_DROP_FRAME, b"\0")[:1] != b"\0"
+            timecode_base = None
+            if MXF_ROUNDED_TIMECODE_BASE in items:
+                (timecode_base,) = struct.unpack(
+                    ">H", items[MXF_ROUNDED_TIMECODE_BASE])
+            timecodes.append((start_timecode, drop_frame, timecode_base))
+
+        elif (
+            MXF_STORED_WIDTH in items
+            and MXF_STORED_HEIGHT in items
+            and header_data["width"] is None
+        ):
+            (header_data["width"],) = struct.unpack(
+                ">I", items[MXF_STORED_WIDTH])
+            (header_data["height"],) = struct.unpack(
+                ">I", items[MXF_STORED_HEIGHT])
+            # stored height of separated fields is height of one field
+            frame_layout = items.get(MXF_FRAME_LAYOUT, b"\0")[0]
+            if frame_layout == MXF_SEPARATE_FIELDS:
+                header_data["height"] *= 2
+
+            if MXF_SAMPLE_RATE in items:
+                header_data["fps"] = _get_fps(
+                    *struct.unpack(">ii", items[MXF_SAMPLE_RATE]))
+
+            header_data["pixel_aspect"] = 1.0
+            if MXF_ASPECT_RATIO in items and header_data["width"]:
+                aspect_numerator, aspect_denominator = struct.unpack(
+                    ">ii", items[MXF_ASPECT_RATIO])
+                if aspect_numerator > 0 and aspect_denominator > 0:
+                    header_data["pixel_aspect"] = round(
+                        aspect_numerator * header_data["height"]
+                        / (aspect_denominator * header_data["width"]),
+                        4
+                    )
+
+    if timecodes:
+        # material package timecode is often zero while
+        # the source package is having the camera timecode
+        start_timecode, drop_frame, timecode_base = next(
+            (timecode for timecode in timecodes if timecode[0]),
+            timecodes[0]
+        )
+        header_data["start_frame"] = start_timecode
+        header_data["drop_mode"] = "DF" if drop_frame else "NDF"
+        if header_data["fps"] is None:
+            header_data["fps"] = _get_fps(timecode_base)
+
+    return header_data
+
+
+HEADER_READERS = {
+    "exr": _read_exr_header,
+    "dpx": _read_dpx_header,
+    "tif": _read_tiff_header,
+    "tiff": _read_tiff_header,
+    "mov": _read_quicktime_header,
+    "mp4": _read_quicktime_header,
+    "m4v": _read_quicktime_header,
+    "mxf": _read_mxf_header,
+}
+
+
+def is_supported(path):
+    """Check if header of media file can be read natively.
+
+    Args:
+        path (str): media file path
+
+    Returns:
+        bool: True if file extension is supported
+    """
+    return os.path.splitext(path)[1][1:].lower() in HEADER_READERS
+
+
+def read_media_header(path):
+    """Read media info from header of media file.
+
+    Values which are not stored in header are None.
+
+    Args:
+        path (str): media file path
+
+    Returns:
+        dict: media info data with `width`, `height`, `pixel_aspect`,
+            `fps`, `start_frame` and `drop_mode` keys or None if format
+            is not supported or header is not readable
+    """
+    reader = HEADER_READERS.get(os.path.splitext(path)[1][1:].lower())
+    if reader is None:
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            return reader(f)
+    except (OSError, ValueError, IndexError, struct.error) as error:
+        log.debug("Not able to read media header `{}`: {}".format(
+            path, error))
+        return None
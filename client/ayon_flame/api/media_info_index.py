@@ -0,0 +1,229 @@
+"""
+Persistent index of media info data shared between Flame sessions.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from ayon_core.lib import Logger
+
+log = Logger.get_logger(__name__)
+
+# values of `MediaInfoFile` stored in the index
+INDEXED_KEYS = (
+    "start_frame",
+    "fps",
+    "drop_mode",
+    "width",
+    "height",
+    "pixel_aspect",
+    "file_pattern",
+    "clip_xml",
+)
+
+
+def get_default_index_path():
+    """Default location of the index file in AYON Flame user folder."""
+    return os.path.join(
+        os.path.expanduser("~"),
+        ".AYON",
+        "AYONFlame",
+        "media_info_index.sqlite"
+    )
+
+
+class MediaInfoIndex(object):
+    """SQLite index of media info keyed by media path.
+
+    Each entry is validated by size and modification time of the media
+    file and of its parent directory, so sequences with added or removed
+    frames are probed again. All entries are dropped when the
+    `dl_get_media_info` executable changes (e.g. after Flame upgrade).
+
+    Args:
+        index_path (str): path of SQLite file
+        media_script_path (str): path to `dl_get_media_info` executable
+        max_entries (int): number of entries kept in index, least
+            recently used entries are evicted above it
+        logger (logging.Logger)[optional]: logger
+    """
+    SCHEMA_VERSION = 1
+
+    def __init__(
+        self, index_path, media_script_path, max_entries=50000, logger=None
+    ):
+        self.log = logger or log
+        self.index_path = index_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        index_dir = os.path.dirname(index_path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+
+        self._connection = sqlite3.connect(
+            index_path, timeout=10, check_same_thread=False)
+        self._create_tables()
+        self._validate_tool_stamp(
+            self._get_tool_stamp(media_script_path))
+
+    def _create_tables(self):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS media_info ("
+                " path TEXT PRIMARY KEY,"
+                " fingerprint TEXT NOT NULL,"
+                " start_frame INTEGER,"
+                " fps REAL,"
+                " drop_mode TEXT,"
+                " width INTEGER,"
+                " height INTEGER,"
+                " pixel_aspect REAL,"
+                " file_pattern TEXT,"
+                " clip_xml TEXT,"
+                " last_access REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS media_info_last_access"
+                " ON media_info (last_access)"
+            )
+
+    @staticmethod
+    def _get_tool_stamp(media_script_path):
+        """Version stamp of `dl_get_media_info` executable.
+
+        `current` folder of Autodesk installation is a symlink, resolved
+        path holds the version of installed Flame.
+        """
+        real_path = os.path.realpath(media_script_path)
+        stat = os.stat(real_path)
+        return "{}:{}:{}:{}".format(
+            MediaInfoIndex.SCHEMA_VERSION,
+            real_path,
+            stat.st_size,
+            stat.st_mtime_ns,
+        )
+
+    def _validate_tool_stamp(self, tool_stamp):
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value FROM meta WHERE key = 'tool_stamp'"
+            ).fetchone()
+            if row and row[0] == tool_stamp:
+                return
+
+            if row:
+                self.log.info(
+                    "Media info tool changed, clearing media info index")
+            self._connection.execute("DELETE FROM media_info")
+            self._connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value)"
+                " VALUES ('tool_stamp', ?)",
+                (tool_stamp,)
+            )
+
+    @staticmethod
+    def get_fingerprint(path):
+        """Fingerprint of media file and its parent directory.
+
+        Args:
+            path (str): media file path
+
+        Returns:
+            str: fingerprint
+        """
+        file_stat = os.stat(path)
+        dir_stat = os.stat(os.path.dirname(path) or ".")
+        return "{}:{}:{}".format(
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+            dir_stat.st_mtime_ns,
+        )
+
+    def get(self, path):
+        """Get indexed media info data of the path.
+
+        Args:
+            path (str): media file path
+
+        Returns:
+            dict: media info data or None if missing or outdated
+        """
+        fingerprint = self.get_fingerprint(path)
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT fingerprint, {} FROM media_info WHERE path = ?".format(
+                    ", ".join(INDEXED_KEYS)),
+                (path,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if row[0] != fingerprint:
+                self._connection.execute(
+                    "DELETE FROM media_info WHERE path = ?", (path,))
+                return None
+
+            self._connection.execute(
+                "UPDATE media_info SET last_access = ? WHERE path = ?",
+                (time.time(), path)
+            )
+
+        return dict(zip(INDEXED_KEYS, row[1:]))
+
+    def put(self, path, data):
+        """Store media info data of the path.
+
+        Args:
+            path (str): media file path
+            data (dict): media info data with `INDEXED_KEYS`
+        """
+        fingerprint = self.get_fingerprint(path)
+        values = [data.get(key) for key in INDEXED_KEYS]
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO media_info"
+                " (path, fingerprint, {}, last_access)"
+                " VALUES (?, ?, {}, ?)".format(
+                    ", ".join(INDEXED_KEYS),
+                    ", ".join("?" for _ in INDEXED_KEYS),
+                ),
+                [path, fingerprint] + values + [time.time()]
+            )
+            self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries above `max_entries`.
+
+        Index is trimmed to 90% of `max_entries` so eviction
+        does not run with every new entry.
+        """
+        count = self._connection.execute(
+            "SELECT COUNT(*) FROM media_info").fetchone()[0]
+        if count <= self.max_entries:
+            return
+
+        remove_count = count - int(self.max_entries * 0.9)
+        self._connection.execute(
+            "DELETE FROM media_info WHERE path IN ("
+            " SELECT path FROM media_info"
+            " ORDER BY last_access ASC LIMIT ?)",
+            (remove_count,)
+        )
+        self.log.debug(
+            "Evicted {} entries from media info index".format(remove_count))
+
+    def clear(self):
+        """Remove all entries from index."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM media_info")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -106,6 +106,49 @@ class _FlameMenuApp(object):
     def refresh(self, *args, **kwargs):
         self.rescan()
 
+    def export_otio(self, selection):
+        """Export selected sequences to `.otio` files in one pass."""
+        import ayon_flame.api as ayfapi
+        from ayon_flame.otio import flame_export
+
+        parent = _get_main_window()
+        sequences = ayfapi.get_selected_sequences(selection)
+        if not sequences:
+            QtWidgets.QMessageBox.warning(
+                parent, "Export OTIO", "No sequence is selected.")
+            return
+
+        output_dir = QtWidgets.QFileDialog.getExistingDirectory(
+            parent,
+            "Export OTIO of {} sequences".format(len(sequences))
+        )
+        if not output_dir:
+            return
+
+        performance_settings = ayfapi.get_performance_settings()
+        prefetch_settings = performance_settings.get(
+            "media_info_prefetch", {})
+        prefetch_workers = 0
+        if prefetch_settings.get("enabled"):
+            prefetch_workers = prefetch_settings["max_workers"]
+        batch_settings = performance_settings.get("otio_batch_export", {})
+
+        paths = flame_export.export_otio_timelines(
+            sequences,
+            output_dir,
+            single_file=batch_settings.get("single_file", False),
+            media_prefetch_workers=prefetch_workers,
+            media_probe_timeout=prefetch_settings.get("probe_timeout"),
+            clip_workers=batch_settings.get("max_workers", 4),
+        )
+        self.log.info("Exported OTIO files: {}".format(paths))
+        QtWidgets.QMessageBox.information(
+            parent,
+            "Export OTIO",
+            "Exported {} sequences to:\n{}".format(
+                len(sequences), output_dir)
+        )
+
 
 class FlameMenuProjectConnect(_FlameMenuApp):
     """ Takes care of the preferences dialog as well.
@@ -176,6 +219,10 @@ class FlameMenuTimeline(_FlameMenuApp):
             "name": "4 - Library...",
             "execute": lambda x: self.tools_helper.show_library_loader()
         })
+        menu['actions'].append({
+            "name": "5 - Export OTIO...",
+            "execute": lambda x: self.export_otio(x)
+        })
 
         return menu
 
@@ -275,5 +322,9 @@ class FlameMenuUniversal(_FlameMenuApp):
             "name": "4 - Library...",
             "execute": lambda x: self.tools_helper.show_library_loader()
         })
+        menu['actions'].append({
+            "name": "5 - Export OTIO...",
+            "execute": lambda x: self.export_otio(x)
+        })
 
         return menu
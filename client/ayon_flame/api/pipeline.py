@@ -3,6 +3,7 @@ Basic AYON integration
 """
 import contextlib
 import os
+import sqlite3
 from copy import deepcopy
 import flame
 
@@ -20,11 +21,17 @@ from pyblish import api as pyblish
 from ayon_flame import FLAME_ADDON_ROOT
 
 from .lib import (
+    buffered_segment_data_markers,
+    get_clip_data_marker,
+    get_current_project,
     get_current_sequence,
+    get_performance_settings,
+    get_segment_data_marker,
     maintained_segment_selection,
     set_clip_data_marker,
     set_segment_data_marker,
 )
+from .instance_store import get_instance_store, get_project_store_path
 
 PLUGINS_DIR = os.path.join(FLAME_ADDON_ROOT, "plugins")
 PUBLISH_PATH = os.path.join(PLUGINS_DIR, "publish")
@@ -34,6 +41,25 @@ CREATE_PATH = os.path.join(PLUGINS_DIR, "create")
 
 log = Logger.get_logger(__name__)
 
+# marker key flagging instances data kept in project instance store
+INSTANCE_STORE_KEY = "instance_store"
+# marker key of creator instances data by creator identifier
+INSTANCES_DATA_KEY = "flame_sub_products"
+# instance data kept in marker as fallback of instance store, instances
+# can be collected and removed even if the store is not available
+INSTANCE_HEADER_KEYS = (
+    "instance_id",
+    "creator_identifier",
+    "productType",
+    "productBaseType",
+    "productName",
+    "variant",
+    "folderPath",
+    "task",
+    "active",
+    "parent_instance_id",
+)
+
 
 class FlameHost(HostBase, ILoadHost, IPublishHost):
     name = "flame"
@@ -157,6 +183,241 @@ def imprint(item, data=None):
         raise TypeError("Unsupported item type: {}".format(type(item)))
 
 
+@contextlib.contextmanager
+def buffered_imprint(sequence_index=None):
+    """Write data imprinted inside of the context once per item on exit.
+
+    Data stored to project instance store are committed at once.
+
+    Args:
+        sequence_index (lib.SequenceIndex)[optional]: index of sequence
+            of imprinted segments
+
+    Examples:
+        with buffered_imprint(sequence_index):
+            for segment in segments:
+                imprint(segment, {"active": True})
+    """
+    instance_store = get_project_instance_store()
+    with buffered_segment_data_markers(sequence_index):
+        if instance_store is None:
+            yield
+            return
+
+        with instance_store.batch():
+            yield
+
+
+def get_project_instance_store(enabled_only=True):
+    """Get instance store of current project.
+
+    Args:
+        enabled_only (bool)[optional]: return existing store also if it
+            is disabled in settings, so stored instances can be read
+
+    Returns:
+        InstanceStore: store object or None if not available
+    """
+    store_settings = get_performance_settings().get("instance_store", {})
+    enabled = store_settings.get("enabled", False)
+    if enabled_only and not enabled:
+        return None
+
+    workdir = os.environ.get("AYON_WORKDIR")
+    if not workdir:
+        return None
+
+    store_path = get_project_store_path(workdir, get_current_project().name)
+    try:
+        return get_instance_store(store_path, create=enabled)
+    except (sqlite3.Error, OSError) as error:
+        log.warning(
+            "Instance store `{}` is not available: {}".format(
+                store_path, error))
+        return None
+
+
+def _get_item_marker_data(item):
+    if isinstance(item, flame.PyClip):
+        return get_clip_data_marker(item)
+    return get_segment_data_marker(item)
+
+
+def get_stored_instances_data(markers_data, instance_store=None):
+    """Get stored instances data referenced by AYON markers data.
+
+    All referenced clip indexes are read with one query.
+
+    Args:
+        markers_data (Iterable[dict]): data of AYON markers
+        instance_store (InstanceStore)[optional]: store to read from
+
+    Returns:
+        dict[str, dict]: stored data by clip index
+    """
+    clip_indexes = [
+        marker_data["clip_index"]
+        for marker_data in markers_data
+        if marker_data and marker_data.get(INSTANCE_STORE_KEY)
+    ]
+    if not clip_indexes:
+        return {}
+
+    instance_store = (
+        instance_store or get_project_instance_store(enabled_only=False))
+    if instance_store is None:
+        log.warning("Instance store of current project is not available.")
+        return {}
+
+    return instance_store.get_many(clip_indexes)
+
+
+def resolve_imprinted_data(marker_data, stored_data=None):
+    """Resolve AYON marker data with instances data from instance store.
+
+    Args:
+        marker_data (dict): data of AYON marker
+        stored_data (dict)[optional]: stored data by clip index from
+            `get_stored_instances_data`, read from store if not provided
+
+    Returns:
+        dict: imprinted data, fallback header data of AYON marker if
+            referenced data are missing or None if marker has none
+    """
+    if not marker_data or not marker_data.get(INSTANCE_STORE_KEY):
+        return marker_data
+
+    if stored_data is None:
+        stored_data = get_stored_instances_data([marker_data])
+
+    clip_index = marker_data["clip_index"]
+    data = stored_data.get(clip_index)
+    if data is None:
+        if INSTANCES_DATA_KEY not in marker_data:
+            log.error(
+                "Missing stored instances data of `{}` and AYON marker "
+                "has no fallback data, instances are skipped.".format(
+                    clip_index))
+            return None
+
+        log.error(
+            "Missing stored instances data of `{}`, instances are "
+            "restored from AYON marker with default attributes.".format(
+                clip_index))
+        data = dict(marker_data)
+        data.pop(INSTANCE_STORE_KEY, None)
+        return data
+
+    data = dict(data)
+    data["clip_index"] = clip_index
+    return data
+
+
+def get_imprinted_data(item):
+    """Get AYON data imprinted to segment or reel clip.
+
+    Arguments:
+        item (flame.PySegment | flame.PyClip): flame api object
+
+    Returns:
+        dict: imprinted data or None if not imprinted
+    """
+    return resolve_imprinted_data(_get_item_marker_data(item))
+
+
+def _get_instances_header_data(data):
+    """Minimal instances data kept in AYON marker next to the store.
+
+    Args:
+        data (dict): instances data
+
+    Returns:
+        dict: header data of the instances
+    """
+    header_data = {}
+    if "active" in data:
+        header_data["active"] = data["active"]
+
+    instances_data = data.get(INSTANCES_DATA_KEY)
+    if isinstance(instances_data, dict):
+        header_data[INSTANCES_DATA_KEY] = {
+            creator_id: {
+                key: instance_data[key]
+                for key in INSTANCE_HEADER_KEYS
+                if key in instance_data
+            }
+            for creator_id, instance_data in instances_data.items()
+        }
+    return header_data
+
+
+def imprint_instances(item, data):
+    """Imprint creator instances data to segment or reel clip.
+
+    With enabled project instance store the data are stored there and
+    the AYON marker keeps the clip index referencing them with minimal
+    header data of instances, see `INSTANCE_HEADER_KEYS`. Stored data
+    are removed once the clip index is replaced or the item has no
+    instances left.
+
+    Arguments:
+        item (flame.PySegment | flame.PyClip): flame api object
+        data (dict): instances data with `clip_index`
+    """
+    instance_store = get_project_instance_store()
+    marker_data = _get_item_marker_data(item) or {}
+    clip_index = data.get("clip_index")
+
+    stored_clip_index = None
+    if marker_data.get(INSTANCE_STORE_KEY):
+        stored_clip_index = marker_data["clip_index"]
+
+    if stored_clip_index is None and (
+        instance_store is None or clip_index is None
+    ):
+        imprint(item, data)
+        return
+
+    imprinted_data = dict(resolve_imprinted_data(marker_data) or {})
+    imprinted_data.update(data)
+    imprinted_data.pop(INSTANCE_STORE_KEY, None)
+
+    if (
+        instance_store is None
+        or clip_index is None
+        or not imprinted_data.get(INSTANCES_DATA_KEY)
+    ):
+        # data without any instances are kept only in marker
+        if stored_clip_index is not None:
+            _delete_stored_instances_data(stored_clip_index)
+        _set_marker_data(item, imprinted_data)
+        return
+
+    if stored_clip_index not in (None, clip_index):
+        # clip index was replaced by new instances
+        _delete_stored_instances_data(stored_clip_index)
+
+    imprinted_data.pop("clip_index", None)
+    instance_store.put(clip_index, imprinted_data)
+
+    marker_data = _get_instances_header_data(imprinted_data)
+    marker_data.update({"clip_index": clip_index, INSTANCE_STORE_KEY: True})
+    _set_marker_data(item, marker_data)
+
+
+def _delete_stored_instances_data(clip_index):
+    instance_store = get_project_instance_store(enabled_only=False)
+    if instance_store is not None:
+        instance_store.delete(clip_index)
+
+
+def _set_marker_data(item, data):
+    if isinstance(item, flame.PyClip):
+        set_clip_data_marker(item, data, replace=True)
+    else:
+        set_segment_data_marker(item, data, replace=True)
+
+
 @contextlib.contextmanager
 def maintained_selection():
     from .lib import CTX
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import os
+import bisect
 import re
 import shutil
 from copy import deepcopy
@@ -45,6 +46,9 @@ class HiddenFlameCreator(HiddenCreator):
 
 class FlameCreator(Creator):
     """Creator class wrapper
+
+    Selection is gathered lazily on first access of `selected`
+    by `_get_selected`, reel clips for media panel creators.
     """
     skip_discovery = True
     settings_category = "flame"
@@ -52,6 +56,29 @@ class FlameCreator(Creator):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.project = flib.get_current_project()
+        self._use_selection = False
+        self._selected = None
+
+    @property
+    def selected(self):
+        """Selection of current create call, gathered on first access."""
+        if self._selected is None:
+            self._selected = self._get_selected(self._use_selection)
+        return self._selected
+
+    def _get_selected(self, use_selection):
+        """Gather items the instances are created from.
+
+        Args:
+            use_selection (bool): restrict items to selected ones
+
+        Returns:
+            list: items to create instances from
+        """
+        return flib.get_clips_in_reels(
+            self.project,
+            selected=use_selection
+        )
 
     def create(self, product_name, instance_data, pre_create_data):
         """Prepare data for new instance creation.
@@ -63,18 +90,20 @@ class FlameCreator(Creator):
                 Those may affect how creator works.
         """
         instance_data["flame_context"] = flib.CTX.context
-        selected = pre_create_data.get("use_selection", False)
-        self.selected = flib.get_clips_in_reels(
-            self.project,
-            selected=selected
-        )
+        self._use_selection = pre_create_data.get("use_selection", False)
+        self._selected = None
 
 
 class FlameEditorialCreator(FlameCreator):
     """Creator class wrapper for Editorial usage.
+
+    Selection is gathered from segments of current sequence.
     """
     skip_discovery = True
 
+    def _get_selected(self, use_selection):
+        return self.sequence_index.get_segments(selected=use_selection)
+
     def create(self, product_name, instance_data, pre_create_data):
         """Prepare data for new instance creation.
 
@@ -86,11 +115,78 @@ class FlameEditorialCreator(FlameCreator):
         """
         super().create(product_name, instance_data, pre_create_data)
         self.sequence = flib.get_current_sequence(flib.CTX.selection)
-        selected = pre_create_data.get("use_selection", False)
-        self.selected = flib.get_sequence_segments(
-            self.sequence,
-            selected=selected,
-        )
+        self.sequence_index = flib.SequenceIndex(self.sequence)
+
+
+class VerticalClipIndex:
+    """Index of hero clip frame ranges for vertical sync matching.
+
+    Hero clip containing a frame range is found with bisect over hero
+    ranges sorted by clip in. If more hero ranges contain it, the first
+    added one is returned.
+    """
+    def __init__(self):
+        # hero data and order of addition by (clip_in, clip_out)
+        self._ranges = {}
+        self._sorted_keys = None
+        self._starts = None
+        # maximal clip out of sorted ranges up to the index
+        self._max_outs = None
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def add(self, clip_in, clip_out, data):
+        """Add hero clip data of the frame range.
+
+        Args:
+            clip_in (int): hero clip record in
+            clip_out (int): hero clip record out
+            data (dict): hero clip instance data
+        """
+        key = (clip_in, clip_out)
+        order = self._ranges[key][0] if key in self._ranges else len(
+            self._ranges)
+        self._ranges[key] = (order, data)
+        self._sorted_keys = None
+
+    def _build(self):
+        self._sorted_keys = sorted(self._ranges)
+        self._starts = [clip_in for clip_in, _ in self._sorted_keys]
+        self._max_outs = []
+        max_out = None
+        for _, clip_out in self._sorted_keys:
+            max_out = clip_out if max_out is None else max(max_out, clip_out)
+            self._max_outs.append(max_out)
+
+    def find(self, clip_in, clip_out):
+        """Find hero clip data of range containing the frame range.
+
+        Args:
+            clip_in (int): clip record in
+            clip_out (int): clip record out
+
+        Returns:
+            dict: hero clip data or None if no hero range contains it
+        """
+        if self._sorted_keys is None:
+            self._build()
+
+        found = None
+        index = bisect.bisect_right(self._starts, clip_in) - 1
+        # ranges before index can contain the clip only while their
+        # maximal clip out reaches clip out
+        while index >= 0 and self._max_outs[index] >= clip_out:
+            key = self._sorted_keys[index]
+            if key[1] >= clip_out:
+                order, data = self._ranges[key]
+                if found is None or order < found[0]:
+                    found = (order, data)
+            index -= 1
+
+        if found is None:
+            return None
+        return found[1]
 
 
 class PublishableClip:
@@ -104,7 +200,7 @@ class PublishableClip:
     Returns:
         flame.PySegment: flame api object
     """
-    vertical_clip_match = {}
+    vertical_clip_match = VerticalClipIndex()
     vertical_clip_used = {}
     types = {
         "shot": "shot",
@@ -142,17 +238,32 @@ class PublishableClip:
         data: dict[str, Any],
         rename_index: int,
         log: logging.Logger,
+        segment_attributes_store: Optional[
+            flib.SegmentAttributesStore] = None,
+        batch: Optional[PublishableClipBatch] = None,
     ):
         self.rename_index = rename_index
         self.log = log
         self.pre_create_data = pre_create_data or {}
         self.marker_data = {}
+        self.batch = batch
 
         # get main parent objects
         self.current_segment = segment
-        sequence_name = flib.get_current_sequence([segment]).name.get_value()
-        self.sequence_name = str(sequence_name).replace(" ", "_")
-        self.clip_data = flib.get_segment_attributes(segment)
+        if batch is not None:
+            self.sequence_name = batch.sequence_name
+            segment_attributes_store = (
+                segment_attributes_store or batch.segment_attributes_store)
+        else:
+            sequence_name = flib.get_current_sequence(
+                [segment]).name.get_value()
+            self.sequence_name = str(sequence_name).replace(" ", "_")
+        self.segment_attributes_store = segment_attributes_store
+        if segment_attributes_store is not None:
+            self.clip_data = segment_attributes_store.get_segment_attributes(
+                segment)
+        else:
+            self.clip_data = flib.get_segment_attributes(segment)
 
         # segment (clip) main attributes
         self.cs_name = self.clip_data["segment_name"]
@@ -188,7 +299,7 @@ class PublishableClip:
 
     @classmethod
     def restore_all_caches(cls):
-        cls.vertical_clip_match = {}
+        cls.vertical_clip_match = VerticalClipIndex()
         cls.vertical_clip_used = {}
 
     def convert(self):
@@ -209,6 +320,9 @@ class PublishableClip:
         if self.rename and not self.use_shot_name:
             # rename segment
             self.current_segment.name = str(new_name)
+            if self.segment_attributes_store is not None:
+                self.segment_attributes_store.invalidate(
+                    self.current_segment)
             self.marker_data.update({
                 "folderName": str(new_name),
                 "folderPath": f"/{hierarchy_filled}/{new_name}"
@@ -393,77 +507,75 @@ class PublishableClip:
 
         tag_instance_data.update({"heroTrack": True})
         if hero_track and self.vertical_sync:
-            self.vertical_clip_match.update({
-                (self.clip_in, self.clip_out): tag_instance_data
-            })
+            self.vertical_clip_match.add(
+                self.clip_in, self.clip_out, tag_instance_data)
 
+        hero_data = None
         if not hero_track and self.vertical_sync:
             # driving layer is set as negative match
-            for (hero_in, hero_out), hero_data in self.vertical_clip_match.items():  # noqa
-                # Iterate over all clips in vertical sync match
-                # If clip frame range is outside of hero clip frame range
-                # then skip this clip and do not add to hierarchical shared
-                # metadata to them.
-                if self.clip_in < hero_in or self.clip_out > hero_out:
-                    continue
-
-                _distrib_data = deepcopy(hero_data)
-                _distrib_data["heroTrack"] = False
+            # Find hero clip which frame range contains this clip,
+            # clips outside of all hero clip frame ranges do not get
+            # hierarchical shared metadata.
+            hero_data = self.vertical_clip_match.find(
+                self.clip_in, self.clip_out)
+
+        if hero_data is not None:
+            _distrib_data = deepcopy(hero_data)
+            _distrib_data["heroTrack"] = False
+
+            # form used clip unique key
+            data_product_name = hero_data["productName"]
+            new_clip_name = hero_data["newClipName"]
+
+            # get used names list for duplicity check
+            used_names = self.vertical_clip_used.setdefault(
+                f"{new_clip_name}{data_product_name}", set()
+            )
+            self.log.debug(
+                f">> used_names: {used_names}"
+            )
+            clip_product_name = self.product_name
+            variant = self.variant
+            self.log.debug(
+                f">> clip_product_name: {clip_product_name}")
 
-                # form used clip unique key
-                data_product_name = hero_data["productName"]
-                new_clip_name = hero_data["newClipName"]
+            # in case track name and product name is the same then add
+            if self.variant == self.track_name:
+                clip_product_name = self.product_name
 
-                # get used names list for duplicity check
-                used_names_list = self.vertical_clip_used.setdefault(
-                    f"{new_clip_name}{data_product_name}", []
+            # add track index in case duplicity of names in hero data
+            # INFO: this is for case where hero clip product name
+            #    is the same as current clip product name
+            if clip_product_name in data_product_name:
+                clip_product_name = (
+                    f"{clip_product_name}{self.track_index}")
+                variant = f"{variant}{self.track_index}"
+
+            # in case track clip product name had been already used
+            # then add product name with clip index
+            if clip_product_name in used_names:
+                _clip_product_name = (
+                    f"{clip_product_name}{self.cs_index}"
                 )
-                self.log.debug(
-                    f">> used_names_list: {used_names_list}"
-                )
-                clip_product_name = self.product_name
-                variant = self.variant
-                self.log.debug(
-                    f">> clip_product_name: {clip_product_name}")
-
-                # in case track name and product name is the same then add
-                if self.variant == self.track_name:
-                    clip_product_name = self.product_name
-
-                # add track index in case duplicity of names in hero data
-                # INFO: this is for case where hero clip product name
-                #    is the same as current clip product name
-                if clip_product_name in data_product_name:
-                    clip_product_name = (
-                        f"{clip_product_name}{self.track_index}")
-                    variant = f"{variant}{self.track_index}"
-
-                # in case track clip product name had been already used
-                # then add product name with clip index
-                if clip_product_name in used_names_list:
+                # just in case lets validate if new name is not used
+                # in case the track_index is the same as clip_index
+                if _clip_product_name in used_names:
                     _clip_product_name = (
-                        f"{clip_product_name}{self.cs_index}"
+                        f"{clip_product_name}"
+                        f"{self.track_index}{self.cs_index}"
                     )
-                    # just in case lets validate if new name is not used
-                    # in case the track_index is the same as clip_index
-                    if _clip_product_name in used_names_list:
-                        _clip_product_name = (
-                            f"{clip_product_name}"
-                            f"{self.track_index}{self.cs_index}"
-                        )
-                    clip_product_name = _clip_product_name
-                    variant = f"{variant}{self.cs_index}"
-
-                self.log.debug(
-                    f">> clip_product_name: {clip_product_name}")
-                _distrib_data["productName"] = clip_product_name
-                _distrib_data["variant"] = variant
-                # assign data to return hierarchy data to tag
-                tag_instance_data = _distrib_data
-
-                # add used product name to used list to avoid duplicity
-                used_names_list.append(clip_product_name)
-                break
+                clip_product_name = _clip_product_name
+                variant = f"{variant}{self.cs_index}"
+
+            self.log.debug(
+                f">> clip_product_name: {clip_product_name}")
+            _distrib_data["productName"] = clip_product_name
+            _distrib_data["variant"] = variant
+            # assign data to return hierarchy data to tag
+            tag_instance_data = _distrib_data
+
+            # add used product name to used names to avoid duplicity
+            used_names.add(clip_product_name)
 
         # add data to return data dict
         self.marker_data.update(tag_instance_data)
@@ -510,7 +622,16 @@ class PublishableClip:
             "variant": self.variant,
         }
 
-    def _convert_to_entity(self, src_type, template):
+    def _get_entity_formatting_data(self):
+        """ Collect formatting data to use for formatting templates. """
+        formatting_data = {}
+        for _k, _v in self.hierarchy_data.items():
+            value = str(_v).format(
+                **self.current_segment_default_data)
+            formatting_data[_k] = value
+        return formatting_data
+
+    def _convert_to_entity(self, src_type, template, formatting_data=None):
         """ Converting input key to key with type. """
         # convert to entity type
         folder_type = self.types.get(src_type, None)
@@ -520,11 +641,8 @@ class PublishableClip:
         )
 
         # first collect formatting data to use for formatting template
-        formatting_data = {}
-        for _k, _v in self.hierarchy_data.items():
-            value = str(_v).format(
-                **self.current_segment_default_data)
-            formatting_data[_k] = value
+        if formatting_data is None:
+            formatting_data = self._get_entity_formatting_data()
 
         return {
             "folder_type": folder_type,
@@ -535,6 +653,10 @@ class PublishableClip:
 
     def _create_parents(self):
         """ Create parents and return it in list. """
+        if self.batch is not None:
+            self.parents = self.batch.get_parents(self)
+            return
+
         self.parents = []
 
         pattern = re.compile(self.parents_search_pattern)
@@ -542,11 +664,100 @@ class PublishableClip:
         par_split = [(pattern.findall(t).pop(), t)
                      for t in self.hierarchy.split("/")]
 
+        formatting_data = self._get_entity_formatting_data()
         for type_, template in par_split:
-            parent = self._convert_to_entity(type_, template)
+            parent = self._convert_to_entity(
+                type_, template, formatting_data)
             self.parents.append(parent)
 
 
+class PublishableClipBatch:
+    """Shared context of `PublishableClip` conversions of one create action.
+
+    Sequence name, parsed hierarchy template and parents of the same
+    formatting data are resolved only once for all converted segments.
+
+    Args:
+        sequence (flame.PySequence): sequence of converted segments
+        pre_create_data (dict): Data based on pre creation attributes.
+        log (logging.Logger): logger
+        segment_attributes_store (flib.SegmentAttributesStore)[optional]:
+            snapshot store of segment attributes
+    """
+    def __init__(
+        self,
+        sequence: object,
+        pre_create_data: dict[str, Any],
+        log: logging.Logger,
+        segment_attributes_store: Optional[
+            flib.SegmentAttributesStore] = None,
+    ):
+        self.pre_create_data = pre_create_data or {}
+        self.log = log
+        self.segment_attributes_store = segment_attributes_store
+        self.sequence_name = str(
+            sequence.name.get_value()).replace(" ", "_")
+
+        hierarchy = (
+            self.pre_create_data.get("hierarchy")
+            or PublishableClip.hierarchy_default
+        )
+        pattern = re.compile(PublishableClip.parents_search_pattern)
+        self.parents_templates = [
+            (pattern.findall(template).pop(), template)
+            for template in hierarchy.split("/")
+        ]
+        self._parents_by_formatting_data = {}
+
+    def create_clip(
+        self,
+        segment: object,
+        data: dict[str, Any],
+        rename_index: int,
+    ) -> PublishableClip:
+        """Create publishable clip of the segment sharing batch context.
+
+        Args:
+            segment (flame.PySegment): flame api object
+            data (dict): instance data of the segment
+            rename_index (int): index of segment in renaming order
+
+        Returns:
+            PublishableClip: publishable clip object
+        """
+        return PublishableClip(
+            segment,
+            pre_create_data=self.pre_create_data,
+            data=data,
+            rename_index=rename_index,
+            log=self.log,
+            segment_attributes_store=self.segment_attributes_store,
+            batch=self,
+        )
+
+    def get_parents(self, publish_clip: PublishableClip) -> list[dict]:
+        """Get parents of publishable clip.
+
+        Args:
+            publish_clip (PublishableClip): publishable clip object
+
+        Returns:
+            list[dict]: parents with folder type and entity name
+        """
+        formatting_data = publish_clip._get_entity_formatting_data()
+        key = tuple(sorted(formatting_data.items()))
+        parents = self._parents_by_formatting_data.get(key)
+        if parents is None:
+            parents = [
+                publish_clip._convert_to_entity(
+                    type_, template, formatting_data)
+                for type_, template in self.parents_templates
+            ]
+            self._parents_by_formatting_data[key] = parents
+
+        return [dict(parent) for parent in parents]
+
+
 # Loader plugin functions
 class ClipLoader(LoaderPlugin):
     """A basic clip loader for Flame leveraging native OpenClip API.
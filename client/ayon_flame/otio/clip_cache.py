@@ -0,0 +1,198 @@
+"""
+Persistent cache of OTIO clips converted from sequence segments.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+
+import opentimelineio as otio
+
+log = logging.getLogger(__name__)
+
+# segment attributes which are affecting converted OTIO clip
+FINGERPRINT_ATTRIBUTES = (
+    "segment_name", "fpath", "source_in", "source_out", "record_in",
+    "record_out", "record_duration", "start_frame", "source_frame_rate",
+)
+
+
+def get_sequence_cache_path(workdir, project_name, sequence_name):
+    """Location of the cache files without extension.
+
+    Args:
+        workdir (str): work directory
+        project_name (str): flame project name
+        sequence_name (str): flame sequence name
+
+    Returns:
+        str: path of cache files without extension
+    """
+    file_name = re.sub(
+        r"[^\w.-]", "_", f"{project_name}.{sequence_name}.otio_cache")
+    return os.path.join(workdir, file_name)
+
+
+def get_media_state(path):
+    """State of media file and its directory on disk.
+
+    Media re-rendered in place are changing the file modification time,
+    frames added or removed from sequence are changing the directory
+    modification time.
+
+    Args:
+        path (str): media file path
+
+    Returns:
+        list: modification times and size or None if not accessible
+    """
+    if not path:
+        return None
+    try:
+        file_stat = os.stat(path)
+        dir_stat = os.stat(os.path.dirname(path) or ".")
+    except OSError:
+        return None
+    return [file_stat.st_mtime_ns, file_stat.st_size, dir_stat.st_mtime_ns]
+
+
+def get_snapshot_fingerprint(snapshot, fps):
+    """Fingerprint of segment snapshot.
+
+    Args:
+        snapshot (flame_export.SegmentSnapshot): plain data of segment
+        fps (float): timeline frame rate
+
+    Returns:
+        str: fingerprint hash
+    """
+    clip_data = snapshot.clip_data
+    setup_data = None
+    if snapshot.time_effect is not None:
+        setup_data = snapshot.time_effect.setup_data
+
+    fingerprint_data = [
+        fps,
+        [clip_data.get(key) for key in FINGERPRINT_ATTRIBUTES],
+        get_media_state(clip_data.get("fpath")),
+        hashlib.sha1(
+            (setup_data or "").encode("utf-8")).hexdigest(),
+        snapshot.markers,
+    ]
+    return hashlib.sha1(
+        json.dumps(fingerprint_data, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class OtioClipCache(object):
+    """Cache of OTIO clips by fingerprint of their segment.
+
+    Clips are stored in `.otio` file with `SerializableCollection`
+    and their fingerprints in `.json` index file of the same order.
+    Only clips used by last export are kept when cache is saved.
+
+    Args:
+        cache_path (str): path of cache files without extension
+        logger (logging.Logger)[optional]: logger
+    """
+    INDEX_VERSION = 1
+
+    def __init__(self, cache_path, logger=None):
+        self.log = logger or log
+        self.otio_path = f"{cache_path}.otio"
+        self.index_path = f"{cache_path}.json"
+        self._clips = {}
+        self._used = {}
+        self._loaded = False
+
+    def _load(self):
+        self._loaded = True
+        if not (
+            os.path.exists(self.index_path)
+            and os.path.exists(self.otio_path)
+        ):
+            return
+
+        try:
+            with open(self.index_path, "r") as index_file:
+                index_data = json.load(index_file)
+            if index_data.get("version") != self.INDEX_VERSION:
+                return
+            fingerprints = index_data["fingerprints"]
+            collection = otio.adapters.read_from_file(self.otio_path)
+        except Exception as error:
+            self.log.warning(
+                "OTIO clip cache `{}` is not readable: {}".format(
+                    self.otio_path, error))
+            return
+
+        if len(fingerprints) != len(collection):
+            self.log.warning(
+                "OTIO clip cache `{}` does not match its index".format(
+                    self.otio_path))
+            return
+
+        self._clips = dict(zip(fingerprints, collection))
+        self.log.debug(
+            "Loaded {} cached OTIO clips".format(len(self._clips)))
+
+    def get(self, fingerprint):
+        """Get copy of cached clip.
+
+        Args:
+            fingerprint (str): segment fingerprint
+
+        Returns:
+            otio.schema.Clip: clip or None if not cached
+        """
+        if not self._loaded:
+            self._load()
+
+        otio_clip = self._used.get(fingerprint)
+        if otio_clip is None:
+            otio_clip = self._clips.get(fingerprint)
+        if otio_clip is None:
+            return None
+
+        self._used[fingerprint] = otio_clip
+        return otio_clip.deepcopy()
+
+    def put(self, fingerprint, otio_clip):
+        """Cache copy of the clip.
+
+        Args:
+            fingerprint (str): segment fingerprint
+            otio_clip (otio.schema.Clip): converted clip
+        """
+        self._used[fingerprint] = otio_clip.deepcopy()
+
+    def save(self):
+        """Write clips used since the cache was created."""
+        fingerprints = list(self._used)
+        collection = otio.schema.SerializableCollection(
+            children=[self._used[fingerprint] for fingerprint in fingerprints]
+        )
+        cache_dir = os.path.dirname(self.otio_path)
+        try:
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            otio.adapters.write_to_file(collection, self.otio_path)
+            index_tmp_path = f"{self.index_path}.tmp"
+            with open(index_tmp_path, "w") as index_file:
+                json.dump(
+                    {
+                        "version": self.INDEX_VERSION,
+                        "fingerprints": fingerprints,
+                    },
+                    index_file
+                )
+            os.replace(index_tmp_path, self.index_path)
+        except (OSError, ValueError) as error:
+            self.log.warning(
+                "OTIO clip cache `{}` was not saved: {}".format(
+                    self.otio_path, error))
+            return
+
+        self.log.debug(
+            "Saved {} OTIO clips to cache".format(len(fingerprints)))
@@ -6,6 +6,9 @@ import json
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from dataclasses import dataclass, field
 from pprint import pformat
 
 import flame
@@ -18,6 +21,7 @@ from ayon_flame.api import (
 )
 
 from . import tw_bake, utils
+from .clip_cache import OtioClipCache, get_snapshot_fingerprint
 
 log = logging.getLogger(__name__)
 
@@ -42,34 +46,55 @@ MARKERS_COLOR_MAP = {
 MARKERS_INCLUDE = True
 
 
-class OtioExportCTX:
-    _fps = None
-    _tl_start_frame = None
-    project = None
-    clips = None
+@dataclass(frozen=True)
+class OtioExportContext:
+    """Immutable context of one OTIO export.
 
-    @classmethod
-    def set_fps(cls, new_fps):
-        if not isinstance(new_fps, float):
-            raise TypeError(f"Invalid fps type {type(new_fps)}")
-        if cls._fps != new_fps:
-            cls._fps = new_fps
-
-    @classmethod
-    def get_fps(cls):
-        return cls._fps
+    Context is passed explicitly to all conversion functions so more
+    exports can run at once without sharing any state.
 
-    @classmethod
-    def set_tl_start_frame(cls, number):
-        if not isinstance(number, int):
+    Args:
+        fps (float): timeline frame rate
+        tl_start_frame (int): timeline start frame
+        project_name (Optional[str]): flame project name
+    """
+    fps: float
+    tl_start_frame: int = 0
+    project_name: str | None = None
+
+    def __post_init__(self):
+        if not isinstance(self.fps, float):
+            raise TypeError(f"Invalid fps type {type(self.fps)}")
+        if not isinstance(self.tl_start_frame, int):
             raise TypeError(
-                f"Invalid timeline start frame type {type(number)}")
-        if cls._tl_start_frame != number:
-            cls._tl_start_frame = number
+                "Invalid timeline start frame type "
+                f"{type(self.tl_start_frame)}")
 
     @classmethod
-    def get_tl_start_frame(cls):
-        return cls._tl_start_frame
+    def from_sequence(cls, sequence, project=None):
+        """Create context from flame sequence.
+
+        Args:
+            sequence (flame.PySequence): The Flame sequence.
+            project (Optional[flame.PyProject]): The Flame project,
+                current project is used if not defined.
+
+        Returns:
+            OtioExportContext: export context
+        """
+        if project is None:
+            project = get_current_flame_project()
+
+        fps = float(str(sequence.frame_rate)[:-4])
+        tl_start_frame = utils.timecode_to_frames(
+            str(sequence.start_time).replace("+", ":"),
+            fps
+        )
+        return cls(
+            fps=fps,
+            tl_start_frame=tl_start_frame,
+            project_name=project.name,
+        )
 
 
 def flatten(_list):
@@ -106,6 +131,15 @@ def _get_metadata(item):
     return {}
 
 
+@lru_cache(maxsize=1024)
+def _bake_timewarp_setup(setup_data):
+    """Baked frames of timewarp setup shared by all exports.
+
+    Returned dictionary must not be modified.
+    """
+    return tw_bake.Timewarp().bake_flame_tw_setup(setup_data)
+
+
 def create_time_effects(otio_clip, clip_data, speed, time_effect=None):
     otio_effect = None
 
@@ -120,10 +154,7 @@ def create_time_effects(otio_clip, clip_data, speed, time_effect=None):
         else:
             # Interpolate curves.
             # And retrieve interpolated value per frames.
-            tw_obj = tw_bake.Timewarp()
-            iframes = tw_obj.bake_flame_tw_setup(
-                time_effect.setup_data
-            )
+            iframes = _bake_timewarp_setup(time_effect.setup_data)
 
             # Flame TWs defines its timing offsets
             # from available range (relative).
@@ -206,10 +237,13 @@ def _get_flame_markers(item):
     return output_markers
 
 
-def create_otio_markers(otio_item, item):
-    markers = _get_flame_markers(item)
+def create_otio_markers(
+    otio_item, item, export_ctx, clip_index_map=None, markers=None
+):
+    if markers is None:
+        markers = _get_flame_markers(item)
     for marker in markers:
-        frame_rate = OtioExportCTX.get_fps()
+        frame_rate = export_ctx.fps
 
         marked_range = otio.opentime.TimeRange(
             start_time=otio.opentime.RationalTime(
@@ -231,7 +265,14 @@ def create_otio_markers(otio_item, item):
         # to identify this as json, at least 3 items in the list should
         # be present ["{", ":", "}"]
         metadata = {}
-        if len(check_if_json) >= 3:
+        if marker["comment"].startswith(lib.MARKER_PAYLOAD_PREFIX + ":"):
+            # compact AYON marker payload
+            try:
+                metadata.update(
+                    lib.decode_marker_data(marker["comment"]))
+            except ValueError as msg:
+                log.error(f"Marker payload conversion: {msg}")
+        elif len(check_if_json) >= 3:
             # this is json string
             try:
                 # capture exceptions which are related to strings only
@@ -253,9 +294,14 @@ def create_otio_markers(otio_item, item):
 
         otio_item.markers.append(otio_marker)
 
+        if clip_index_map is not None:
+            utils.add_to_clip_index_map(
+                clip_index_map, otio_item, otio_marker, lib.MARKER_NAME)
+
 
 def create_otio_reference(
         clip_data: dict,
+        export_ctx: OtioExportContext,
         media_info: MediaInfoFile | None = None,
         fps: float | None = None
 ) -> (
@@ -267,6 +313,7 @@ def create_otio_reference(
 
     Args:
         clip_data (dict): Flame clip data.
+        export_ctx (OtioExportContext): Export context.
         media_info (Optional[MediaInfoFile]): Media information.
         fps (Optional[float]): Frames per second.
 
@@ -300,7 +347,7 @@ def create_otio_reference(
 
     # get file info for path and start frame
     media_start = media_info.start_frame or 0
-    fps = fps or media_info.fps or OtioExportCTX.get_fps()
+    fps = fps or media_info.fps or export_ctx.fps
 
     path = clip_data["fpath"]
 
@@ -378,15 +425,71 @@ def create_otio_reference(
     return otio_ex_ref_item
 
 
-def create_otio_clip(clip_data):
+@dataclass
+class SegmentSnapshot:
+    """Plain data of segment needed for OTIO clip creation.
+
+    Snapshot is read from Flame on the main thread so the OTIO clip
+    can be created from it in a worker thread.
+    """
+    clip_data: lib.SegmentRecord
+    time_effect: TimeEffectMetadata | None = None
+    markers: list = field(default_factory=list)
+
+
+def create_segment_snapshot(clip_data):
+    """Read Flame data of segment which are not in its attributes.
+
+    Has to be called from the main thread.
+
+    Args:
+        clip_data (lib.SegmentRecord): segment attributes
+
+    Returns:
+        SegmentSnapshot: plain data of segment
+    """
     segment = clip_data["PySegment"]
+    snapshot = SegmentSnapshot(clip_data)
+    if clip_data.get("fpath"):
+        snapshot.time_effect = TimeEffectMetadata(segment, logger=log)
+        log.debug(f"__ tw_data: {snapshot.time_effect.data}")
+
+    if MARKERS_INCLUDE:
+        snapshot.markers = _get_flame_markers(segment)
+    return snapshot
+
+
+def create_otio_clip(clip_data, export_ctx, clip_index_map=None):
+    return create_otio_clip_from_snapshot(
+        create_segment_snapshot(clip_data),
+        export_ctx,
+        clip_index_map=clip_index_map,
+    )
+
+
+def create_otio_clip_from_snapshot(snapshot, export_ctx, clip_index_map=None):
+    """Create OTIO clip from segment snapshot.
+
+    Flame API is not touched so it is safe to be called from
+    a worker thread as long as `clip_index_map` is not shared.
+
+    Args:
+        snapshot (SegmentSnapshot): plain data of segment
+        export_ctx (OtioExportContext): export context
+        clip_index_map (Optional[dict]): map to fill with OTIO clip
+            and its AYON markers by clip index
+
+    Returns:
+        otio.schema.Clip: OTIO clip
+    """
+    clip_data = snapshot.clip_data
 
     media_info = None
     file_path = None
     file_first_frame = None
     media_timecode_start = None
-    tw_data = None
-    media_fps = OtioExportCTX.get_fps()  # fallback from timeline
+    tw_data = snapshot.time_effect
+    media_fps = export_ctx.fps  # fallback from timeline
     if clip_data.get("fpath"):
         file_path = clip_data["fpath"]
 
@@ -400,10 +503,6 @@ def create_otio_clip(clip_data):
             file_path)
         if file_first_frame:
             file_first_frame = int(file_first_frame)
-
-        # Timewarp metadata
-        tw_data = TimeEffectMetadata(segment, logger=log)
-        log.debug(f"__ tw_data: {tw_data.data}")
     # fallback for clips with missing file path
     # they will be added as missing reference clips
     elif clip_data.get("start_frame"):
@@ -464,7 +563,7 @@ def create_otio_clip(clip_data):
     # create media reference
     if media_info:
         media_reference = create_otio_reference(
-            clip_data, media_info=media_info, fps=media_fps)
+            clip_data, export_ctx, media_info=media_info, fps=media_fps)
 
         # create source range
         available_media_start = media_reference.available_range.start_time
@@ -473,20 +572,20 @@ def create_otio_clip(clip_data):
             available_media_start.rate
         )
         src_in = available_media_start + source_in_offset
-        conformed_src_in = src_in.rescaled_to(OtioExportCTX.get_fps())
+        conformed_src_in = src_in.rescaled_to(export_ctx.fps)
     else:
         media_reference = create_otio_reference(
-            clip_data, fps=media_fps
+            clip_data, export_ctx, fps=media_fps
         )
         conformed_src_in = otio.opentime.RationalTime(
             source_in,
-            OtioExportCTX.get_fps()
+            export_ctx.fps
         )
 
     source_range = create_otio_time_range(
         conformed_src_in.value,  # no rounding to preserve accuracy
         _clip_record_duration,
-        OtioExportCTX.get_fps()
+        export_ctx.fps
     )
 
     otio_clip = otio.schema.Clip(
@@ -497,7 +596,13 @@ def create_otio_clip(clip_data):
 
     # Add markers
     if MARKERS_INCLUDE:
-        create_otio_markers(otio_clip, segment)
+        create_otio_markers(
+            otio_clip,
+            None,
+            export_ctx,
+            clip_index_map=clip_index_map,
+            markers=snapshot.markers,
+        )
 
     if tw_data:
         create_time_effects(otio_clip, clip_data, speed, time_effect=tw_data)
@@ -515,18 +620,31 @@ def create_otio_gap(gap_start, clip_start, tl_start_frame, fps):
     )
 
 
-def _get_colourspace_policy():
+def _get_colourspace_policy(project_name):
+    """Colour policy of project, it is read again only once changed.
+
+    Returned dictionary must not be modified.
+    """
+    if not project_name:
+        return {}
 
-    output = {}
     # get policies project path
     policy_dir = (
-        f"/opt/Autodesk/project/{OtioExportCTX.project.name}/synColor/policy")
+        f"/opt/Autodesk/project/{project_name}/synColor/policy")
 
     policy_fp = os.path.join(policy_dir, "policy.cfg")
 
-    if not os.path.exists(policy_fp):
-        return output
+    try:
+        policy_mtime = os.stat(policy_fp).st_mtime_ns
+    except OSError:
+        return {}
+    return _read_colourspace_policy(policy_fp, policy_mtime)
 
+
+@lru_cache(maxsize=16)
+def _read_colourspace_policy(policy_fp, policy_mtime):
+    # modification time is part of the cache key
+    output = {}
     with open(policy_fp) as file:
         dict_conf = dict(line.strip().split(" = ", 1) for line in file)
         output.update(
@@ -535,12 +653,12 @@ def _get_colourspace_policy():
     return output
 
 
-def _create_otio_timeline(sequence):
+def _create_otio_timeline(sequence, export_ctx):
 
     metadata = _get_metadata(sequence)
 
     # find colour policy files and add them to metadata
-    colorspace_policy = _get_colourspace_policy()
+    colorspace_policy = _get_colourspace_policy(export_ctx.project_name)
     metadata.update(colorspace_policy)
 
     metadata.update({
@@ -550,7 +668,7 @@ def _create_otio_timeline(sequence):
     })
 
     rt_start_time = create_otio_rational_time(
-        OtioExportCTX.get_tl_start_frame(), OtioExportCTX.get_fps())
+        export_ctx.tl_start_frame, export_ctx.fps)
 
     return otio.schema.Timeline(
         name=str(sequence.name)[1:-1],
@@ -566,7 +684,7 @@ def create_otio_track(track_type, track_name):
     )
 
 
-def add_otio_gap(clip_data, otio_track, prev_out):
+def add_otio_gap(clip_data, otio_track, prev_out, export_ctx):
     gap_length = clip_data["record_in"] - prev_out
     if prev_out != 0:
         gap_length -= 1
@@ -574,7 +692,7 @@ def add_otio_gap(clip_data, otio_track, prev_out):
     gap = otio.opentime.TimeRange(
         duration=otio.opentime.RationalTime(
             gap_length,
-            OtioExportCTX.get_fps()
+            export_ctx.fps
         )
     )
     otio_gap = otio.schema.Gap(source_range=gap)
@@ -593,29 +711,12 @@ def add_otio_metadata(otio_item, item, **kwargs):
         otio_item.metadata.update({key: value})
 
 
-def _get_shot_tokens_values(clip, tokens):
-    old_value = None
-    output = {}
-
-    old_value = clip.shot_name.get_value()
-
-    for token in tokens:
-        clip.shot_name.set_value(token)
-        _key = re.sub(r"[ <>]", "", token)
-
-        try:
-            output[_key] = int(clip.shot_name.get_value())
-        except ValueError:
-            output[_key] = clip.shot_name.get_value()
-
-    clip.shot_name.set_value(old_value)
-
-    return output
-
-
 def _get_segments_from_track(
     flame_track,
-    validation_aggregator: lib.ValidationAggregator = None
+    validation_aggregator: lib.ValidationAggregator = None,
+    segments: list | None = None,
+    segment_attributes_store: lib.SegmentAttributesStore | None = None,
+    track_key: tuple | None = None,
 ):
     """Gather segment(s) from a flame track.
 
@@ -624,109 +725,251 @@ def _get_segments_from_track(
         validation_aggregator (lib.ValidationAggregator, optional):
                 Output object to store attributes for passing into
                 publishing validation. Defaults to None.
+        segments (list[flame.PySegment], optional): Already gathered
+                segments of the track. Defaults to None.
+        segment_attributes_store (lib.SegmentAttributesStore, optional):
+                Snapshot store of segment attributes. Defaults to None.
+        track_key (tuple, optional): Key of the track unique within
+                the sequence identifying its segments in
+                `segment_attributes_store`. Defaults to None.
 
     Returns:
-        List[flame.PySegment]. The gathered segments.
+        lib.TrackRecordSet. The gathered segments records.
     """
     if not validation_aggregator:
         validation_aggregator = lib.ValidationAggregator()
 
-    all_segments = []
-    for segment in flame_track.segments:
-        clip_data = lib.get_segment_attributes(segment, validation_aggregator)
+    if segments is None:
+        segments = flame_track.segments
+
+    all_segments = lib.TrackRecordSet()
+    for segment in segments:
+        if segment_attributes_store is not None:
+            clip_data = segment_attributes_store.get_segment_attributes(
+                segment, validation_aggregator, track_key=track_key)
+        else:
+            clip_data = lib.get_segment_attributes(
+                segment, validation_aggregator)
         if clip_data:
             all_segments.append(clip_data)
 
     return all_segments
 
 
-def _distribute_segments_on_track(segments, otio_track):
+def _distribute_segments_on_track(
+    segments, otio_track, export_ctx, clip_index_map=None, otio_clips=None
+):
     """Distribute some Flame segments on an OTIO track.
 
     Args:
-        segments List[flame.PySegments]: The segments to put on the track.
+        segments lib.TrackRecordSet: The segments to put on the track.
         otio_track opentimelineio.schema.Track: OTIO track.
+        export_ctx OtioExportContext: Export context.
+        clip_index_map dict: Optional map to fill with OTIO clips
+            and their AYON markers by clip index.
+        otio_clips list[otio.schema.Clip]: Optional already created
+            OTIO clips in order of segments.
     """
     if not segments:
         return
 
-    prev_item_record_out = segments[0]["record_out"]
+    records_in = segments.column("record_in")
+    records_out = segments.column("record_out")
+    prev_item_record_out = records_out[0]
     for itemindex, segment_data in enumerate(segments):
         log.debug(f"_ itemindex: {itemindex}")
         log.debug(f"_ segment_data: {segment_data!r}")
 
         # calculate clip frame range difference from each other
-        clip_diff = segment_data["record_in"] - prev_item_record_out
+        clip_diff = records_in[itemindex] - prev_item_record_out
 
         # initial track gap
         # add gap if first track item is not starting
         # at first timeline frame
-        if itemindex == 0 and segment_data["record_in"] > 0:
-            add_otio_gap(segment_data, otio_track, 0)
+        if itemindex == 0 and records_in[itemindex] > 0:
+            add_otio_gap(segment_data, otio_track, 0, export_ctx)
 
         # inbetween clip gap
         # or add gap if following track items are having
         # frame range differences from each other
         elif itemindex and clip_diff != 1:
             add_otio_gap(
-                segment_data, otio_track, prev_item_record_out)
+                segment_data, otio_track, prev_item_record_out, export_ctx)
 
         # create otio clip and add it to track
-        otio_clip = create_otio_clip(segment_data)
+        if otio_clips is None:
+            otio_clip = create_otio_clip(
+                segment_data, export_ctx, clip_index_map=clip_index_map)
+        else:
+            otio_clip = otio_clips[itemindex]
+            if clip_index_map is not None:
+                for otio_marker in otio_clip.markers:
+                    utils.add_to_clip_index_map(
+                        clip_index_map, otio_clip, otio_marker,
+                        lib.MARKER_NAME)
         log.debug(f"_ otio_clip: {otio_clip!r}")
         otio_track.append(otio_clip)
-        prev_item_record_out = segment_data["record_out"]
+        prev_item_record_out = records_out[itemindex]
 
 
-def create_otio_timeline(
-        sequence, validation_aggregator: lib.ValidationAggregator = None):
-    if validation_aggregator is None:
-        validation_aggregator = lib.ValidationAggregator()
+def _prefetch_media_info(tracks_segments, max_workers, timeout=None):
+    """Probe media of all segments before OTIO clips are created.
 
-    log.info(dir(sequence))
-    log.info(sequence.attributes)
+    Args:
+        tracks_segments (list[tuple]): otio tracks with their segments data
+        max_workers (int): number of concurrent media info probes
+        timeout (Optional[float]): media info probe timeout in seconds
+    """
+    paths = [
+        segment_data["fpath"]
+        for _, segments in tracks_segments
+        for segment_data in segments
+        if segment_data.get("fpath")
+    ]
+    try:
+        MediaInfoFile.prefetch(
+            paths, max_workers=max_workers, timeout=timeout, logger=log)
+    except IOError as error:
+        # media are probed again while OTIO clips are created
+        log.warning(f"Media info prefetch skipped: {error}")
+
+
+def _create_tracks_otio_clips(
+    tracks_segments,
+    export_ctx,
+    clip_workers=0,
+    clip_cache=None,
+    media_prefetch_workers=0,
+    media_probe_timeout=None,
+):
+    """Create OTIO clips of all tracks segments from their snapshots.
+
+    Flame data of segments are snapshot on the main thread first, then
+    media info, references, markers and time effects are converted
+    in worker threads if `clip_workers` is higher than 1. Clips of
+    unchanged segments are taken from `clip_cache`.
 
-    OtioExportCTX.project = get_current_flame_project()
+    Args:
+        tracks_segments (list[tuple]): otio tracks with their segments data
+        export_ctx (OtioExportContext): export context
+        clip_workers (int): number of worker threads
+        clip_cache (OtioClipCache): cache of converted clips
+        media_prefetch_workers (int): number of concurrent media info
+            probes of segments missing in `clip_cache`
+        media_probe_timeout (Optional[float]): media info probe timeout
 
-    # get current timeline
-    OtioExportCTX.set_fps(
-        float(str(sequence.frame_rate)[:-4]))
+    Returns:
+        list[list[otio.schema.Clip]]: OTIO clips of each track
+            in order of segments
+    """
+    snapshots = [
+        create_segment_snapshot(segment_data)
+        for _, segments in tracks_segments
+        for segment_data in segments
+    ]
+
+    otio_clips = [None] * len(snapshots)
+    fingerprints = [None] * len(snapshots)
+    missing_indexes = []
+    for index, snapshot in enumerate(snapshots):
+        if clip_cache is not None:
+            fingerprint = get_snapshot_fingerprint(snapshot, export_ctx.fps)
+            fingerprints[index] = fingerprint
+            otio_clips[index] = clip_cache.get(fingerprint)
+        if otio_clips[index] is None:
+            missing_indexes.append(index)
+
+    if clip_cache is not None:
+        log.info(
+            "Reusing {} of {} cached OTIO clips".format(
+                len(snapshots) - len(missing_indexes), len(snapshots)))
+
+    missing_snapshots = [snapshots[index] for index in missing_indexes]
+    if clip_cache is not None and media_prefetch_workers:
+        # only media of changed segments are probed
+        _prefetch_media_info(
+            [(None, [snapshot.clip_data for snapshot in missing_snapshots])],
+            media_prefetch_workers,
+            media_probe_timeout,
+        )
 
-    tl_start_frame = utils.timecode_to_frames(
-        str(sequence.start_time).replace("+", ":"),
-        OtioExportCTX.get_fps()
-    )
-    OtioExportCTX.set_tl_start_frame(tl_start_frame)
+    create_clip = partial(
+        create_otio_clip_from_snapshot, export_ctx=export_ctx)
+    if clip_workers > 1 and len(missing_snapshots) > 1:
+        with ThreadPoolExecutor(
+            max_workers=min(clip_workers, len(missing_snapshots))
+        ) as executor:
+            created_clips = list(
+                executor.map(create_clip, missing_snapshots))
+    else:
+        created_clips = [
+            create_clip(snapshot)
+            for snapshot in missing_snapshots
+        ]
+
+    for index, otio_clip in zip(missing_indexes, created_clips):
+        otio_clips[index] = otio_clip
+        if clip_cache is not None:
+            clip_cache.put(fingerprints[index], otio_clip)
+
+    output = []
+    start = 0
+    for _, segments in tracks_segments:
+        end = start + len(segments)
+        output.append(otio_clips[start:end])
+        start = end
+    return output
 
-    # convert timeline to otio
-    otio_timeline = _create_otio_timeline(sequence)
-
-    # create otio video tracks with clips
-    for ver in sequence.versions:
-        for track in ver.tracks:
-            # avoid all empty tracks
-            # or hidden tracks
-            if (
-                len(track.segments) == 0
-                or track.hidden.get_value()
-            ):
-                continue
-
-            # convert track to otio
-            otio_track = create_otio_track(
-                "video", str(track.name)[1:-1])
-
-            # Add segments onto track.
-            segments = _get_segments_from_track(
-                track, validation_aggregator=validation_aggregator)
-            log.debug(f"_ segments: {pformat(segments)}")
-            _distribute_segments_on_track(segments, otio_track)
-
-            # add track to otio timeline
-            otio_timeline.tracks.append(otio_track)
-
-    # create otio audio tracks with clips
-    for audio_track in sequence.audio_tracks:
+
+def _get_tracks_segments(
+    sequence,
+    validation_aggregator,
+    sequence_index=None,
+    segment_attributes_store=None,
+):
+    """Gather segments of visible sequence tracks with their OTIO tracks.
+
+    Args:
+        sequence (flame.PySequence): The Flame sequence.
+        validation_aggregator (lib.ValidationAggregator): Output object
+            to store attributes for passing into publishing validation.
+        sequence_index (Optional[lib.SequenceIndex]): Index of sequence
+            tracks and segments.
+        segment_attributes_store (Optional[lib.SegmentAttributesStore]):
+            Snapshot store of segment attributes.
+
+    Returns:
+        list[tuple]: otio tracks with their segments data
+    """
+    tracks_segments = []
+
+    if sequence_index is None:
+        sequence_index = lib.SequenceIndex(sequence)
+
+    # create otio video tracks
+    for sequence_track in sequence_index.tracks:
+        # avoid all empty tracks
+        # or hidden tracks
+        if (
+            len(sequence_track.segments) == 0
+            or sequence_track.hidden
+        ):
+            continue
+
+        # convert track to otio
+        otio_track = create_otio_track("video", sequence_track.name)
+
+        segments = _get_segments_from_track(
+            sequence_track.track,
+            validation_aggregator=validation_aggregator,
+            segments=sequence_track.segments,
+            segment_attributes_store=segment_attributes_store,
+            track_key=sequence_track.key,
+        )
+        tracks_segments.append((otio_track, segments))
+
+    # create otio audio tracks
+    for audio_index, audio_track in enumerate(sequence.audio_tracks):
 
         if (
             len(audio_track.channels) == 0
@@ -751,13 +994,316 @@ def create_otio_timeline(
             "audio", audio_track.name or "unnamed")
 
         segments = _get_segments_from_track(
-            audio_channel, validation_aggregator=validation_aggregator)
+            audio_channel,
+            validation_aggregator=validation_aggregator,
+            segment_attributes_store=segment_attributes_store,
+            track_key=("audio", audio_index),
+        )
+        tracks_segments.append((otio_track, segments))
+
+    return tracks_segments
+
+
+def _add_tracks_to_timeline(
+    otio_timeline,
+    tracks_segments,
+    tracks_otio_clips,
+    export_ctx,
+    clip_index_map=None,
+):
+    """Distribute segments on their tracks and add tracks to timeline.
+
+    Args:
+        otio_timeline (otio.schema.Timeline): OTIO timeline
+        tracks_segments (list[tuple]): otio tracks with their segments data
+        tracks_otio_clips (list): already created OTIO clips of each
+            track or None if clips of track should be created
+        export_ctx (OtioExportContext): export context
+        clip_index_map (Optional[dict]): map to fill with OTIO clips
+            and their AYON markers by clip index
+    """
+    for (otio_track, segments), otio_clips in zip(
+        tracks_segments, tracks_otio_clips
+    ):
+        # Add segments onto track.
         log.debug(f"_ segments: {pformat(segments)}")
-        _distribute_segments_on_track(segments, otio_track)
+        _distribute_segments_on_track(
+            segments,
+            otio_track,
+            export_ctx,
+            clip_index_map=clip_index_map,
+            otio_clips=otio_clips,
+        )
+
+        # add track to otio timeline
         otio_timeline.tracks.append(otio_track)
 
+
+def create_otio_timeline(
+        sequence,
+        validation_aggregator: lib.ValidationAggregator = None,
+        media_prefetch_workers: int = 0,
+        media_probe_timeout: float | None = None,
+        segment_attributes_store: lib.SegmentAttributesStore | None = None,
+        sequence_index: lib.SequenceIndex | None = None,
+        clip_index_map: dict | None = None,
+        clip_workers: int = 0,
+        clip_cache: OtioClipCache | None = None,
+        export_ctx: OtioExportContext | None = None,
+):
+    """Convert Flame sequence to OTIO timeline.
+
+    Args:
+        sequence (flame.PySequence): The Flame sequence.
+        validation_aggregator (lib.ValidationAggregator, optional):
+                Output object to store attributes for passing into
+                publishing validation. Defaults to None.
+        media_prefetch_workers (int, optional): Number of concurrent
+                media info probes run before clips are created.
+                Media are probed one by one if 0. Defaults to 0.
+        media_probe_timeout (float, optional): Timeout of prefetched
+                media info probe in seconds. Defaults to None.
+        segment_attributes_store (lib.SegmentAttributesStore, optional):
+                Snapshot store of segment attributes shared with other
+                publish plugins. Defaults to None.
+        sequence_index (lib.SequenceIndex, optional): Index of sequence
+                tracks and segments. Defaults to None.
+        clip_index_map (dict, optional): Filled with OTIO clips and
+                their AYON markers by clip index while markers are
+                attached. Defaults to None.
+        clip_workers (int, optional): Number of worker threads
+                creating OTIO clips from segments snapshot. Clips are
+                created one by one on the main thread if lower than 2.
+                Defaults to 0.
+        clip_cache (OtioClipCache, optional): Cache of OTIO clips
+                of unchanged segments, clips of changed segments are
+                added to it. Caller is responsible for saving the cache.
+                Defaults to None.
+        export_ctx (OtioExportContext, optional): Context of the export,
+                created from the sequence if not defined.
+                Defaults to None.
+
+    Returns:
+        otio.schema.Timeline: The OTIO timeline.
+    """
+    if validation_aggregator is None:
+        validation_aggregator = lib.ValidationAggregator()
+
+    log.info(dir(sequence))
+    log.info(sequence.attributes)
+
+    if export_ctx is None:
+        export_ctx = OtioExportContext.from_sequence(sequence)
+
+    # convert timeline to otio
+    otio_timeline = _create_otio_timeline(sequence, export_ctx)
+
+    # gather segments of all tracks first so their media
+    # can be probed before clips are created
+    tracks_segments = _get_tracks_segments(
+        sequence,
+        validation_aggregator,
+        sequence_index=sequence_index,
+        segment_attributes_store=segment_attributes_store,
+    )
+
+    if media_prefetch_workers and clip_cache is None:
+        _prefetch_media_info(
+            tracks_segments, media_prefetch_workers, media_probe_timeout)
+
+    tracks_otio_clips = [None] * len(tracks_segments)
+    if clip_workers > 1 or clip_cache is not None:
+        tracks_otio_clips = _create_tracks_otio_clips(
+            tracks_segments,
+            export_ctx,
+            clip_workers=clip_workers,
+            clip_cache=clip_cache,
+            media_prefetch_workers=media_prefetch_workers,
+            media_probe_timeout=media_probe_timeout,
+        )
+
+    _add_tracks_to_timeline(
+        otio_timeline,
+        tracks_segments,
+        tracks_otio_clips,
+        export_ctx,
+        clip_index_map=clip_index_map,
+    )
+
     return otio_timeline
 
 
+def create_otio_timelines(
+        sequences,
+        media_prefetch_workers: int = 0,
+        media_probe_timeout: float | None = None,
+        clip_workers: int = 0,
+        project=None,
+):
+    """Convert more Flame sequences to OTIO timelines in one pass.
+
+    Segments of all sequences are snapshot on the main thread first and
+    their media are probed together. OTIO clips of all sequences are
+    then created in one pool of worker threads. Media info, baked
+    timewarps and colour policy are shared by all sequences.
+
+    Args:
+        sequences (list[flame.PySequence]): The Flame sequences.
+        media_prefetch_workers (int, optional): Number of concurrent
+                media info probes run before clips are created.
+                Defaults to 0.
+        media_probe_timeout (float, optional): Timeout of prefetched
+                media info probe in seconds. Defaults to None.
+        clip_workers (int, optional): Number of worker threads
+                creating OTIO clips. Defaults to 0.
+        project (flame.PyProject, optional): The Flame project,
+                current project is used if not defined.
+
+    Returns:
+        list[tuple[otio.schema.Timeline, lib.ValidationAggregator]]:
+            OTIO timelines with validation of their segments in order
+            of sequences.
+    """
+    if project is None:
+        project = get_current_flame_project()
+
+    exports = []
+    snapshots = []
+    snapshots_ctx = []
+    for sequence in sequences:
+        export_ctx = OtioExportContext.from_sequence(sequence, project)
+        validation_aggregator = lib.ValidationAggregator()
+        tracks_segments = _get_tracks_segments(
+            sequence, validation_aggregator)
+        for _, segments in tracks_segments:
+            for segment_data in segments:
+                snapshots.append(create_segment_snapshot(segment_data))
+                snapshots_ctx.append(export_ctx)
+
+        exports.append(
+            (sequence, export_ctx, tracks_segments, validation_aggregator))
+
+    if media_prefetch_workers:
+        _prefetch_media_info(
+            [
+                track_segments
+                for _, _, tracks_segments, _ in exports
+                for track_segments in tracks_segments
+            ],
+            media_prefetch_workers,
+            media_probe_timeout,
+        )
+
+    log.info(
+        "Creating {} OTIO clips of {} sequences".format(
+            len(snapshots), len(exports)))
+    if clip_workers > 1 and len(snapshots) > 1:
+        with ThreadPoolExecutor(
+            max_workers=min(clip_workers, len(snapshots))
+        ) as executor:
+            otio_clips = list(
+                executor.map(
+                    create_otio_clip_from_snapshot, snapshots, snapshots_ctx)
+            )
+    else:
+        otio_clips = list(
+            map(create_otio_clip_from_snapshot, snapshots, snapshots_ctx))
+
+    otio_clips_iter = iter(otio_clips)
+    output = []
+    for sequence, export_ctx, tracks_segments, validation_aggregator in (
+        exports
+    ):
+        otio_timeline = _create_otio_timeline(sequence, export_ctx)
+        tracks_otio_clips = [
+            [next(otio_clips_iter) for _ in segments]
+            for _, segments in tracks_segments
+        ]
+        _add_tracks_to_timeline(
+            otio_timeline, tracks_segments, tracks_otio_clips, export_ctx)
+        output.append((otio_timeline, validation_aggregator))
+
+    return output
+
+
+def write_otio_timelines(otio_timelines, output_dir, single_file=False):
+    """Write OTIO timelines to output directory.
+
+    Args:
+        otio_timelines (list[otio.schema.Timeline]): OTIO timelines
+        output_dir (str): output directory
+        single_file (bool): write all timelines into one file with
+            `otio.schema.SerializableCollection`
+
+    Returns:
+        list[str]: written file paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if single_file:
+        path = os.path.join(output_dir, "sequences.otio")
+        write_to_file(
+            otio.schema.SerializableCollection(
+                name="sequences", children=otio_timelines),
+            path
+        )
+        return [path]
+
+    paths = []
+    used_names = set()
+    for otio_timeline in otio_timelines:
+        base_name = re.sub(r"[^\w.-]", "_", otio_timeline.name) or "sequence"
+        file_name = base_name
+        index = 1
+        while file_name in used_names:
+            file_name = f"{base_name}_{index}"
+            index += 1
+        used_names.add(file_name)
+
+        path = os.path.join(output_dir, f"{file_name}.otio")
+        write_to_file(otio_timeline, path)
+        paths.append(path)
+    return paths
+
+
+def export_otio_timelines(
+        sequences,
+        output_dir,
+        single_file=False,
+        media_prefetch_workers: int = 0,
+        media_probe_timeout: float | None = None,
+        clip_workers: int = 0,
+):
+    """Export more Flame sequences to `.otio` files in one pass.
+
+    Args:
+        sequences (list[flame.PySequence]): The Flame sequences.
+        output_dir (str): output directory
+        single_file (bool): write all timelines into one file
+        media_prefetch_workers (int, optional): Number of concurrent
+                media info probes. Defaults to 0.
+        media_probe_timeout (float, optional): Timeout of prefetched
+                media info probe in seconds. Defaults to None.
+        clip_workers (int, optional): Number of worker threads
+                creating OTIO clips. Defaults to 0.
+
+    Returns:
+        list[str]: written file paths
+    """
+    otio_timelines = []
+    for otio_timeline, validation_aggregator in create_otio_timelines(
+        sequences,
+        media_prefetch_workers=media_prefetch_workers,
+        media_probe_timeout=media_probe_timeout,
+        clip_workers=clip_workers,
+    ):
+        for segment in validation_aggregator.failed_segments:
+            log.warning(
+                f"Failed segment of `{otio_timeline.name}`: {segment.name}")
+        otio_timelines.append(otio_timeline)
+
+    return write_otio_timelines(
+        otio_timelines, output_dir, single_file=single_file)
+
+
 def write_to_file(otio_timeline, path):
     otio.adapters.write_to_file(otio_timeline, path)
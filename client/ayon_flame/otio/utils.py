@@ -101,10 +101,66 @@ def get_frame_from_filename(filename):
     return found.pop() if found else None
 
 
+def is_clip_index_marker(marker, marker_name):
+    """
+    Return True if otio marker is AYON marker with clip index.
+
+    Args:
+        marker (otio.schema.Marker): otio marker
+        marker_name (str): name of AYON marker
+
+    Returns:
+        bool: True if marker holds clip index
+
+    """
+    return (
+        marker_name in marker.name
+        and bool(marker.metadata.get("clip_index"))
+    )
+
+
+def add_to_clip_index_map(clip_index_map, otio_clip, marker, marker_name):
+    """
+    Map otio clip and its marker by clip index of the marker.
+
+    First mapped clip of the clip index is kept, the same clip is
+    found by `get_marker_from_clip_index` timeline search.
+
+    Args:
+        clip_index_map (dict): clip index map to update
+        otio_clip (otio.schema.Clip): otio clip
+        marker (otio.schema.Marker): otio marker of the clip
+        marker_name (str): name of AYON marker
+    """
+    if not is_clip_index_marker(marker, marker_name):
+        return
+
+    clip_index_map.setdefault(
+        marker.metadata["clip_index"], (otio_clip, marker))
+
+
+def get_marker_from_clip_index_map(clip_index_map, clip_index):
+    """
+    Return the clip and marker data from clip index map.
+
+    Args:
+        clip_index_map (dict): map filled by `add_to_clip_index_map`,
+            e.g. `otioClipIndexMap` of publish context
+        clip_index (str): The clip index.
+
+    Returns:
+        tuple: otio clip and marker or (None, None) if not found
+
+    """
+    return clip_index_map.get(clip_index, (None, None))
+
+
 def get_marker_from_clip_index(otio_timeline, clip_index):
     """
     Return the clip and marker data from clip index.
 
+    Prefer `get_marker_from_clip_index_map` for repeated lookups.
+
     Args:
         otio_timeline (dict): otio timeline
         clip_index (str): The clip index.
@@ -92,8 +92,8 @@ Publishing batch from Batch panel.
         """Create a batch workfile instance.
         """
         # Set flame_context directly.
-        # Skip FlameCreator.create() which runs reel/clip
-        # logic irrelevant to the batch context.
+        # Reel/clip selection of FlameCreator is irrelevant
+        # to the batch context.
         instance_data["flame_context"] = flapi.CTX.context
 
         try:
@@ -123,7 +123,7 @@ Publishing clips/plate from Media panel.
             clip_index = str(uuid.uuid4())
             clip_instance_data = deepcopy(instance_data)
             clip_instance_data["productName"] = product_name
-            clip_instance_data["clip_data"] = clip_data
+            clip_instance_data["clip_data"] = clip_data.to_dict()
 
             instance = CreatedInstance(
                 product_base_type=self.product_base_type,
@@ -136,7 +136,7 @@ Publishing clips/plate from Media panel.
             instance.transient_data["has_promised_context"] = True
 
             instance.transient_data["clip_item"] = clip_item
-            pipeline.imprint(
+            pipeline.imprint_instances(
                 clip_item,
                 data={
                     _CONTENT_ID: {self.identifier: clip_instance_data},
@@ -146,12 +146,21 @@ Publishing clips/plate from Media panel.
 
     def collect_instances(self):
         """Collect all created instances from current timeline."""
-        clips = lib.get_clips_in_reels(self.project)
-        for clip_data in clips:
-            clip_item = clip_data.pop("PyClip")
-            clip_data.pop("PySegment")  # non-serializable
+        # only clips with AYON marker are resolved
+        clips_marker_data = [
+            (reel_clip.clip, reel_clip.marker_data)
+            for reel_clip in lib.iter_reel_clips(
+                self.project, with_marker=True)
+        ]
+
+        # markers only reference instances data in project instance
+        # store if enabled, all referenced data are read at once
+        stored_data = pipeline.get_stored_instances_data(
+            marker_data for _, marker_data in clips_marker_data)
 
-            marker_data = lib.get_clip_data_marker(clip_item)
+        for clip_item, marker_data in clips_marker_data:
+            marker_data = pipeline.resolve_imprinted_data(
+                marker_data, stored_data)
             if not marker_data:
                 continue
 
@@ -176,12 +185,12 @@ Publishing clips/plate from Media panel.
         """
         for created_inst, _changes in update_list:
             clip_item = created_inst.transient_data["clip_item"]
-            marker_data = lib.get_clip_data_marker(clip_item)
+            marker_data = pipeline.get_imprinted_data(clip_item)
 
             instances_data = marker_data[_CONTENT_ID]
             instances_data[self.identifier] = created_inst.data_to_store()
 
-            pipeline.imprint(
+            pipeline.imprint_instances(
                 clip_item,
                 data=marker_data
             )
@@ -190,13 +199,13 @@ Publishing clips/plate from Media panel.
         """Remove instances."""
         for instance in instances:
             clip_item = instance.transient_data["clip_item"]
-            marker_data = lib.get_clip_data_marker(clip_item)
+            marker_data = pipeline.get_imprinted_data(clip_item)
 
             instances_data = marker_data.get(_CONTENT_ID, {})
             instances_data.pop(self.identifier, None)
             self._remove_instance_from_context(instance)
 
-            pipeline.imprint(
+            pipeline.imprint_instances(
                 clip_item,
                 data=marker_data
             )
@@ -1,3 +1,4 @@
+from collections import ChainMap
 from copy import deepcopy
 import uuid
 
@@ -155,31 +156,35 @@ class _FlameInstanceCreator(plugin.HiddenFlameCreator):
             update_list(List[UpdateData]): Gets list of tuples. Each item
                 contain changed instance and it's changes.
         """
-        for created_inst, _changes in update_list:
-            segment_item = created_inst.transient_data["segment_item"]
-            marker_data = ayfapi.get_segment_data_marker(segment_item)
+        with pipeline.buffered_imprint():
+            for created_inst, _changes in update_list:
+                self._update_instance(created_inst)
 
-            # Backwards compatible (Deprecated since 24/09/05)
-            # ignore instance if no existing marker data
-            if marker_data is None:
-                continue
+    def _update_instance(self, created_inst):
+        segment_item = created_inst.transient_data["segment_item"]
+        marker_data = pipeline.get_imprinted_data(segment_item)
 
-            try:
-                instances_data = marker_data[_CONTENT_ID]
+        # Backwards compatible (Deprecated since 24/09/05)
+        # ignore instance if no existing marker data
+        if marker_data is None:
+            return
 
-            # Backwards compatible (Deprecated since 24/09/05)
-            except KeyError:
-                marker_data[_CONTENT_ID] = {}
-                instances_data = marker_data[_CONTENT_ID]
+        try:
+            instances_data = marker_data[_CONTENT_ID]
 
-            instances_data[self.identifier] = created_inst.data_to_store()
-            pipeline.imprint(
-                segment_item,
-                data=  {
-                    _CONTENT_ID: instances_data,
-                    "clip_index": marker_data["clip_index"],
-                }
-            )
+        # Backwards compatible (Deprecated since 24/09/05)
+        except KeyError:
+            marker_data[_CONTENT_ID] = {}
+            instances_data = marker_data[_CONTENT_ID]
+
+        instances_data[self.identifier] = created_inst.data_to_store()
+        pipeline.imprint_instances(
+            segment_item,
+            data={
+                _CONTENT_ID: instances_data,
+                "clip_index": marker_data["clip_index"],
+            }
+        )
 
     def remove_instances(self, instances):
         """Remove instance marker from track item.
@@ -188,18 +193,19 @@ class _FlameInstanceCreator(plugin.HiddenFlameCreator):
             instance(List[CreatedInstance]): Instance objects which should be
                 removed.
         """
-        for instance in instances:
-            segment_item = instance.transient_data["segment_item"]
-            marker_data = ayfapi.get_segment_data_marker(segment_item)
-
-            instances_data = marker_data.get(_CONTENT_ID, {})
-            instances_data.pop(self.identifier, None)
-            self._remove_instance_from_context(instance)
-
-            pipeline.imprint(
-                segment_item,
-                data=marker_data
-            )
+        with pipeline.buffered_imprint():
+            for instance in instances:
+                segment_item = instance.transient_data["segment_item"]
+                marker_data = pipeline.get_imprinted_data(segment_item)
+
+                instances_data = marker_data.get(_CONTENT_ID, {})
+                instances_data.pop(self.identifier, None)
+                self._remove_instance_from_context(instance)
+
+                pipeline.imprint_instances(
+                    segment_item,
+                    data=marker_data
+                )
 
 
 class FlameShotInstanceCreator(_FlameInstanceCreator):
@@ -682,178 +688,203 @@ OTIO file.
             audio_creator_id: True,
         }
 
-        for idx, segment in enumerate(sorted_selected_segments):
+        # segment attributes are read only once per segment
+        segment_attributes_store = lib.SegmentAttributesStore(
+            self.sequence_index)
+        # sequence and hierarchy templates are resolved once
+        publish_clip_batch = ayfapi.PublishableClipBatch(
+            self.sequence,
+            pre_create_data=pre_create_data,
+            log=self.log,
+            segment_attributes_store=segment_attributes_store,
+        )
 
-            clip_index = str(uuid.uuid4())
-            segment_instance_data = deepcopy(instance_data)
-            segment_instance_data["clip_index"] = clip_index
+        # markers of segments are written once at the end
+        with pipeline.buffered_imprint(self.sequence_index):
+            for idx, segment in enumerate(sorted_selected_segments):
+
+                # segment data are layered over shared instance data,
+                # which are never modified
+                clip_index = str(uuid.uuid4())
+                segment_instance_data = ChainMap(
+                    {"clip_index": clip_index}, instance_data)
+
+                # convert track item to timeline media pool item
+                publish_clip = publish_clip_batch.create_clip(
+                    segment,
+                    data=segment_instance_data,
+                    rename_index=idx,
+                )
 
-            # convert track item to timeline media pool item
-            publish_clip = ayfapi.PublishableClip(
-                segment,
-                pre_create_data=pre_create_data,
-                data=segment_instance_data,
-                rename_index=idx,
-                log=self.log,
-            )
+                segment = publish_clip.convert()
+                if segment is None:
+                    # Ignore input clips that do not convert into a track item
+                    # from `PublishableClip.convert`
+                    continue
 
-            segment = publish_clip.convert()
-            if segment is None:
-                # Ignore input clips that do not convert into a track item
-                # from `PublishableClip.convert`
-                continue
+                segment_instance_data.update(publish_clip.marker_data)
+                self.log.info(
+                    f"Processing track item data: {segment} (index: {idx})"
+                )
 
-            segment_instance_data.update(publish_clip.marker_data)
-            self.log.info(
-                f"Processing track item data: {segment} (index: {idx})"
-            )
+                # Delete any existing instances previously generated
+                # for the clip.
+                prev_tag_data = pipeline.get_imprinted_data(segment)
+                if prev_tag_data:
+                    for creator_id, inst_data in prev_tag_data.get(
+                            _CONTENT_ID, {}).items():
+                        creator = self.create_context.creators[creator_id]
+                        prev_instance = (
+                            self.create_context.instances_by_id.get(
+                                inst_data["instance_id"])
+                        )
+                        if prev_instance is not None:
+                            creator.remove_instances([prev_instance])
+
+                # Create new product(s) instances.
+                clip_instances = {}
+                # disable shot creator if heroTrack is not enabled
+                all_creators[shot_creator_id] = segment_instance_data.get(
+                    "heroTrack", False)
+                # disable audio creator if audio is not enabled
+                all_creators[audio_creator_id] = (
+                    segment_instance_data.get("heroTrack", False) and
+                    pre_create_data.get("export_audio", False)
+                )
+
+                shot_folder_path = segment_instance_data["folderPath"]
+                shot_instances = self.shot_instances.setdefault(
+                    shot_folder_path, {})
 
-            # Delete any existing instances previously generated for the clip.
-            prev_tag_data = lib.get_segment_data_marker(segment)
-            if prev_tag_data:
-                for creator_id, inst_data in prev_tag_data.get(
-                        _CONTENT_ID, {}).items():
+                for creator_id, enabled in all_creators.items():
+                    if not enabled:
+                        continue
                     creator = self.create_context.creators[creator_id]
-                    prev_instance = self.create_context.instances_by_id.get(
-                        inst_data["instance_id"]
-                    )
-                    if prev_instance is not None:
-                        creator.remove_instances([prev_instance])
-
-            # Create new product(s) instances.
-            clip_instances = {}
-            # disable shot creator if heroTrack is not enabled
-            all_creators[shot_creator_id] = segment_instance_data.get(
-                "heroTrack", False)
-            # disable audio creator if audio is not enabled
-            all_creators[audio_creator_id] = (
-                segment_instance_data.get("heroTrack", False) and
-                pre_create_data.get("export_audio", False)
-            )
+                    sub_instance_data = segment_instance_data.new_child()
+                    # nested values are copied before being modified
+                    creator_attributes = dict(
+                        sub_instance_data.get("creator_attributes", {}))
+                    sub_instance_data["creator_attributes"] = (
+                        creator_attributes)
+
+                    # Shot creation
+                    if creator_id == shot_creator_id:
+                        segment_data = (
+                            segment_attributes_store.get_segment_attributes(
+                                segment)
+                        )
+                        self.log.debug(f"segment_data: '{segment_data}'")
+                        record_in = segment_data["record_in"]
+                        record_out = segment_data["record_out"]
+                        segment_duration = segment_data.get("record_duration")
+                        if segment_duration is None:
+                            segment_duration = record_out - record_in + 1
+                        workfileFrameStart = sub_instance_data[
+                            "workfileFrameStart"]
+                        sub_instance_data.update(
+                            {
+                                "variant": "main",
+                                "productType": "shot",
+                                "productBaseType": "shot",
+                                "productName": "shotMain",
+                                "creator_attributes": {
+                                    "workfileFrameStart": workfileFrameStart,
+                                    "handleStart": sub_instance_data[
+                                        "handleStart"],
+                                    "handleEnd": sub_instance_data[
+                                        "handleEnd"],
+                                    "frameStart": workfileFrameStart,
+                                    "frameEnd": (
+                                        workfileFrameStart + segment_duration),
+                                    "clipIn": int(record_in),
+                                    "clipOut": int(record_out),
+                                    "clipDuration": segment_duration,
+                                    "sourceIn": int(segment_data["source_in"]),
+                                    "sourceOut": int(
+                                        segment_data["source_out"]),
+                                    "includeHandles": pre_create_data[
+                                        "includeHandles"],
+                                    "retimedHandles": pre_create_data[
+                                        "retimedHandles"],
+                                    "retimedFramerange": pre_create_data[
+                                        "retimedFramerange"
+                                    ],
+                                    "useSourceResolution": sub_instance_data[
+                                        "sourceResolution"],
+                                },
+                                "label": f"{shot_folder_path} shot",
+                            }
+                        )
 
-            shot_folder_path = segment_instance_data["folderPath"]
-            shot_instances = self.shot_instances.setdefault(
-                shot_folder_path, {})
+                    # Plate,
+                    # insert parent instance data to allow
+                    # metadata recollection as publish time.
+                    elif creator_id == plate_creator_id:
+                        parenting_data = shot_instances[shot_creator_id]
+                        sub_instance_data.update(
+                            {
+                                "parent_instance_id": parenting_data[
+                                    "instance_id"],
+                                "label": (
+                                    f"{sub_instance_data['folderPath']} "
+                                    f"{sub_instance_data['productName']}"
+                                ),
+                            }
+                        )
+                        creator_attributes["parentInstance"] = parenting_data[
+                            "label"]
+                        if sub_instance_data.get("reviewableSource"):
+                            creator_attributes.update(
+                                {
+                                    "review": True,
+                                    "reviewableSource": sub_instance_data[
+                                        "reviewableSource"
+                                    ],
+                                }
+                            )
 
-            for creator_id, enabled in all_creators.items():
-                if not enabled:
-                    continue
-                creator = self.create_context.creators[creator_id]
-                sub_instance_data = deepcopy(segment_instance_data)
-                creator_attributes = sub_instance_data.setdefault(
-                    "creator_attributes", {}
-                )
+                    # Audio
+                    # insert parent instance data
+                    elif creator_id == audio_creator_id:
+                        sub_instance_data["variant"] = "main"
+                        sub_instance_data["productType"] = "audio"
+                        sub_instance_data["productBaseType"] = "audio"
+                        sub_instance_data["productName"] = "audioMain"
 
-                # Shot creation
-                if creator_id == shot_creator_id:
-                    segment_data = lib.get_segment_attributes(segment)
-                    self.log.debug(f"segment_data: '{segment_data}'")
-                    record_in = segment_data["record_in"]
-                    record_out = segment_data["record_out"]
-                    segment_duration = segment_data.get("record_duration")
-                    if segment_duration is None:
-                        segment_duration = record_out - record_in + 1
-                    workfileFrameStart = sub_instance_data[
-                        "workfileFrameStart"]
-                    sub_instance_data.update(
-                        {
-                            "variant": "main",
-                            "productType": "shot",
-                            "productBaseType": "shot",
-                            "productName": "shotMain",
-                            "creator_attributes": {
-                                "workfileFrameStart": workfileFrameStart,
-                                "handleStart": sub_instance_data[
-                                    "handleStart"],
-                                "handleEnd": sub_instance_data["handleEnd"],
-                                "frameStart": workfileFrameStart,
-                                "frameEnd": (
-                                    workfileFrameStart + segment_duration),
-                                "clipIn": int(record_in),
-                                "clipOut": int(record_out),
-                                "clipDuration": segment_duration,
-                                "sourceIn": int(segment_data["source_in"]),
-                                "sourceOut": int(segment_data["source_out"]),
-                                "includeHandles": pre_create_data[
-                                    "includeHandles"],
-                                "retimedHandles": pre_create_data[
-                                    "retimedHandles"],
-                                "retimedFramerange": pre_create_data[
-                                    "retimedFramerange"
-                                ],
-                                "useSourceResolution": sub_instance_data[
-                                    "sourceResolution"],
-                            },
-                            "label": f"{shot_folder_path} shot",
-                        }
-                    )
-
-                # Plate,
-                # insert parent instance data to allow
-                # metadata recollection as publish time.
-                elif creator_id == plate_creator_id:
-                    parenting_data = shot_instances[shot_creator_id]
-                    sub_instance_data.update(
-                        {
-                            "parent_instance_id": parenting_data[
-                                "instance_id"],
-                            "label": (
-                                f"{sub_instance_data['folderPath']} "
-                                f"{sub_instance_data['productName']}"
-                            ),
-                        }
-                    )
-                    creator_attributes["parentInstance"] = parenting_data[
-                        "label"]
-                    if sub_instance_data.get("reviewableSource"):
-                        creator_attributes.update(
+                        parenting_data = shot_instances[shot_creator_id]
+                        sub_instance_data.update(
                             {
-                                "review": True,
-                                "reviewableSource": sub_instance_data[
-                                    "reviewableSource"
-                                ],
+                                "parent_instance_id": parenting_data[
+                                    "instance_id"],
+                                "label": (
+                                    f"{sub_instance_data['folderPath']} "
+                                    f"{sub_instance_data['productName']}"
+                                )
                             }
                         )
-
-                # Audio
-                # insert parent instance data
-                elif creator_id == audio_creator_id:
-                    sub_instance_data["variant"] = "main"
-                    sub_instance_data["productType"] = "audio"
-                    sub_instance_data["productBaseType"] = "audio"
-                    sub_instance_data["productName"] = "audioMain"
-
-                    parenting_data = shot_instances[shot_creator_id]
-                    sub_instance_data.update(
-                        {
-                            "parent_instance_id": parenting_data[
-                                "instance_id"],
-                            "label": (
-                                f"{sub_instance_data['folderPath']} "
-                                f"{sub_instance_data['productName']}"
-                            )
-                        }
-                    )
-                    creator_attributes["parentInstance"] = parenting_data[
-                        "label"]
-
-                    if sub_instance_data.get("reviewableSource"):
-                        creator_attributes["review"] = True
-
-                instance = creator.create(sub_instance_data)
-                instance.transient_data["segment_item"] = segment
-
-                instance_data_to_store = instance.data_to_store()
-                shot_instances[creator_id] = instance_data_to_store
-                clip_instances[creator_id] = instance_data_to_store
-
-            pipeline.imprint(
-                segment,
-                data={
-                    _CONTENT_ID: clip_instances,
-                    "clip_index": clip_index,
-                }
-            )
+                        creator_attributes["parentInstance"] = parenting_data[
+                            "label"]
+
+                        if sub_instance_data.get("reviewableSource"):
+                            creator_attributes["review"] = True
+
+                    # layered data are flattened for created instance,
+                    # nested values shared by the layers are copied
+                    instance = creator.create(
+                        deepcopy(dict(sub_instance_data)))
+                    instance.transient_data["segment_item"] = segment
+
+                    instance_data_to_store = instance.data_to_store()
+                    shot_instances[creator_id] = instance_data_to_store
+                    clip_instances[creator_id] = instance_data_to_store
+
+                pipeline.imprint_instances(
+                    segment,
+                    data={
+                        _CONTENT_ID: clip_instances,
+                        "clip_index": clip_index,
+                    }
+                )
 
         self.shot_instances = {}
         ayfapi.PublishableClip.restore_all_caches()
@@ -962,7 +993,7 @@ OTIO file.
             clip_instances[sub_creator_id] = instance.data_to_store()
 
         # Adjust clip tag to match new publisher
-        pipeline.imprint(
+        pipeline.imprint_instances(
             segment,
             data={
                 _CONTENT_ID: clip_instances,
@@ -983,17 +1014,27 @@ OTIO file.
 
         # only get selected segments if user selected any
         # and settings are enabled
-        segments = lib.get_sequence_segments(
-            current_sequence, selected=restrict_to_selection
-        )
+        sequence_index = lib.SequenceIndex(current_sequence)
+        segments = sequence_index.get_segments(
+            selected=restrict_to_selection)
 
         if not segments:
             # get all segments if user didn't select any
-            segments = lib.get_sequence_segments(current_sequence)
+            segments = sequence_index.get_segments()
 
-        for segment in segments:
+        # markers only reference instances data in project instance
+        # store if enabled, all referenced data are read at once
+        segments_marker_data = [
+            (segment, lib.get_segment_data_marker(segment))
+            for segment in segments
+        ]
+        stored_data = pipeline.get_stored_instances_data(
+            marker_data for _, marker_data in segments_marker_data)
+
+        for segment, marker_data in segments_marker_data:
             # attempt to get AYON tag data
-            marker_data = lib.get_segment_data_marker(segment)
+            marker_data = pipeline.resolve_imprinted_data(
+                marker_data, stored_data)
             if not marker_data:
                 continue
 
@@ -1025,9 +1066,4 @@ def get_video_track_names(sequence):
     Returns:
         list. The track names.
     """
-    track_names = []
-    for ver in sequence.versions:
-        for track in ver.tracks:
-            track_names.append(track.name.get_value())
-
-    return track_names
+    return lib.SequenceIndex(sequence).track_names
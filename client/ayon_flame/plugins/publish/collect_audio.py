@@ -24,9 +24,9 @@ class CollectAudio(pyblish.api.InstancePlugin):
         )
 
         # Adjust instance data from parent otio timeline.
-        otio_timeline = instance.context.data["otioTimeline"]
-        otio_clip, marker = utils.get_marker_from_clip_index(
-            otio_timeline, instance.data["clip_index"]
+        otio_clip, marker = utils.get_marker_from_clip_index_map(
+            instance.context.data["otioClipIndexMap"],
+            instance.data["clip_index"]
         )
         if not otio_clip:
             raise RuntimeError(
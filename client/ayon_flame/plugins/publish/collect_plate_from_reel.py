@@ -52,7 +52,8 @@ class CollectReelPlate(pyblish.api.InstancePlugin):
         }
 
         # Build otio timeline and otio clip from clip item.
-        flame_export.OtioExportCTX.set_fps(instance_clip_data["fps"])
+        export_ctx = flame_export.OtioExportContext(
+            fps=instance_clip_data["fps"])
 
         # Cannot use instance data as PySegment is not serializable.
         clip_data_duplicate = clip_data.copy()
@@ -60,7 +61,8 @@ class CollectReelPlate(pyblish.api.InstancePlugin):
             instance_clip_data["item"]
         )
 
-        otio_clip = flame_export.create_otio_clip(clip_data_duplicate)
+        otio_clip = flame_export.create_otio_clip(
+            clip_data_duplicate, export_ctx)
         otio_timeline = otio.schema.Timeline(
             tracks=[otio.schema.Track(children=[otio_clip])]
         )
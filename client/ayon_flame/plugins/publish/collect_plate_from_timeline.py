@@ -29,9 +29,9 @@ class CollectTimelinePlate(pyblish.api.InstancePlugin):
         instance.data["families"].append("clip")
 
         # Adjust instance data from parent otio timeline.
-        otio_timeline = instance.context.data["otioTimeline"]
-        otio_clip, _ = utils.get_marker_from_clip_index(
-            otio_timeline, instance.data["clip_index"]
+        otio_clip, _ = utils.get_marker_from_clip_index_map(
+            instance.context.data["otioClipIndexMap"],
+            instance.data["clip_index"]
         )
         if not otio_clip:
             raise RuntimeError(
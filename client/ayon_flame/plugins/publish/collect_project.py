@@ -18,5 +18,9 @@ class CollecFlameProject(pyblish.api.ContextPlugin):
             "currentFile": f"Flame/{project.name}"
         }
 
+        # segment attributes are read only once during publishing
+        context.data["flameSegmentAttributesStore"] = (
+            ayfapi.SegmentAttributesStore())
+
         self.log.debug(f">>> Project data: {pformat(project_data)}")
         context.data.update(project_data)
@@ -0,0 +1,17 @@
+import pyblish.api
+
+
+class CollectRestoreSegmentSelection(pyblish.api.ContextPlugin):
+    """Restore selection of sequence segments at the end of collection"""
+
+    label = "Restore Segment Selection"
+    order = pyblish.api.CollectorOrder + 0.499
+    hosts = ["flame"]
+
+    def process(self, context):
+        selection_guard = context.data.get("flameSelectionGuard")
+        if selection_guard is None or not selection_guard.active:
+            return
+
+        changed = selection_guard.restore()
+        self.log.debug(f"Restored selection of {changed} segment(s).")
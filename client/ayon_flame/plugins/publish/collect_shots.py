@@ -84,9 +84,9 @@ class CollectShot(pyblish.api.InstancePlugin):
         instance.data["integrate"] = False  # no representation for shot
 
         # Adjust instance data from parent otio timeline.
-        otio_timeline = instance.context.data["otioTimeline"]
-        otio_clip, _ = utils.get_marker_from_clip_index(
-            otio_timeline, instance.data["clip_index"]
+        otio_clip, _ = utils.get_marker_from_clip_index_map(
+            instance.context.data["otioClipIndexMap"],
+            instance.data["clip_index"]
         )
         if not otio_clip:
             raise RuntimeError(
@@ -101,25 +101,25 @@ class CollectShot(pyblish.api.InstancePlugin):
         instance.data["otioClip"] = otio_clip
 
         # Compute additional data
-        segment_item = None
-        for item in instance.context.data["flameSegments"]:
-            item_data = ayfapi.get_segment_data_marker(item) or {}
-            if item_data.get("clip_index") == instance.data["clip_index"]:
-                segment_item = item
-                break
-
-        if segment_item is None:
+        segment_marker_item = instance.context.data[
+            "flameSegmentsByClipIndex"].get(instance.data["clip_index"])
+        if segment_marker_item is None:
             raise PublishError(
                 "Could not retrieve source from sequence segments.")
+        segment_item = segment_marker_item.segment
 
         comment_attributes = self._get_comment_attributes(segment_item)
         instance.data.update(comment_attributes)
 
         sequence = ayfapi.get_current_sequence(ayfapi.CTX.selection)
-        with ayfapi.maintained_segment_selection(sequence):
+        with ayfapi.maintained_segment_selection(
+            sequence,
+            instance.context.data.get("flameSequenceIndex"),
+            instance.context.data.get("flameSelectionGuard"),
+        ):
             validation_aggregator = ayfapi.ValidationAggregator()
-            clip_data = ayfapi.get_segment_attributes(
-                segment_item, validation_aggregator=validation_aggregator)
+            clip_data = self._get_segment_attributes(
+                instance.context, segment_item, validation_aggregator)
             if not clip_data:
                 raise PublishError(
                     "Could not retrieve clip data from segment."
@@ -190,6 +190,15 @@ class CollectShot(pyblish.api.InstancePlugin):
 
         return workfile_start
 
+    @staticmethod
+    def _get_segment_attributes(context, segment, validation_aggregator):
+        store = context.data.get("flameSegmentAttributesStore")
+        if store is not None:
+            return store.get_segment_attributes(
+                segment, validation_aggregator)
+        return ayfapi.get_segment_attributes(
+            segment, validation_aggregator=validation_aggregator)
+
     def _get_comment_attributes(self, segment):
         comment = segment.comment.get_value()
 
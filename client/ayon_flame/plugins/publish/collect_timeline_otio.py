@@ -1,10 +1,11 @@
+import os
 import pyblish.api
 from pprint import pformat
 
 import opentimelineio as otio
 
 import ayon_flame.api as ayfapi
-from ayon_flame.otio import flame_export
+from ayon_flame.otio import clip_cache, flame_export
 
 
 class CollecTimelineOTIO(pyblish.api.ContextPlugin):
@@ -21,15 +22,77 @@ class CollecTimelineOTIO(pyblish.api.ContextPlugin):
             # No sequence currently opened in Flame.
             # This means all publish instances comes from reel/media panel.
             context.data["otioTimeline"] = otio.schema.Timeline()
+            context.data["flameSegmentsByClipIndex"] = {}
+            context.data["otioClipIndexMap"] = {}
             self.log.debug("No current Flame sequence found.")
             return
 
+        performance_settings = (
+            context.data["project_settings"]["flame"]
+            .get("performance", {})
+        )
+        # concurrent media info probing options
+        prefetch_settings = performance_settings.get(
+            "media_info_prefetch", {})
+        prefetch_workers = 0
+        if prefetch_settings.get("enabled"):
+            prefetch_workers = prefetch_settings["max_workers"]
+
+        # concurrent OTIO clips creation options
+        clip_workers_settings = performance_settings.get(
+            "otio_clip_workers", {})
+        clip_workers = 0
+        if clip_workers_settings.get("enabled"):
+            clip_workers = clip_workers_settings["max_workers"]
+
+        # OTIO clips of unchanged segments are reused from cache
+        otio_clip_cache = None
+        workdir = os.environ.get("AYON_WORKDIR")
+        if (
+            workdir
+            and performance_settings.get(
+                "otio_clip_cache", {}).get("enabled")
+        ):
+            otio_clip_cache = clip_cache.OtioClipCache(
+                clip_cache.get_sequence_cache_path(
+                    workdir,
+                    context.data["flameProject"].name,
+                    sequence.name.get_value(),
+                ),
+                logger=self.log,
+            )
+
+        # tracks and segments of sequence are traversed only once
+        sequence_index = ayfapi.SequenceIndex(sequence)
+        segment_attributes_store = context.data.get(
+            "flameSegmentAttributesStore")
+        if segment_attributes_store is not None:
+            # segments are identified by their version and track index
+            segment_attributes_store.set_sequence_index(sequence_index)
+        # selection is restored once at the end of collection
+        selection_guard = ayfapi.SegmentSelectionGuard(sequence_index)
+
         # validate segment from current sequence
-        segments = ayfapi.get_sequence_segments(sequence)
+        segments = sequence_index.get_segments()
         validation_aggregator = ayfapi.ValidationAggregator()
-        with ayfapi.maintained_segment_selection(sequence):
+        clip_index_map = {}
+        with ayfapi.maintained_segment_selection(
+            sequence, sequence_index, selection_guard
+        ):
             otio_timeline = flame_export.create_otio_timeline(
-                sequence, validation_aggregator=validation_aggregator)
+                sequence,
+                validation_aggregator=validation_aggregator,
+                media_prefetch_workers=prefetch_workers,
+                media_probe_timeout=prefetch_settings.get("probe_timeout"),
+                segment_attributes_store=segment_attributes_store,
+                sequence_index=sequence_index,
+                clip_index_map=clip_index_map,
+                clip_workers=clip_workers,
+                clip_cache=otio_clip_cache,
+            )
+
+        if otio_clip_cache is not None:
+            otio_clip_cache.save()
 
         failed_segments = validation_aggregator.failed_segments
 
@@ -39,11 +102,21 @@ class CollecTimelineOTIO(pyblish.api.ContextPlugin):
             "flameSequence": sequence,
             "failedSegments": failed_segments,
             "otioTimeline": otio_timeline,
+            "otioClipIndexMap": clip_index_map,
             "currentFile": "Flame/{}/{}".format(
                 project.name, sequence.name.get_value()
             ),
             "flameSegments": segments,
+            "flameSequenceIndex": sequence_index,
+            "flameSelectionGuard": selection_guard,
+            # AYON markers of segments are decoded only once per publish
+            "flameSegmentsByClipIndex": (
+                sequence_index.segments_by_clip_index),
             "fps": float(str(sequence.frame_rate)[:-4])
         }
-        self.log.debug(f">>> Timeline data: {pformat(timeline_data)}")
         context.data.update(timeline_data)
+
+        # index of AYON markers is not printed, its marker data
+        # are decoded only when they are used
+        timeline_data.pop("flameSegmentsByClipIndex")
+        self.log.debug(f">>> Timeline data: {pformat(timeline_data)}")
@@ -153,7 +153,11 @@ class ExtractProductResources(
         else:
             # media source is unlinked, so we do not have available
             # otio reference for media source frame range calculation
-            segment_data = ayfapi.get_segment_attributes(segment)
+            store = instance.context.data.get("flameSegmentAttributesStore")
+            if store is not None:
+                segment_data = store.get_segment_attributes(segment)
+            else:
+                segment_data = ayfapi.get_segment_attributes(segment)
             source_in = segment_data["source_in"]
             source_out = segment_data["source_out"]
             source_duration = source_out - source_in + 1
@@ -858,21 +862,20 @@ class ExtractProductResources(
             segment_name (str): segment name
             track_name (str): track name
         """
-        # create otio tracks and clips
-        for ver in sequence_clip.versions:
-            for track in ver.tracks:
-                if len(track.segments) == 0 and track.hidden.get_value():
-                    continue
-
-                # hide tracks which are not parent track
-                if track.name.get_value() != track_name:
-                    track.hidden = True
-                    continue
-
-                # hidde all other segments
-                for segment in track.segments:
-                    if segment.name.get_value() != segment_name:
-                        segment.hidden = True
+        sequence_index = ayfapi.SequenceIndex(sequence_clip)
+        for sequence_track in sequence_index.tracks:
+            if not sequence_track.segments and sequence_track.hidden:
+                continue
+
+            # hide tracks which are not parent track
+            if sequence_track.name != track_name:
+                sequence_track.track.hidden = True
+                continue
+
+            # hidde all other segments
+            for segment in sequence_track.segments:
+                if segment.name.get_value() != segment_name:
+                    segment.hidden = True
 
     def import_clip(self, path):
         """Import clip from path
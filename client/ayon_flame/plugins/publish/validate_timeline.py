@@ -20,7 +20,9 @@ class _ActOnFailedSegments(pyblish.api.Action):
             return
 
         sequence = ayfapi.get_current_sequence(ayfapi.CTX.selection)
-        with ayfapi.maintained_segment_selection(sequence):
+        with ayfapi.maintained_segment_selection(
+            sequence, context.data.get("flameSequenceIndex")
+        ):
             for segment in failed_segments:
                 shot_name = segment.shot_name.get_value()
                 segment_name = segment.name.get_value()
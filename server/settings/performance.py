@@ -0,0 +1,206 @@
+from ayon_server.settings import BaseSettingsModel, SettingsField
+
+
+class MediaInfoIndexModel(BaseSettingsModel):
+    _isGroup = True
+
+    enabled: bool = SettingsField(
+        False,
+        title="Enabled",
+        description=(
+            "Store media info probed with `dl_get_media_info` into "
+            "a persistent index reused between Flame sessions."
+        ),
+    )
+    index_path: str = SettingsField(
+        "",
+        title="Index file path",
+        description=(
+            "Absolute path of the SQLite index file. If left empty, "
+            "the index is stored in the AYON Flame user folder."
+        ),
+    )
+    max_entries: int = SettingsField(
+        50000,
+        title="Maximum entries",
+        ge=100,
+        description=(
+            "Least recently used entries are evicted once the index "
+            "exceeds this number of entries."
+        ),
+    )
+
+
+class MediaInfoPrefetchModel(BaseSettingsModel):
+    _isGroup = True
+
+    enabled: bool = SettingsField(
+        False,
+        title="Enabled",
+        description=(
+            "Probe media of all timeline segments concurrently "
+            "before the OTIO timeline is created."
+        ),
+    )
+    max_workers: int = SettingsField(
+        8,
+        title="Concurrent probes",
+        ge=1,
+        le=64,
+    )
+    probe_timeout: int = SettingsField(
+        120,
+        title="Probe timeout (seconds)",
+        ge=0,
+        description=(
+            "Probes running longer are stopped and media are probed "
+            "again while OTIO clips are created. No timeout if 0."
+        ),
+    )
+
+
+class MediaHeaderProbeModel(BaseSettingsModel):
+    _isGroup = True
+
+    enabled: bool = SettingsField(
+        False,
+        title="Enabled",
+        description=(
+            "Read media info of OpenEXR, DPX, TIFF, QuickTime and MXF "
+            "files from their headers. Media without timecode in "
+            "header are probed with `dl_get_media_info`."
+        ),
+    )
+
+
+class InstanceStoreModel(BaseSettingsModel):
+    _isGroup = True
+
+    enabled: bool = SettingsField(
+        False,
+        title="Enabled",
+        description=(
+            "Store data of created instances in a project side-car "
+            "SQLite file next to the `.workfile`. Segment and reel clip "
+            "markers keep only the clip index referencing the data."
+        ),
+    )
+
+
+class OtioClipWorkersModel(BaseSettingsModel):
+    _isGroup = True
+
+    enabled: bool = SettingsField(
+        False,
+        title="Enabled",
+        description=(
+            "Segments data are read from Flame first, then OTIO clips "
+            "and media references are created in worker threads."
+        ),
+    )
+    max_workers: int = SettingsField(
+        4,
+        title="Worker threads",
+        ge=1,
+        le=64,
+    )
+
+
+class OtioClipCacheModel(BaseSettingsModel):
+    _isGroup = True
+
+    enabled: bool = SettingsField(
+        False,
+        title="Enabled",
+        description=(
+            "Keep OTIO clips converted from sequence segments in a "
+            "side-car cache in the work directory. Clips of segments "
+            "with unchanged media files, ranges, timewarp setup and "
+            "markers are reused by following publishes."
+        ),
+    )
+
+
+class OtioBatchExportModel(BaseSettingsModel):
+    _isGroup = True
+
+    max_workers: int = SettingsField(
+        4,
+        title="Worker threads",
+        ge=1,
+        le=64,
+        description=(
+            "Number of threads creating OTIO clips of all sequences "
+            "exported with `Export OTIO...` menu action."
+        ),
+    )
+    single_file: bool = SettingsField(
+        False,
+        title="Single file",
+        description=(
+            "Write all exported sequences into one `.otio` file "
+            "instead of one file per sequence."
+        ),
+    )
+
+
+class PerformanceModel(BaseSettingsModel):
+    media_info_index: MediaInfoIndexModel = SettingsField(
+        default_factory=MediaInfoIndexModel,
+        title="Persistent media info index",
+    )
+    media_info_prefetch: MediaInfoPrefetchModel = SettingsField(
+        default_factory=MediaInfoPrefetchModel,
+        title="Media info prefetch",
+    )
+    media_header_probe: MediaHeaderProbeModel = SettingsField(
+        default_factory=MediaHeaderProbeModel,
+        title="Native media header probe",
+    )
+    instance_store: InstanceStoreModel = SettingsField(
+        default_factory=InstanceStoreModel,
+        title="Project instance store",
+    )
+    otio_clip_workers: OtioClipWorkersModel = SettingsField(
+        default_factory=OtioClipWorkersModel,
+        title="Concurrent OTIO clips creation",
+    )
+    otio_clip_cache: OtioClipCacheModel = SettingsField(
+        default_factory=OtioClipCacheModel,
+        title="Incremental OTIO export",
+    )
+    otio_batch_export: OtioBatchExportModel = SettingsField(
+        default_factory=OtioBatchExportModel,
+        title="Batch OTIO export",
+    )
+
+
+DEFAULT_PERFORMANCE_SETTINGS = {
+    "media_info_index": {
+        "enabled": False,
+        "index_path": "",
+        "max_entries": 50000,
+    },
+    "media_info_prefetch": {
+        "enabled": False,
+        "max_workers": 8,
+        "probe_timeout": 120,
+    },
+    "media_header_probe": {
+        "enabled": False,
+    },
+    "instance_store": {
+        "enabled": False,
+    },
+    "otio_clip_workers": {
+        "enabled": False,
+        "max_workers": 4,
+    },
+    "otio_clip_cache": {
+        "enabled": False,
+    },
+    "otio_batch_export": {
+        "max_workers": 4,
+        "single_file": False,
+    },
+}
@@ -0,0 +1,48 @@
+import importlib.util
+import os
+
+MODULE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "client", "ayon_flame", "api", "file_sequence.py"
+)
+
+
+def _load_file_sequence():
+    # module is loaded directly as the package requires the host
+    spec = importlib.util.spec_from_file_location(
+        "file_sequence", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+DirectorySequenceIndex = _load_file_sequence().DirectorySequenceIndex
+
+
+def _touch_frames(dir_path, head, frames, tail):
+    for frame in frames:
+        open(os.path.join(dir_path, f"{head}{frame}{tail}"), "w").close()
+
+
+def test_padded_sequence_crossing_thousand(tmp_path):
+    _touch_frames(
+        str(tmp_path), "plate.", [f"{f:04d}" for f in range(990, 1011)],
+        ".exr")
+
+    index = DirectorySequenceIndex(str(tmp_path))
+    sequence = index.get_sequence("plate", "exr", "plate.0990.exr")
+
+    assert sequence.padding == 4
+    assert sequence.runs == [(990, 1010)]
+    assert index.get_sequence("plate", "exr", "plate.1000.exr") is sequence
+
+
+def test_unpadded_sequence(tmp_path):
+    _touch_frames(
+        str(tmp_path), "plate.", [str(f) for f in range(998, 1003)], ".exr")
+
+    index = DirectorySequenceIndex(str(tmp_path))
+    sequence = index.get_sequence("plate", "exr", "plate.998.exr")
+
+    assert sequence.padding == 0
+    assert sequence.runs == [(998, 1002)]
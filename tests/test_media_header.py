@@ -0,0 +1,262 @@
+import importlib.util
+import os
+import struct
+
+import pytest
+
+MODULE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "client", "ayon_flame", "api", "media_header.py"
+)
+
+
+def _load_media_header():
+    # module is loaded directly as the package requires the host
+    spec = importlib.util.spec_from_file_location(
+        "media_header", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+media_header = _load_media_header()
+
+
+def _write(tmp_path, file_name, data):
+    path = tmp_path / file_name
+    path.write_bytes(data)
+    return str(path)
+
+
+def _exr_attribute(name, attr_type, value):
+    return (
+        name.encode("ascii") + b"\0" + attr_type.encode("ascii") + b"\0"
+        + struct.pack("<i", len(value)) + value
+    )
+
+
+def _atom(atom_type, payload):
+    return struct.pack(">I4s", len(payload) + 8, atom_type) + payload
+
+
+def _quicktime_track(handler_type, sample_entry, chunk_offset=None):
+    sample_table = _atom(
+        b"stsd", struct.pack(">II", 0, 1) + sample_entry)
+    if chunk_offset is not None:
+        sample_table += _atom(
+            b"stco", struct.pack(">III", 0, 1, chunk_offset))
+    return _atom(b"trak", _atom(b"mdia", (
+        _atom(b"hdlr", struct.pack(">II4s", 0, 0, handler_type))
+        + _atom(b"minf", _atom(b"stbl", sample_table))
+    )))
+
+
+def _mxf_local_set(set_type, items):
+    key = bytes.fromhex("060e2b34025301010d01010101") + set_type + b"\0"
+    value = b"".join(
+        struct.pack(">HH", tag, len(item)) + item
+        for tag, item in items.items()
+    )
+    return key + b"\x83" + len(value).to_bytes(3, "big") + value
+
+
+def test_timecode_to_frames_drop_frame():
+    assert media_header.timecode_to_frames(
+        1, 0, 0, 0, 29.97, False) == 108000
+    assert media_header.timecode_to_frames(
+        1, 0, 0, 0, 29.97, True) == 107892
+    assert media_header.timecode_to_frames(
+        0, 1, 0, 2, 59.94, True) == 3602 - 4
+
+
+def test_exr_header(tmp_path):
+    header = b"".join((
+        media_header.EXR_MAGIC,
+        struct.pack("<I", 2),
+        _exr_attribute(
+            "displayWindow", "box2i", struct.pack("<4i", 0, 0, 1919, 1079)),
+        _exr_attribute(
+            "pixelAspectRatio", "float", struct.pack("<f", 2.0)),
+        _exr_attribute(
+            "framesPerSecond", "rational", struct.pack("<iI", 24000, 1001)),
+        _exr_attribute(
+            "timeCode", "timecode", struct.pack("<II", 0x01000000, 0)),
+        b"\0",
+    ))
+    path = _write(tmp_path, "plate.1001.exr", header)
+
+    assert media_header.read_media_header(path) == {
+        "width": 1920,
+        "height": 1080,
+        "pixel_aspect": 2.0,
+        "fps": 23.976,
+        "start_frame": 86400,
+        "drop_mode": "NDF",
+    }
+
+
+@pytest.mark.parametrize("byte_order", [">", "<"])
+def test_dpx_drop_frame_timecode(tmp_path, byte_order):
+    data = bytearray(2048)
+    data[:4] = b"SDPX" if byte_order == ">" else b"XPDS"
+    struct.pack_into(byte_order + "II", data, 772, 1920, 1080)
+    struct.pack_into(
+        byte_order + "II", data, 1628,
+        media_header.UNDEFINED_UINT32, media_header.UNDEFINED_UINT32
+    )
+    # 01:00:00;00 with drop frame flag in frames byte
+    struct.pack_into(byte_order + "I", data, 1920, 0x01000040)
+    struct.pack_into(byte_order + "f", data, 1940, 29.97)
+    path = _write(tmp_path, "plate.1001.dpx", bytes(data))
+
+    header_data = media_header.read_media_header(path)
+
+    assert header_data["width"] == 1920
+    assert header_data["height"] == 1080
+    assert header_data["pixel_aspect"] == 1.0
+    assert header_data["fps"] == 29.97
+    assert header_data["start_frame"] == 107892
+    assert header_data["drop_mode"] == "DF"
+
+
+def test_dpx_without_timecode(tmp_path):
+    data = bytearray(2048)
+    data[:4] = b"SDPX"
+    struct.pack_into(">II", data, 772, 2048, 1556)
+    struct.pack_into(">I", data, 1920, media_header.UNDEFINED_UINT32)
+    struct.pack_into(">f", data, 1724, 24.0)
+    path = _write(tmp_path, "plate.1001.dpx", bytes(data))
+
+    header_data = media_header.read_media_header(path)
+
+    assert header_data["fps"] == 24.0
+    assert header_data["start_frame"] is None
+
+
+def test_tiff_header(tmp_path):
+    tags = [
+        (media_header.TIFF_IMAGE_WIDTH, 3, 1, struct.pack("<HH", 1920, 0)),
+        (media_header.TIFF_IMAGE_LENGTH, 3, 1, struct.pack("<HH", 1080, 0)),
+        (media_header.TIFF_X_RESOLUTION, 5, 1, struct.pack("<II", 72, 1)),
+        (media_header.TIFF_Y_RESOLUTION, 5, 1, struct.pack("<II", 144, 1)),
+        (
+            media_header.TIFF_TIME_CODES, 1, 8,
+            struct.pack("<II", 0x01000000, 0)
+        ),
+        (media_header.TIFF_FRAME_RATE, 10, 1, struct.pack("<ii", 25, 1)),
+    ]
+    ifd_size = 2 + len(tags) * 12 + 4
+    entries = b""
+    values = b""
+    for tag, value_type, count, value in tags:
+        if len(value) <= 4:
+            entries += struct.pack("<HHI", tag, value_type, count) + value
+            continue
+        entries += struct.pack(
+            "<HHII", tag, value_type, count, 8 + ifd_size + len(values))
+        values += value
+    data = (
+        b"II" + struct.pack("<HI", 42, 8)
+        + struct.pack("<H", len(tags)) + entries + struct.pack("<I", 0)
+        + values
+    )
+    path = _write(tmp_path, "plate.1001.tif", data)
+
+    assert media_header.read_media_header(path) == {
+        "width": 1920,
+        "height": 1080,
+        "pixel_aspect": 2.0,
+        "fps": 25.0,
+        "start_frame": 90000,
+        "drop_mode": "NDF",
+    }
+
+
+def test_quicktime_header(tmp_path):
+    video_entry = (
+        struct.pack(">I4s6xH", 86 + 16, b"avc1", 1)
+        + struct.pack(">HH4sII", 0, 0, b"", 0, 0)
+        + struct.pack(">HH", 1920, 1080)
+    )
+    video_entry += b"\0" * (86 - len(video_entry))
+    video_entry += _atom(b"pasp", struct.pack(">II", 4, 3))
+    timecode_entry = (
+        struct.pack(">I4s6xH", 34, b"tmcd", 1)
+        + struct.pack(">IIIIB", 0, media_header.TMCD_DROP_FRAME, 30000,
+                      1001, 30)
+        + b"\0"
+    )
+
+    file_type = _atom(b"ftyp", b"qt  \0\0\0\0qt  ")
+
+    def build_movie(chunk_offset):
+        return _atom(b"moov", (
+            _quicktime_track(b"vide", video_entry)
+            + _quicktime_track(b"tmcd", timecode_entry, chunk_offset)
+        ))
+
+    chunk_offset = len(file_type) + len(build_movie(0)) + 8
+    data = (
+        file_type + build_movie(chunk_offset)
+        + _atom(b"mdat", struct.pack(">I", 107892))
+    )
+    path = _write(tmp_path, "plate.mov", data)
+
+    assert media_header.read_media_header(path) == {
+        "width": 1920,
+        "height": 1080,
+        "pixel_aspect": 4.0 / 3.0,
+        "fps": 29.97,
+        "start_frame": 107892,
+        "drop_mode": "DF",
+    }
+
+
+def test_mxf_header(tmp_path):
+    header_metadata = b"".join((
+        # material package timecode is zero
+        _mxf_local_set(media_header.MXF_TIMECODE_COMPONENT, {
+            media_header.MXF_START_TIMECODE: struct.pack(">q", 0),
+            media_header.MXF_ROUNDED_TIMECODE_BASE: struct.pack(">H", 25),
+            media_header.MXF_DROP_FRAME: b"\0",
+        }),
+        _mxf_local_set(media_header.MXF_TIMECODE_COMPONENT, {
+            media_header.MXF_START_TIMECODE: struct.pack(">q", 90000),
+            media_header.MXF_ROUNDED_TIMECODE_BASE: struct.pack(">H", 25),
+            media_header.MXF_DROP_FRAME: b"\0",
+        }),
+        _mxf_local_set(b"\x01\x28", {
+            media_header.MXF_STORED_WIDTH: struct.pack(">I", 1920),
+            media_header.MXF_STORED_HEIGHT: struct.pack(">I", 540),
+            media_header.MXF_FRAME_LAYOUT: bytes(
+                [media_header.MXF_SEPARATE_FIELDS]),
+            media_header.MXF_SAMPLE_RATE: struct.pack(">ii", 25, 1),
+            media_header.MXF_ASPECT_RATIO: struct.pack(">ii", 16, 9),
+        }),
+    ))
+    partition_pack = struct.pack(
+        ">HHIQQQQ", 1, 3, 1, 0, 0, 0, len(header_metadata))
+    data = (
+        media_header.MXF_PARTITION_PREFIX + b"\x04"
+        + bytes([len(partition_pack)]) + partition_pack
+        + header_metadata
+    )
+    path = _write(tmp_path, "plate.mxf", data)
+
+    assert media_header.read_media_header(path) == {
+        "width": 1920,
+        "height": 1080,
+        "pixel_aspect": 1.0,
+        "fps": 25.0,
+        "start_frame": 90000,
+        "drop_mode": "NDF",
+    }
+
+
+def test_unsupported_and_unreadable(tmp_path):
+    assert media_header.read_media_header(
+        _write(tmp_path, "plate.jpg", b"\xff\xd8")) is None
+    assert media_header.read_media_header(
+        _write(tmp_path, "plate.exr", b"not an exr")) is None
+    assert media_header.read_media_header(
+        str(tmp_path / "missing.dpx")) is None